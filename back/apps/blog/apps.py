@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.blog'
+
+    def ready(self):
+        from config.images import track_image_derivatives
+        from .models import BlogPost
+        track_image_derivatives(BlogPost)
@@ -25,6 +25,12 @@ class BlogPost(models.Model):
         null=True,
         help_text="Upload featured image from your computer"
     )
+    featured_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of featured_image_file (config.images)"
+    )
     
     is_published = models.BooleanField(default=False)
     published_at = models.DateTimeField(null=True, blank=True)
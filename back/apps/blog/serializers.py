@@ -1,18 +1,24 @@
 from rest_framework import serializers
+from config.images import SrcsetField
+from config.projection import SparseFieldsetMixin
 from .models import BlogPost
 
 
-class BlogPostListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for blog post list views"""
+class BlogPostListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Lightweight serializer for blog post list views (supports ?fields=/?omit=)"""
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     image = serializers.ReadOnlyField(source='featured_image')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='featured_image_variants')
     
     class Meta:
         model = BlogPost
         fields = [
             'id', 'title', 'slug', 'excerpt', 'author_name',
-            'image', 'featured_image_url', 'published_at', 'created_at'
+            'image', 'image_srcset', 'featured_image_url', 'published_at', 'created_at'
         ]
+        field_dependencies = {
+            'image': ['featured_image_file', 'featured_image_url'],
+        }
 
 
 class BlogPostDetailSerializer(serializers.ModelSerializer):
@@ -20,12 +26,13 @@ class BlogPostDetailSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     author_username = serializers.CharField(source='author.username', read_only=True)
     image = serializers.ReadOnlyField(source='featured_image')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='featured_image_variants')
     
     class Meta:
         model = BlogPost
         fields = [
             'id', 'title', 'slug', 'content', 'excerpt',
-            'author_name', 'author_username', 'image', 'featured_image_url',
+            'author_name', 'author_username', 'image', 'image_srcset', 'featured_image_url',
             'is_published', 'published_at', 'created_at', 'updated_at'
         ]
         read_only_fields = ['slug', 'created_at', 'updated_at']
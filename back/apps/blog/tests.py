@@ -1,3 +1,40 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from .models import BlogPost
 
-# Create your tests here.
+
+class BlogCursorPaginationTest(APITestCase):
+    """Test ?cursor= pagination over the nullable published_at ordering"""
+
+    def setUp(self):
+        author = User.objects.create_user(username='writer', password='writer123')
+        now = timezone.now()
+        for index in range(12):
+            BlogPost.objects.create(
+                title=f'Post {index}',
+                content='Body',
+                author=author,
+                is_published=True,
+                # Some posts have no publish date and several share one
+                published_at=None if index % 4 == 0 else now - timedelta(days=index % 3)
+            )
+
+    def test_walk_forward_and_back(self):
+        """Test every post is served once, nulls last, and previous links mirror next"""
+        pages = []
+        url = '/api/blog/?page_size=5&cursor='
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            url = response.data['next']
+        slugs = [post['slug'] for page in pages for post in page['results']]
+        self.assertEqual(len(slugs), 12)
+        self.assertEqual(len(set(slugs)), 12)
+        dates = [BlogPost.objects.get(slug=slug).published_at for slug in slugs]
+        self.assertEqual(dates[-3:], [None, None, None])
+
+        back = self.client.get(pages[-1]['previous'])
+        self.assertEqual(back.data['results'], pages[-2]['results'])
@@ -1,6 +1,8 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser, AllowAny
-from rest_framework.pagination import PageNumberPagination
+from config.conditional import ConditionalGetMixin
+from config.pagination import CursorOptInPagination
+from config.projection import FieldProjectionMixin
 from .models import BlogPost
 from .serializers import (
     BlogPostListSerializer,
@@ -9,18 +11,20 @@ from .serializers import (
 )
 
 
-class BlogPostPagination(PageNumberPagination):
-    """Custom pagination for blog posts (10 items per page)"""
+class BlogPostPagination(CursorOptInPagination):
+    """Custom pagination for blog posts (10 items per page, ?cursor= for keyset)"""
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
 
 
-class BlogPostViewSet(viewsets.ModelViewSet):
+class BlogPostViewSet(FieldProjectionMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for blog posts.
     - List: Public access (only published posts)
     - Retrieve: Public access (only published posts)
+    - List sends an ETag, Retrieve ETag/Last-Modified; both answer 304 when unchanged
+    - List: ?fields=/?omit= return (and load) only some fields
     - Create/Update/Delete: Admin only
     """
     lookup_field = 'slug'
@@ -28,9 +32,10 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return published posts for public, all posts for admin"""
+        queryset = BlogPost.objects.select_related('author')
         if self.request.user.is_staff:
-            return BlogPost.objects.all()
-        return BlogPost.objects.filter(is_published=True)
+            return queryset
+        return queryset.filter(is_published=True)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
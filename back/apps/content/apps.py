@@ -5,3 +5,17 @@ class ContentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.content'
     verbose_name = 'Content Management'
+
+    def ready(self):
+        from config.images import track_image_derivatives
+        from config.response_cache import track_model_versions
+        from .models import (
+            FAQ, Testimonial, GalleryImage, GiftCard, ShippingInfo,
+            ReturnPolicy, TermsAndConditions, PrivacyPolicy,
+            DupeProduct, AirAmbience, PerfumeOil
+        )
+        track_model_versions(
+            FAQ, Testimonial, GalleryImage, GiftCard, ShippingInfo,
+            ReturnPolicy, TermsAndConditions, PrivacyPolicy
+        )
+        track_image_derivatives(GalleryImage, GiftCard, DupeProduct, AirAmbience, PerfumeOil)
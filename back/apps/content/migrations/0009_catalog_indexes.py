@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-17 17:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0008_dupeproduct_designer_image_file_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='airambience',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-is_featured', '-created_at'], name='content_air_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='airambience',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['product_type', '-is_featured', '-created_at'], name='content_air_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dupeproduct',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-is_featured', '-created_at'], name='content_dupe_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dupeproduct',
+            index=models.Index(django.db.models.functions.text.Upper('designer_brand'), condition=models.Q(('is_active', True)), name='content_dupe_active_brand_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='perfumeoil',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-is_featured', '-created_at'], name='content_oil_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='perfumeoil',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['concentration', '-is_featured', '-created_at'], name='content_oil_active_conc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='perfumeoil',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_custom_blend', True)), fields=['-is_featured', '-created_at'], name='content_oil_custom_blend_idx'),
+        ),
+    ]
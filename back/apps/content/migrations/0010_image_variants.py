@@ -0,0 +1,43 @@
+# Generated by Django 5.0.1 on 2026-10-17 18:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0009_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='airambience',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies of image_file (config.images)'),
+        ),
+        migrations.AddField(
+            model_name='dupeproduct',
+            name='designer_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies of designer_image_file (config.images)'),
+        ),
+        migrations.AddField(
+            model_name='dupeproduct',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies of image_file (config.images)'),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies of image_file (config.images)'),
+        ),
+        migrations.AddField(
+            model_name='giftcard',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies of image_file (config.images)'),
+        ),
+        migrations.AddField(
+            model_name='perfumeoil',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies of image_file (config.images)'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 
 
@@ -57,6 +58,12 @@ class GalleryImage(models.Model):
         null=True,
         help_text="Upload image from your computer"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of image_file (config.images)"
+    )
     
     category = models.CharField(max_length=100, default='General', help_text="e.g., Products, Events, Behind the Scenes")
     order = models.PositiveIntegerField(default=0)
@@ -166,6 +173,12 @@ class GiftCard(models.Model):
         null=True,
         help_text="Upload image from your computer"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of image_file (config.images)"
+    )
     
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -250,6 +263,12 @@ class DupeProduct(models.Model):
         null=True,
         help_text="Upload designer fragrance image from your computer"
     )
+    designer_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of designer_image_file (config.images)"
+    )
     
     # Comparison details
     similarity_percentage = models.PositiveSmallIntegerField(default=90, help_text="Similarity to original (0-100%)")
@@ -270,6 +289,12 @@ class DupeProduct(models.Model):
         null=True,
         help_text="Upload image from your computer"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of image_file (config.images)"
+    )
     
     stock_quantity = models.PositiveIntegerField(default=0)
     is_featured = models.BooleanField(default=False)
@@ -279,6 +304,17 @@ class DupeProduct(models.Model):
     
     class Meta:
         ordering = ['-is_featured', '-created_at']
+        # Shaped after DupeProductViewSet: active list in default order, brand filter
+        indexes = [
+            models.Index(
+                fields=['-is_featured', '-created_at'], condition=models.Q(is_active=True),
+                name='content_dupe_active_order_idx'
+            ),
+            models.Index(
+                Upper('designer_brand'), condition=models.Q(is_active=True),
+                name='content_dupe_active_brand_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} (Dupe of {self.designer_brand} {self.designer_fragrance})"
@@ -354,6 +390,12 @@ class AirAmbience(models.Model):
         null=True,
         help_text="Upload image from your computer"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of image_file (config.images)"
+    )
     
     stock_quantity = models.PositiveIntegerField(default=0)
     is_featured = models.BooleanField(default=False)
@@ -365,6 +407,17 @@ class AirAmbience(models.Model):
         ordering = ['-is_featured', '-created_at']
         verbose_name = 'Air Ambience Product'
         verbose_name_plural = 'Air Ambience Products'
+        # Shaped after AirAmbienceViewSet: active list in default order, type filter
+        indexes = [
+            models.Index(
+                fields=['-is_featured', '-created_at'], condition=models.Q(is_active=True),
+                name='content_air_active_order_idx'
+            ),
+            models.Index(
+                fields=['product_type', '-is_featured', '-created_at'], condition=models.Q(is_active=True),
+                name='content_air_active_type_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.get_product_type_display()})"
@@ -432,6 +485,12 @@ class PerfumeOil(models.Model):
         null=True,
         help_text="Upload image from your computer"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of image_file (config.images)"
+    )
     
     stock_quantity = models.PositiveIntegerField(default=0)
     is_featured = models.BooleanField(default=False)
@@ -444,6 +503,23 @@ class PerfumeOil(models.Model):
         ordering = ['-is_featured', '-created_at']
         verbose_name = 'Perfume Oil'
         verbose_name_plural = 'Perfume Oils'
+        # Shaped after PerfumeOilViewSet: active list in default order, concentration
+        # and custom blend filters
+        indexes = [
+            models.Index(
+                fields=['-is_featured', '-created_at'], condition=models.Q(is_active=True),
+                name='content_oil_active_order_idx'
+            ),
+            models.Index(
+                fields=['concentration', '-is_featured', '-created_at'], condition=models.Q(is_active=True),
+                name='content_oil_active_conc_idx'
+            ),
+            models.Index(
+                fields=['-is_featured', '-created_at'],
+                condition=models.Q(is_active=True, is_custom_blend=True),
+                name='content_oil_custom_blend_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.get_concentration_display()})"
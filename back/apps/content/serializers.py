@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from config.images import SrcsetField
+from config.projection import SparseFieldsetMixin
 from .models import (
     FAQ, Testimonial, GalleryImage, ShippingInfo, ReturnPolicy,
     TermsAndConditions, PrivacyPolicy, GiftCard, ContactMessage,
@@ -20,10 +22,11 @@ class TestimonialSerializer(serializers.ModelSerializer):
 
 class GalleryImageSerializer(serializers.ModelSerializer):
     image = serializers.ReadOnlyField(source='url')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='image_variants')
     
     class Meta:
         model = GalleryImage
-        fields = ['id', 'title', 'description', 'image', 'image_url', 'category', 'created_at']
+        fields = ['id', 'title', 'description', 'image', 'image_srcset', 'image_url', 'category', 'created_at']
 
 
 class ShippingInfoSerializer(serializers.ModelSerializer):
@@ -56,10 +59,11 @@ class PrivacyPolicySerializer(serializers.ModelSerializer):
 
 class GiftCardSerializer(serializers.ModelSerializer):
     image = serializers.ReadOnlyField(source='url')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='image_variants')
     
     class Meta:
         model = GiftCard
-        fields = ['id', 'name', 'description', 'amount', 'image', 'image_url', 'is_active']
+        fields = ['id', 'name', 'description', 'amount', 'image', 'image_srcset', 'image_url', 'is_active']
 
 
 class ContactMessageSerializer(serializers.ModelSerializer):
@@ -76,19 +80,28 @@ class NewsletterSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'subscribed_at']
 
 
-class DupeProductListSerializer(serializers.ModelSerializer):
+class DupeProductListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     savings = serializers.SerializerMethodField()
     savings_percentage = serializers.SerializerMethodField()
     image = serializers.ReadOnlyField(source='url')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='image_variants')
     designer_image = serializers.ReadOnlyField()  # Designer fragrance image
+    designer_image_srcset = SrcsetField(source='designer_image_variants')
     
     class Meta:
         model = DupeProduct
         fields = [
             'id', 'slug', 'name', 'price', 'designer_brand', 'designer_fragrance',
-            'designer_price', 'designer_image', 'similarity_percentage', 'image', 'image_url', 'is_featured',
+            'designer_price', 'designer_image', 'designer_image_srcset', 'similarity_percentage',
+            'image', 'image_srcset', 'image_url', 'is_featured',
             'savings', 'savings_percentage'
         ]
+        field_dependencies = {
+            'savings': ['price', 'designer_price'],
+            'savings_percentage': ['price', 'designer_price'],
+            'image': ['image_file', 'image_url'],
+            'designer_image': ['designer_image_file', 'designer_image_url'],
+        }
     
     def get_savings(self, obj):
         return float(obj.get_savings())
@@ -101,14 +114,17 @@ class DupeProductDetailSerializer(serializers.ModelSerializer):
     savings = serializers.SerializerMethodField()
     savings_percentage = serializers.SerializerMethodField()
     image = serializers.ReadOnlyField(source='url')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='image_variants')
     designer_image = serializers.ReadOnlyField()  # Designer fragrance image
+    designer_image_srcset = SrcsetField(source='designer_image_variants')
     
     class Meta:
         model = DupeProduct
         fields = [
             'id', 'slug', 'name', 'description', 'price', 'designer_brand',
-            'designer_fragrance', 'designer_price', 'designer_image', 'similarity_percentage',
-            'scent_notes', 'longevity', 'image', 'image_url', 'stock_quantity',
+            'designer_fragrance', 'designer_price', 'designer_image', 'designer_image_srcset',
+            'similarity_percentage',
+            'scent_notes', 'longevity', 'image', 'image_srcset', 'image_url', 'stock_quantity',
             'is_featured', 'created_at', 'savings', 'savings_percentage'
         ]
     
@@ -119,41 +135,51 @@ class DupeProductDetailSerializer(serializers.ModelSerializer):
         return obj.get_savings_percentage()
 
 
-class AirAmbienceListSerializer(serializers.ModelSerializer):
+class AirAmbienceListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     image = serializers.ReadOnlyField(source='url')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='image_variants')
     
     class Meta:
         model = AirAmbience
         fields = [
-            'id', 'slug', 'name', 'price', 'product_type', 'image', 'image_url', 
+            'id', 'slug', 'name', 'price', 'product_type', 'image', 'image_srcset', 'image_url', 
             'is_featured', 'stock_quantity', 'coverage_area', 'duration'
         ]
+        field_dependencies = {
+            'image': ['image_file', 'image_url'],
+        }
 
 
 class AirAmbienceDetailSerializer(serializers.ModelSerializer):
     image = serializers.ReadOnlyField(source='url')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='image_variants')
     
     class Meta:
         model = AirAmbience
         fields = [
             'id', 'slug', 'name', 'description', 'price', 'product_type',
             'scent_notes', 'size_options', 'usage_instructions', 'features',
-            'coverage_area', 'duration', 'image', 'image_url', 'stock_quantity',
+            'coverage_area', 'duration', 'image', 'image_srcset', 'image_url', 'stock_quantity',
             'is_featured', 'created_at'
         ]
 
 
-class PerfumeOilListSerializer(serializers.ModelSerializer):
+class PerfumeOilListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     all_notes = serializers.SerializerMethodField()
     image = serializers.ReadOnlyField(source='url')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='image_variants')
     
     class Meta:
         model = PerfumeOil
         fields = [
             'id', 'slug', 'name', 'price', 'concentration', 'size_options',
-            'longevity', 'scent_family', 'image', 'image_url', 'is_featured', 'stock_quantity',
+            'longevity', 'scent_family', 'image', 'image_srcset', 'image_url', 'is_featured', 'stock_quantity',
             'all_notes'
         ]
+        field_dependencies = {
+            'image': ['image_file', 'image_url'],
+            'all_notes': ['top_notes', 'middle_notes', 'base_notes'],
+        }
     
     def get_all_notes(self, obj):
         return obj.get_all_notes()
@@ -162,13 +188,14 @@ class PerfumeOilListSerializer(serializers.ModelSerializer):
 class PerfumeOilDetailSerializer(serializers.ModelSerializer):
     all_notes = serializers.SerializerMethodField()
     image = serializers.ReadOnlyField(source='url')  # Alias for frontend compatibility
+    image_srcset = SrcsetField(source='image_variants')
     
     class Meta:
         model = PerfumeOil
         fields = [
             'id', 'slug', 'name', 'description', 'price', 'concentration',
             'size_options', 'longevity', 'top_notes', 'middle_notes', 'base_notes',
-            'scent_family', 'application_tips', 'ingredients', 'image', 'image_url',
+            'scent_family', 'application_tips', 'ingredients', 'image', 'image_srcset', 'image_url',
             'stock_quantity', 'is_featured', 'is_custom_blend', 'created_at',
             'all_notes'
         ]
@@ -1,3 +1,146 @@
-from django.test import TestCase
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from config.perf import QueryRecorder, view_stats
+from .models import FAQ, ShippingInfo
 
-# Create your tests here.
+
+class ResponseCacheTest(APITestCase):
+    """Test the versioned response cache on read-only content endpoints"""
+    
+    def setUp(self):
+        cache.clear()
+        self.faq = FAQ.objects.create(question='Do you ship?', answer='Yes', category='Shipping')
+    
+    def test_repeat_request_served_from_cache_without_queries(self):
+        """Test a repeat request is a cache hit with zero queries"""
+        first = self.client.get('/api/faqs/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/faqs/')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+    
+    def test_query_string_is_part_of_key(self):
+        """Test different filters are cached separately"""
+        self.client.get('/api/faqs/')
+        response = self.client.get('/api/faqs/?category=returns')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 0)
+    
+    def test_write_invalidates_exactly(self):
+        """Test saving a model invalidates only responses built from it"""
+        self.client.get('/api/faqs/')
+        ShippingInfo.objects.create(content='Ships worldwide')
+        self.assertEqual(self.client.get('/api/faqs/')['X-Cache'], 'HIT')
+        
+        self.faq.answer = 'Yes, everywhere'
+        self.faq.save()
+        response = self.client.get('/api/faqs/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['answer'], 'Yes, everywhere')
+    
+    def test_latest_action_cached(self):
+        """Test policy `latest` actions are cached and 404s are not"""
+        self.assertEqual(self.client.get('/api/shipping-info/latest/').status_code, 404)
+        ShippingInfo.objects.create(content='Ships worldwide')
+        self.assertEqual(self.client.get('/api/shipping-info/latest/')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/shipping-info/latest/')['X-Cache'], 'HIT')
+    
+    def test_stats_endpoint_is_staff_only(self):
+        """Test hit/miss counters are exposed to staff"""
+        self.client.get('/api/faqs/')
+        self.client.get('/api/faqs/')
+        response = self.client.get('/api/cache/stats/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        admin = User.objects.create_superuser('admin', 'admin@test.com', 'admin123')
+        self.client.force_authenticate(user=admin)
+        response = self.client.get('/api/cache/stats/')
+        self.assertEqual(response.data['hits'], 1)
+        self.assertEqual(response.data['misses'], 1)
+    
+    def test_production_requires_shared_backend(self):
+        """Test settings refuse a per-process cache outside DEBUG"""
+        def load_settings(code='import config.settings', **env):
+            environ = {key: value for key, value in os.environ.items() if key != 'CACHE_BACKEND'}
+            return subprocess.run(
+                [sys.executable, '-c', code], cwd=settings.BASE_DIR, capture_output=True, text=True,
+                env={**environ, 'DEBUG': 'False', 'RESPONSE_CACHE_ENABLED': 'True', **env}
+            )
+        
+        result = load_settings(CACHE_BACKEND='locmem')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('ImproperlyConfigured', result.stderr)
+        self.assertEqual(load_settings(CACHE_BACKEND='redis').returncode, 0)
+        # Unset, production falls back to the database cache
+        self.assertEqual(load_settings('import config.settings as s; assert s.CACHE_BACKEND == "db"').returncode, 0)
+
+
+class PerfMiddlewareTest(APITestCase):
+    """Test the opt-in request instrumentation middleware"""
+    
+    def setUp(self):
+        cache.clear()
+        view_stats.reset()
+        FAQ.objects.create(question='Do you ship?', answer='Yes', category='Shipping')
+        self.staff = User.objects.create_user(username='staff', password='staff123', is_staff=True)
+    
+    def test_disabled_by_default(self):
+        """Test no header or stats are produced unless enabled"""
+        response = self.client.get('/api/faqs/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(view_stats.snapshot(), {})
+    
+    @override_settings(PERF_INSTRUMENTATION_ENABLED=True)
+    def test_server_timing_header(self):
+        """Test responses carry db, serialize and total timings"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/faqs/')
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries, \d+ duplicate", serialize;dur=[\d.]+, total;dur=[\d.]+$')
+        self.assertIn(f'"{len(queries)} queries', timing)
+    
+    def test_recorder_counts_duplicate_shapes(self):
+        """Test repeated SQL text with different parameters counts as duplicate"""
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for question in ['a', 'b', 'c']:
+                list(FAQ.objects.filter(question=question))
+            FAQ.objects.count()
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.duplicates, 2)
+        self.assertEqual(len(recorder.slowest(2)), 2)
+    
+    @override_settings(PERF_INSTRUMENTATION_ENABLED=True, PERF_SLOW_REQUEST_MS=0, PERF_SLOW_QUERY_COUNT=1)
+    def test_slow_requests_logged_with_statements(self):
+        """Test a request over the threshold logs its slowest statements"""
+        with self.assertLogs('config.perf', level='WARNING') as logs:
+            self.client.get('/api/faqs/')
+        self.assertIn('Slow request GET /api/faqs/ (faq-list)', logs.output[0])
+        self.assertEqual(len(logs.records[0].slow_queries), 1)
+    
+    @override_settings(PERF_INSTRUMENTATION_ENABLED=True)
+    def test_perf_endpoint_is_staff_only(self):
+        """Test /api/_perf/ aggregates per view for staff and can be reset"""
+        self.client.get('/api/faqs/')
+        self.client.get('/api/faqs/')
+        self.assertEqual(self.client.get('/api/_perf/').status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        self.client.force_authenticate(self.staff)
+        response = self.client.get('/api/_perf/')
+        self.assertTrue(response.data['enabled'])
+        self.assertEqual(response.data['views']['faq-list']['requests'], 2)
+        
+        self.assertEqual(self.client.delete('/api/_perf/').status_code, status.HTTP_204_NO_CONTENT)
+        self.assertNotIn('faq-list', view_stats.snapshot())
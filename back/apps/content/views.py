@@ -4,6 +4,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
 from django.utils import timezone
 from django.db import models
+from config.response_cache import CachedResponseMixin
+from config.conditional import ConditionalGetMixin
+from config.pagination import CursorOptInPagination
+from config.projection import FieldProjectionMixin
 from .models import (
     FAQ, Testimonial, GalleryImage, ShippingInfo, ReturnPolicy,
     TermsAndConditions, PrivacyPolicy, GiftCard, ContactMessage,
@@ -19,10 +23,11 @@ from .serializers import (
 )
 
 
-class FAQViewSet(viewsets.ReadOnlyModelViewSet):
+class FAQViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for FAQs - Read only for public
+    ViewSet for FAQs - Read only for public (response cached)
     """
+    cache_models = [FAQ]
     queryset = FAQ.objects.filter(is_published=True)
     serializer_class = FAQSerializer
     permission_classes = [AllowAny]
@@ -36,10 +41,11 @@ class FAQViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class TestimonialViewSet(viewsets.ReadOnlyModelViewSet):
+class TestimonialViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for Testimonials - Read only for public
+    ViewSet for Testimonials - Read only for public (response cached)
     """
+    cache_models = [Testimonial]
     queryset = Testimonial.objects.filter(is_published=True)
     serializer_class = TestimonialSerializer
     permission_classes = [AllowAny]
@@ -52,10 +58,11 @@ class TestimonialViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class GalleryImageViewSet(viewsets.ReadOnlyModelViewSet):
+class GalleryImageViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for Gallery Images - Read only for public
+    ViewSet for Gallery Images - Read only for public (response cached)
     """
+    cache_models = [GalleryImage]
     queryset = GalleryImage.objects.filter(is_published=True)
     serializer_class = GalleryImageSerializer
     permission_classes = [AllowAny]
@@ -69,10 +76,11 @@ class GalleryImageViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class ShippingInfoViewSet(viewsets.ReadOnlyModelViewSet):
+class ShippingInfoViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for Shipping Information - Read only for public
+    ViewSet for Shipping Information - Read only for public (response cached)
     """
+    cache_models = [ShippingInfo]
     queryset = ShippingInfo.objects.all()
     serializer_class = ShippingInfoSerializer
     permission_classes = [AllowAny]
@@ -87,10 +95,11 @@ class ShippingInfoViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({'detail': 'No shipping information available'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class ReturnPolicyViewSet(viewsets.ReadOnlyModelViewSet):
+class ReturnPolicyViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for Return Policy - Read only for public
+    ViewSet for Return Policy - Read only for public (response cached)
     """
+    cache_models = [ReturnPolicy]
     queryset = ReturnPolicy.objects.all()
     serializer_class = ReturnPolicySerializer
     permission_classes = [AllowAny]
@@ -105,10 +114,11 @@ class ReturnPolicyViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({'detail': 'No return policy available'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class TermsAndConditionsViewSet(viewsets.ReadOnlyModelViewSet):
+class TermsAndConditionsViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for Terms and Conditions - Read only for public
+    ViewSet for Terms and Conditions - Read only for public (response cached)
     """
+    cache_models = [TermsAndConditions]
     queryset = TermsAndConditions.objects.all().order_by('-effective_date')
     serializer_class = TermsAndConditionsSerializer
     permission_classes = [AllowAny]
@@ -123,10 +133,11 @@ class TermsAndConditionsViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({'detail': 'No terms and conditions available'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class PrivacyPolicyViewSet(viewsets.ReadOnlyModelViewSet):
+class PrivacyPolicyViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for Privacy Policy - Read only for public
+    ViewSet for Privacy Policy - Read only for public (response cached)
     """
+    cache_models = [PrivacyPolicy]
     queryset = PrivacyPolicy.objects.all().order_by('-effective_date')
     serializer_class = PrivacyPolicySerializer
     permission_classes = [AllowAny]
@@ -141,10 +152,11 @@ class PrivacyPolicyViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({'detail': 'No privacy policy available'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class GiftCardViewSet(viewsets.ReadOnlyModelViewSet):
+class GiftCardViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for Gift Cards - Read only for public
+    ViewSet for Gift Cards - Read only for public (response cached)
     """
+    cache_models = [GiftCard]
     queryset = GiftCard.objects.filter(is_active=True)
     serializer_class = GiftCardSerializer
     permission_classes = [AllowAny]
@@ -254,12 +266,15 @@ class NewsletterViewSet(viewsets.ModelViewSet):
             )
 
 
-class DupeProductViewSet(viewsets.ReadOnlyModelViewSet):
+class DupeProductViewSet(FieldProjectionMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Dupe Products - Read only for public
+    Supports conditional GET (ETag/Last-Modified)
+    List accepts ?cursor= for keyset pagination and ?fields=/?omit=
     """
     queryset = DupeProduct.objects.filter(is_active=True)
     lookup_field = 'slug'
+    pagination_class = CursorOptInPagination
     permission_classes = [AllowAny]
     
     def get_serializer_class(self):
@@ -300,12 +315,15 @@ class DupeProductViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(list(brands))
 
 
-class AirAmbienceViewSet(viewsets.ReadOnlyModelViewSet):
+class AirAmbienceViewSet(FieldProjectionMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Air Ambience Products - Read only for public
+    Supports conditional GET (ETag/Last-Modified)
+    List accepts ?cursor= for keyset pagination and ?fields=/?omit=
     """
     queryset = AirAmbience.objects.filter(is_active=True)
     lookup_field = 'slug'
+    pagination_class = CursorOptInPagination
     permission_classes = [AllowAny]
     
     def get_serializer_class(self):
@@ -345,12 +363,15 @@ class AirAmbienceViewSet(viewsets.ReadOnlyModelViewSet):
         types = self.queryset.values_list('product_type', flat=True).distinct()
         return Response([{'value': t, 'label': dict(AirAmbience.PRODUCT_TYPE_CHOICES)[t]} for t in types])
 
-class PerfumeOilViewSet(viewsets.ReadOnlyModelViewSet):
+class PerfumeOilViewSet(FieldProjectionMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Perfume Oil Products - Read only for public
+    Supports conditional GET (ETag/Last-Modified)
+    List accepts ?cursor= for keyset pagination and ?fields=/?omit=
     """
     queryset = PerfumeOil.objects.filter(is_active=True)
     lookup_field = 'slug'
+    pagination_class = CursorOptInPagination
     permission_classes = [AllowAny]
     
     def get_serializer_class(self):
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Cart, CartItem, Order, OrderItem, PromoCode
+from .models import Cart, CartItem, Order, OrderItem, PaymentEvent, PromoCode
 
 
 class CartItemInline(admin.TabularInline):
@@ -77,3 +77,12 @@ class OrderAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(PaymentEvent)
+class PaymentEventAdmin(admin.ModelAdmin):
+    list_display = ['reference', 'event', 'status', 'attempts', 'received_at', 'processed_at']
+    list_filter = ['status', 'event', 'received_at']
+    search_fields = ['reference']
+    readonly_fields = ['reference', 'event', 'payload', 'attempts', 'last_error',
+                       'locked_at', 'received_at', 'processed_at']
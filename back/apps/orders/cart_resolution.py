@@ -0,0 +1,109 @@
+"""
+Resolve the cart for a request without writing on reads.
+
+Guest carts are identified, in order of preference, by:
+1. a signed X-Cart-ID token (issued on every cart response), or
+2. the session key, for cookie-only clients.
+
+The session is only created (and so only written) when a new guest cart
+has to be created. Cart ids resolved from a session key or user are
+cached; a cached id is always re-checked by the query that loads the
+cart, so a stale entry costs nothing extra and falls back to a lookup.
+"""
+import logging
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from .models import Cart
+
+logger = logging.getLogger(__name__)
+
+SIGNING_SALT = 'orders.cart'
+
+CART_ID_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def make_cart_token(cart_id):
+    """Signed, tamper-proof X-Cart-ID value for a cart"""
+    return signing.Signer(salt=SIGNING_SALT).sign(str(cart_id))
+
+
+def read_cart_token(token):
+    """Cart id from an X-Cart-ID value, or None if it is invalid"""
+    if not token:
+        return None
+    try:
+        return int(signing.Signer(salt=SIGNING_SALT).unsign(token))
+    except (signing.BadSignature, ValueError):
+        pass
+    if token.isdigit() and _accept_unsigned_ids():
+        # The cart response that follows re-issues the id as a signed token
+        logger.warning('Deprecated unsigned X-Cart-ID accepted for cart %s', token)
+        return int(token)
+    return None
+
+
+def _accept_unsigned_ids():
+    """Whether plain ids issued before tokens were signed are still honoured"""
+    until = parse_date(getattr(settings, 'CART_ACCEPT_UNSIGNED_IDS_UNTIL', '') or '')
+    return until is not None and timezone.localdate() <= until
+
+
+def _cache_key(owner, value):
+    return f'cart:id:{owner}:{value}'
+
+
+def _cached_cart(queryset, key, **owner):
+    cart_id = cache.get(key)
+    if cart_id is None:
+        return None
+    return queryset.filter(id=cart_id, **owner).first()
+
+
+def _remember(key, cart):
+    cache.set(key, cart.id, CART_ID_CACHE_TIMEOUT)
+    return cart
+
+
+def resolve_cart(request, queryset=None, create=True):
+    """
+    Return the request's cart loaded through `queryset` (default: all carts),
+    creating one if `create` is set; otherwise None when there is no cart.
+    """
+    queryset = queryset if queryset is not None else Cart.objects.all()
+
+    if request.user.is_authenticated:
+        key = _cache_key('user', request.user.pk)
+        cart = _cached_cart(queryset, key, user=request.user)
+        if cart is None:
+            cart = queryset.filter(user=request.user).first()
+        if cart is None and create:
+            cart = Cart.objects.create(user=request.user)
+        return _remember(key, cart) if cart else None
+
+    cart_id = read_cart_token(request.headers.get('X-Cart-ID'))
+    if cart_id is not None:
+        cart = queryset.filter(id=cart_id, user__isnull=True).first()
+        if cart:
+            return cart
+
+    session_key = request.session.session_key
+    if session_key:
+        key = _cache_key('session', session_key)
+        cart = _cached_cart(queryset, key, session_key=session_key)
+        if cart is None:
+            cart = queryset.filter(session_key=session_key).first()
+        if cart:
+            return _remember(key, cart)
+
+    if not create:
+        return None
+
+    # First cart for this client: the only time the session is written
+    if not session_key:
+        request.session.create()
+        session_key = request.session.session_key
+    cart = Cart.objects.create(session_key=session_key)
+    return _remember(_cache_key('session', session_key), cart)
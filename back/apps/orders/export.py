@@ -0,0 +1,98 @@
+"""
+Streaming order export for accounting.
+
+Orders are read oldest first with iterator(chunk_size=...), and their
+OrderItems are prefetched one chunk at a time. Memory therefore stays
+flat however many orders match. The output is written a row at a time:
+- csv: one row per order item, with the order columns repeated. An
+  order with no items gets a single row with empty item columns.
+- jsonl: one object per order, with its items nested.
+
+Filters: created date range (date_from/date_to, inclusive days or ISO
+datetimes) and a comma-separated list of statuses.
+"""
+import csv
+import json
+from datetime import datetime, time, timedelta
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from config.catalog_io import Echo, FORMATS
+from .models import Order, OrderItem
+
+DEFAULT_CHUNK_SIZE = 500
+
+ORDER_COLUMNS = [
+    'order_number', 'created_at', 'status', 'full_name', 'email', 'phone', 'shipping_address',
+    'promo_code_used', 'subtotal_amount', 'discount_amount', 'total_amount', 'payment_reference',
+]
+ITEM_COLUMNS = ['product_id', 'product_name', 'size', 'quantity', 'product_price', 'line_total']
+
+
+def _parse_bound(value, name, end=False):
+    """Aware datetime for a date or datetime string; whole dates cover the full day"""
+    try:
+        day = parse_date(value)
+        parsed = None if day else parse_datetime(value)
+    except ValueError:
+        day = parsed = None
+    if day:
+        parsed = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+    elif parsed is None:
+        raise ValidationError(f'{name}: expected YYYY-MM-DD or an ISO datetime, got {value!r}')
+    elif end:
+        # Exclusive upper bound for an exact instant
+        parsed += timedelta(microseconds=1)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_orders(date_from=None, date_to=None, statuses=None):
+    """Orders to export, oldest first"""
+    orders = Order.objects.all()
+    if date_from:
+        orders = orders.filter(created_at__gte=_parse_bound(date_from, 'date_from'))
+    if date_to:
+        orders = orders.filter(created_at__lt=_parse_bound(date_to, 'date_to', end=True))
+    if statuses:
+        valid = {choice for choice, _ in Order.STATUS_CHOICES}
+        unknown = sorted(set(statuses) - valid)
+        if unknown:
+            raise ValidationError(f"status: unknown value(s) {', '.join(unknown)}")
+        orders = orders.filter(status__in=statuses)
+    return orders.order_by('created_at', 'pk')
+
+
+def _item_values(item):
+    return [
+        item.product_id, item.product_name, item.size, item.quantity,
+        item.product_price, item.product_price * item.quantity,
+    ]
+
+
+def export_lines(orders, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield `orders` and their items as CSV or JSONL text"""
+    if file_format not in FORMATS:
+        raise ValidationError(f"Unknown format '{file_format}' (choose from {', '.join(FORMATS)})")
+    orders = orders.only(*ORDER_COLUMNS).prefetch_related(
+        Prefetch('items', queryset=OrderItem.objects.order_by('pk'))
+    ).iterator(chunk_size=chunk_size)
+
+    if file_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(ORDER_COLUMNS + [f'item_{column}' for column in ITEM_COLUMNS])
+        for order in orders:
+            values = [getattr(order, column) for column in ORDER_COLUMNS]
+            items = order.items.all()
+            if not items:
+                yield writer.writerow(values + [''] * len(ITEM_COLUMNS))
+            for item in items:
+                yield writer.writerow(values + _item_values(item))
+    else:
+        for order in orders:
+            row = {column: getattr(order, column) for column in ORDER_COLUMNS}
+            row['items'] = [dict(zip(ITEM_COLUMNS, _item_values(item))) for item in order.items.all()]
+            yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,62 @@
+import time
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from config.catalog_io import FORMATS, detect_format
+from apps.orders.export import DEFAULT_CHUNK_SIZE, export_lines, filter_orders
+
+
+class Command(BaseCommand):
+    help = 'Stream orders and their items to CSV or JSONL for accounting'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help='File to write (default: stdout)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format (default: from the --output extension, else csv)'
+        )
+        parser.add_argument(
+            '--date-from',
+            help='First day (YYYY-MM-DD) or instant (ISO datetime) to include'
+        )
+        parser.add_argument(
+            '--date-to',
+            help='Last day (YYYY-MM-DD) or instant (ISO datetime) to include'
+        )
+        parser.add_argument(
+            '--status',
+            action='append',
+            default=[],
+            help='Only orders with this status (repeatable, or comma-separated)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Orders fetched per database round trip (default: {DEFAULT_CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or detect_format(options['output'])
+        statuses = [part.strip() for value in options['status'] for part in value.split(',') if part.strip()]
+        try:
+            orders = filter_orders(options['date_from'], options['date_to'], statuses)
+        except ValidationError as exc:
+            raise CommandError('; '.join(exc.messages))
+        lines = export_lines(orders, file_format, chunk_size=options['batch_size'])
+
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        started = time.monotonic()
+        with open(options['output'], 'w', newline='', encoding='utf-8') as handle:
+            for line in lines:
+                handle.write(line)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {orders.count()} orders to {options['output']} in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,45 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.orders.payments import process_pending_events
+
+
+class Command(BaseCommand):
+    help = 'Process queued Paystack webhook events (runs until stopped unless --once is given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of events to claim per batch (default: 50)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when the queue is empty (default: 2)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the events that are due now and exit'
+        )
+
+    def handle(self, *args, **options):
+        totals = {}
+        try:
+            while True:
+                counts = process_pending_events(options['batch_size'])
+                for status, count in counts.items():
+                    totals[status] = totals.get(status, 0) + count
+                if counts:
+                    self.stdout.write(', '.join(f'{count} {status}' for status, count in counts.items()))
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        summary = ', '.join(f'{count} {status}' for status, count in totals.items()) or 'no events'
+        self.stdout.write(self.style.SUCCESS(f'Payment events processed: {summary}'))
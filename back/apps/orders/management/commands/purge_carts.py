@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from apps.orders.models import Cart, CartItem
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned guest carts (and their items) not updated for --days days'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Delete guest carts idle for at least this many days (default: 30)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of carts deleted per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be deleted'
+        )
+        parser.add_argument(
+            '--clear-sessions',
+            action='store_true',
+            help='Also run clearsessions to drop expired sessions'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        batch_size = options['batch_size']
+        abandoned = Cart.objects.filter(user__isnull=True, updated_at__lt=cutoff)
+
+        if options['dry_run']:
+            carts = abandoned.count()
+            items = CartItem.objects.filter(cart__in=abandoned).count()
+            self.stdout.write(
+                f'Dry run: would delete {carts} guest carts and {items} cart items '
+                f'idle since {cutoff:%Y-%m-%d %H:%M}'
+            )
+            return
+
+        started = time.monotonic()
+        carts = items = batches = 0
+        last_id = 0
+        while True:
+            # Walk the primary key so each batch is a bounded range scan
+            ids = list(
+                abandoned.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            with transaction.atomic():
+                # Re-check the age so a cart used since it was selected survives
+                stale = list(abandoned.filter(pk__in=ids).values_list('pk', flat=True))
+                items += CartItem.objects.filter(cart_id__in=stale).delete()[0]
+                carts += Cart.objects.filter(pk__in=stale).delete()[1].get(Cart._meta.label, 0)
+            batches += 1
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Deleted {carts} guest carts and {items} cart items '
+                f'in {batches} batches ({elapsed:.2f}s)'
+            )
+        )
+
+        if options['clear_sessions']:
+            call_command('clearsessions')
+            self.stdout.write(self.style.SUCCESS('Cleared expired sessions'))
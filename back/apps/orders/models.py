@@ -7,6 +7,8 @@ import uuid
 from datetime import datetime
 from django.core.exceptions import ValidationError
 from decimal import Decimal
+from django.utils import timezone
+from typing import NamedTuple
 
 
 class PromoCode(models.Model):
@@ -81,8 +83,46 @@ class PromoCode(models.Model):
     
     def apply_usage(self):
         """Increment usage count"""
-        self.used_count += 1
-        self.save(update_fields=['used_count'])
+        PromoCode.objects.filter(pk=self.pk).update(used_count=models.F('used_count') + 1)
+        self.refresh_from_db(fields=['used_count'])
+
+
+class CartSummary(NamedTuple):
+    """Cart pricing computed in a single pass over the items"""
+    subtotal: Decimal
+    discount: Decimal
+    total: Decimal
+    item_count: int
+
+
+class CartQuerySet(models.QuerySet):
+    def with_items(self):
+        """
+        Load carts with every item and its target in a fixed number of queries:
+        items are grouped by content type and each item model is fetched once
+        (products together with their category and images).
+        """
+        from django.contrib.contenttypes.prefetch import GenericPrefetch
+        from apps.content.models import DupeProduct, AirAmbience, PerfumeOil
+        
+        return self.select_related('promo_code').prefetch_related(
+            models.Prefetch(
+                'items',
+                queryset=CartItem.objects.prefetch_related(
+                    GenericPrefetch('item', [
+                        Product.objects.defer('search_vector').select_related('category').prefetch_related('images'),
+                        DupeProduct.objects.all(),
+                        AirAmbience.objects.all(),
+                        PerfumeOil.objects.all(),
+                    ]),
+                    # Legacy rows that only reference the product FK
+                    models.Prefetch(
+                        'product',
+                        queryset=Product.objects.defer('search_vector').select_related('category').prefetch_related('images')
+                    ),
+                )
+            )
+        )
 
 
 class Cart(models.Model):
@@ -93,38 +133,74 @@ class Cart(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CartQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['session_key']),
+            models.Index(fields=['user', '-updated_at']),
+            # Abandoned guest carts, scanned by purge_carts
+            models.Index(
+                fields=['updated_at'], condition=models.Q(user__isnull=True),
+                name='orders_cart_guest_updated_idx'
+            ),
+        ]
     
     def __str__(self):
         if self.user:
             return f"Cart for {self.user.username}"
         return f"Guest cart {self.session_key}"
     
+    def touch(self):
+        """Record cart activity (item changes do not save the cart itself)"""
+        Cart.objects.filter(pk=self.pk).update(updated_at=timezone.now())
+    
+    def get_summary(self):
+        """
+        Subtotal, discount, total and item count together. Walks the items
+        once when they are prefetched, otherwise aggregates in the database.
+        """
+        if 'items' in getattr(self, '_prefetched_objects_cache', {}):
+            subtotal = Decimal('0.00')
+            item_count = 0
+            for item in self.items.all():
+                subtotal += item.get_subtotal()
+                item_count += item.quantity
+        else:
+            totals = self.items.aggregate(
+                subtotal=models.Sum(
+                    models.F('product_price') * models.F('quantity'),
+                    output_field=models.DecimalField(max_digits=12, decimal_places=2)
+                ),
+                item_count=models.Sum('quantity'),
+            )
+            subtotal = totals['subtotal'] or Decimal('0.00')
+            item_count = totals['item_count'] or 0
+        
+        discount = Decimal('0.00')
+        if self.promo_code:
+            is_valid, message = self.promo_code.is_valid()
+            if is_valid:
+                discount = self.promo_code.calculate_discount(subtotal)
+        
+        return CartSummary(subtotal, discount, subtotal - discount, item_count)
+    
     def get_subtotal(self):
         """Calculate subtotal (before discount)"""
-        return sum(item.get_subtotal() for item in self.items.all())
+        return self.get_summary().subtotal
     
     def get_discount_amount(self):
         """Calculate discount amount"""
-        if not self.promo_code:
-            return Decimal('0.00')
-        
-        is_valid, message = self.promo_code.is_valid()
-        if not is_valid:
-            return Decimal('0.00')
-        
-        return self.promo_code.calculate_discount(self.get_subtotal())
+        return self.get_summary().discount
     
     def get_total(self):
         """Calculate total price after discount"""
-        subtotal = self.get_subtotal()
-        discount = self.get_discount_amount()
-        return subtotal - discount
+        return self.get_summary().total
     
     def get_item_count(self):
         """Get total number of items in cart"""
-        return sum(item.quantity for item in self.items.all())
+        return self.get_summary().item_count
 
 
 class CartItem(models.Model):
@@ -209,6 +285,12 @@ class Order(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # OrderViewSet lists a user's orders newest first
+            models.Index(fields=['user', '-created_at']),
+            # Accounting exports walk a created_at range oldest first
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return f"Order {self.order_number}"
@@ -237,3 +319,43 @@ class OrderItem(models.Model):
     def get_subtotal(self):
         """Calculate subtotal for this order item"""
         return self.product_price * self.quantity
+
+
+class PaymentEvent(models.Model):
+    """
+    Paystack webhook delivery, stored once per (reference, event) and
+    processed off the request path by the process_payment_events worker
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_PROCESSED = 'processed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_PROCESSED, 'Processed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    reference = models.CharField(max_length=100)
+    event = models.CharField(max_length=50)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-received_at']
+        constraints = [
+            models.UniqueConstraint(fields=['reference', 'event'], name='unique_payment_event'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event} {self.reference} ({self.status})"
@@ -0,0 +1,263 @@
+"""
+Paystack payment finalization, verification results and the webhook
+event queue.
+
+Successful verifications are stored per reference (cache first, then the
+Order row itself), and a per-reference single-flight lock lets only one
+request call the gateway and create the order while duplicates wait for
+its result.
+
+Webhook deliveries are stored as PaymentEvent rows (one per reference and
+event type, so redeliveries are no-ops) and drained by the
+process_payment_events management command. Workers claim rows with
+SELECT ... FOR UPDATE SKIP LOCKED where the database supports it; a row
+left in `processing` by a crashed worker is reclaimed after LEASE_SECONDS.
+"""
+import hashlib
+import hmac
+import logging
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Cart, Order, OrderItem, PaymentEvent
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+
+# A claimed event not finished within this window is handed to another worker
+LEASE_SECONDS = 300
+
+VERIFY_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Longer than the worst case of a verify call with its retries
+VERIFY_LOCK_TIMEOUT = 90
+
+# How long a duplicate verify request waits for the in-flight one
+VERIFY_WAIT_SECONDS = 10
+
+
+def valid_signature(body, signature, secret):
+    """Check the x-paystack-signature header (HMAC-SHA512 of the raw body)"""
+    if not signature:
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha512).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def create_paid_order(reference, transaction_data):
+    """
+    Create the order for a successful Paystack transaction in one database
+    transaction: the cart's items and their targets are prefetched and the
+    order items inserted with a single bulk_create. Returns the existing
+    order when the reference has already been finalized.
+    """
+    # Get customer details from metadata
+    metadata = transaction_data.get('metadata') or {}
+    cart_id = metadata.get('cart_id')
+    customer_email = transaction_data.get('customer', {}).get('email')
+    amount = transaction_data.get('amount', 0) / 100  # Convert from kobo/pesewas
+    reference = reference[:100]  # Truncate to 100 chars
+
+    with transaction.atomic():
+        existing = Order.objects.filter(payment_reference=reference).first()
+        if existing:
+            return existing
+
+        try:
+            with transaction.atomic():
+                order = Order.objects.create(
+                    email=customer_email or metadata.get('email', 'unknown@email.com'),
+                    full_name=metadata.get('full_name', 'Customer'),
+                    phone=metadata.get('phone', '')[:50],  # Truncate to 50 chars
+                    shipping_address=metadata.get('shipping_address', ''),
+                    total_amount=amount,
+                    status='processing',
+                    payment_reference=reference
+                )
+        except IntegrityError:
+            # Another process finalized the same reference concurrently
+            existing = Order.objects.filter(payment_reference=reference).first()
+            if existing:
+                return existing
+            raise
+        except Exception:
+            logger.exception('Error creating order for payment %s', reference)
+            raise
+
+        # Create order items from the cart
+        cart = Cart.objects.with_items().filter(id=cart_id).first() if cart_id else None
+        if cart:
+            order_items = []
+            for cart_item in cart.items.all():
+                product_obj = cart_item.get_product()
+                order_items.append(OrderItem(
+                    order=order,
+                    product_id=cart_item.product_id,
+                    product_name=cart_item.product_name or (product_obj.name if product_obj else 'Unknown'),
+                    product_price=cart_item.product_price or (product_obj.price if product_obj else 0),
+                    quantity=cart_item.quantity,
+                    size=cart_item.size
+                ))
+            OrderItem.objects.bulk_create(order_items)
+
+    return order
+
+
+def _verification_key(reference):
+    return f'paystack:verify:{hashlib.md5(reference.encode()).hexdigest()}'
+
+
+def _verification_lock_key(reference):
+    return f'{_verification_key(reference)}:lock'
+
+
+def verification_result(reference, order):
+    """Response body for a successfully verified reference"""
+    return {
+        'status': True,
+        'message': 'Verification successful',
+        'data': {
+            'status': 'success',
+            'reference': reference,
+            'amount': float(order.total_amount),
+            'order_number': order.order_number,
+            'total_amount': str(order.total_amount),
+            'email': order.email,
+            'full_name': order.full_name
+        }
+    }
+
+
+def store_verification(reference, order):
+    """Remember a successful verification; returns its response body"""
+    result = verification_result(reference, order)
+    cache.set(_verification_key(reference), result, VERIFY_CACHE_TIMEOUT)
+    return result
+
+
+def get_verification(reference):
+    """Stored result for an already-verified reference, or None"""
+    result = cache.get(_verification_key(reference))
+    if result is not None:
+        return result
+    # The order may have been finalized elsewhere (webhook worker, other process)
+    order = Order.objects.filter(payment_reference=reference[:100]).first()
+    if order:
+        return store_verification(reference, order)
+    return None
+
+
+@contextmanager
+def verification_lock(reference):
+    """Single-flight lock per reference; yields whether this caller holds it"""
+    key = _verification_lock_key(reference)
+    acquired = cache.add(key, 1, VERIFY_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(key)
+
+
+def wait_for_verification(reference, timeout=None, interval=0.1):
+    """Poll for the in-flight verification's result; None if it does not arrive"""
+    deadline = time.monotonic() + (VERIFY_WAIT_SECONDS if timeout is None else timeout)
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        result = get_verification(reference)
+        if result is not None:
+            return result
+        if cache.get(_verification_lock_key(reference)) is None:
+            # The other request finished without a successful verification
+            return None
+    return None
+
+
+def record_event(payload):
+    """
+    Store a webhook delivery for processing; returns (event, created).
+    A redelivered (reference, event) pair returns the stored row unchanged.
+    """
+    data = payload.get('data') or {}
+    return PaymentEvent.objects.get_or_create(
+        reference=str(data.get('reference', ''))[:100],
+        event=str(payload.get('event', ''))[:50],
+        defaults={'payload': payload},
+    )
+
+
+def _handle_charge_success(event):
+    create_paid_order(event.reference, event.payload.get('data') or {})
+
+
+# event type -> handler; other event types are acknowledged and skipped
+HANDLERS = {
+    'charge.success': _handle_charge_success,
+}
+
+
+def claim_events(batch_size=50):
+    """Lock up to batch_size due events for this worker and mark them processing"""
+    now = timezone.now()
+    due = PaymentEvent.objects.filter(
+        Q(status=PaymentEvent.STATUS_PENDING, available_at__lte=now) |
+        Q(status=PaymentEvent.STATUS_PROCESSING, locked_at__lt=now - timedelta(seconds=LEASE_SECONDS))
+    ).order_by('available_at', 'id')
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('id', flat=True)[:batch_size])
+        PaymentEvent.objects.filter(id__in=ids).update(
+            status=PaymentEvent.STATUS_PROCESSING,
+            attempts=F('attempts') + 1,
+            locked_at=now,
+        )
+    return list(PaymentEvent.objects.filter(id__in=ids).order_by('available_at', 'id'))
+
+
+def process_event(event):
+    """Run the handler for one claimed event; returns the final status"""
+    handler = HANDLERS.get(event.event)
+    try:
+        with transaction.atomic():
+            if handler:
+                handler(event)
+            PaymentEvent.objects.filter(pk=event.pk).update(
+                status=PaymentEvent.STATUS_PROCESSED,
+                processed_at=timezone.now(),
+                locked_at=None,
+                last_error='',
+            )
+        return PaymentEvent.STATUS_PROCESSED
+    except Exception as exc:
+        if event.attempts >= MAX_ATTEMPTS:
+            new_status = PaymentEvent.STATUS_FAILED
+        else:
+            new_status = PaymentEvent.STATUS_PENDING
+        logger.warning(
+            'Payment event %s (%s %s) failed on attempt %s: %r',
+            event.pk, event.event, event.reference, event.attempts, exc
+        )
+        # Exponential backoff: 2, 4, 8, ... seconds
+        PaymentEvent.objects.filter(pk=event.pk).update(
+            status=new_status,
+            available_at=timezone.now() + timedelta(seconds=2 ** event.attempts),
+            locked_at=None,
+            last_error=repr(exc),
+        )
+        return new_status
+
+
+def process_pending_events(batch_size=50):
+    """Claim and process one batch; returns {status: count}"""
+    counts = {}
+    for event in claim_events(batch_size):
+        result = process_event(event)
+        counts[result] = counts.get(result, 0) + 1
+    return counts
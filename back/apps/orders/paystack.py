@@ -0,0 +1,223 @@
+"""
+HTTP client for the Paystack API.
+
+One process-wide client keeps a pooled requests.Session, so calls reuse
+TCP/TLS connections to api.paystack.co. On top of that:
+- separate connect and read timeouts;
+- bounded retries with full-jitter exponential backoff, only for
+  idempotent calls (verify), on connection errors, timeouts and 5xx
+  (other request errors count as failures but are raised at once);
+- a circuit breaker that fails fast with CircuitOpenError after repeated
+  gateway failures and lets one trial request through after a cool-down;
+- per-endpoint latency histograms, exposed through get_stats().
+"""
+import logging
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+PAYSTACK_SECRET_KEY = config('PAYSTACK_SECRET_KEY', default='sk_test_your_secret_key_here')
+PAYSTACK_BASE_URL = 'https://api.paystack.co'
+
+# Upper bounds of the latency buckets, in milliseconds
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+
+# Transport errors worth repeating; any other RequestException is raised at once
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without calling the gateway while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open)"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def before_request(self):
+        with self._lock:
+            state = self.state
+            if state == 'open' or (state == 'half-open' and self._trial_in_flight):
+                raise CircuitOpenError('Payment gateway circuit is open')
+            if state == 'half-open':
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial_in_flight:
+                    logger.warning('Payment gateway circuit opened after %s failures', self.failures)
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram for one endpoint"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_ms, error=False):
+        with self._lock:
+            index = next(
+                (i for i, bound in enumerate(self.buckets) if elapsed_ms <= bound),
+                len(self.buckets)
+            )
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            if error:
+                self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f'le_{bound}' for bound in self.buckets] + ['le_inf']
+            return {
+                'count': self.count,
+                'errors': self.errors,
+                'mean_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+                'buckets': dict(zip(labels, self.counts)),
+            }
+
+
+class PaystackClient:
+    """Pooled, retrying Paystack API client"""
+
+    def __init__(self, secret_key, base_url=PAYSTACK_BASE_URL, connect_timeout=3.05,
+                 read_timeout=20.0, pool_maxsize=10, max_retries=2, backoff_base=0.25,
+                 backoff_max=4.0, failure_threshold=5, reset_timeout=30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.histograms = {}
+        self._histograms_lock = threading.Lock()
+
+        self.session = requests.Session()
+        # Retries are handled here so only idempotent calls are repeated
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {secret_key}',
+            'Content-Type': 'application/json',
+        })
+
+    def _histogram(self, endpoint):
+        with self._histograms_lock:
+            if endpoint not in self.histograms:
+                self.histograms[endpoint] = LatencyHistogram()
+            return self.histograms[endpoint]
+
+    def _backoff(self, attempt):
+        """Full jitter: uniform between 0 and the capped exponential delay"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _request(self, method, path, endpoint, retries=0, **kwargs):
+        histogram = self._histogram(endpoint)
+        attempt = 0
+        while True:
+            self.breaker.before_request()
+            started = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method, f'{self.base_url}{path}', timeout=self.timeout, **kwargs
+                )
+            except requests.exceptions.RequestException as exc:
+                histogram.observe((time.perf_counter() - started) * 1000, error=True)
+                # Every failure is recorded, which also ends a half-open trial
+                self.breaker.record_failure()
+                if attempt >= retries or not isinstance(exc, RETRY_EXCEPTIONS):
+                    raise
+            else:
+                failed = response.status_code in RETRY_STATUS_CODES
+                histogram.observe((time.perf_counter() - started) * 1000, error=failed)
+                if not failed:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if attempt >= retries:
+                    return response
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def initialize_transaction(self, payload):
+        """POST /transaction/initialize (not retried: it is not idempotent)"""
+        return self._request('POST', '/transaction/initialize', 'initialize', json=payload)
+
+    def verify_transaction(self, reference):
+        """GET /transaction/verify/<reference>, retried on transient failures"""
+        return self._request(
+            'GET', f'/transaction/verify/{requests.utils.quote(str(reference), safe="")}',
+            'verify', retries=self.max_retries
+        )
+
+    def get_stats(self):
+        return {
+            'circuit': self.breaker.state,
+            'consecutive_failures': self.breaker.failures,
+            'endpoints': {
+                endpoint: histogram.snapshot()
+                for endpoint, histogram in sorted(self.histograms.items())
+            },
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, configured from PAYSTACK_* settings"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PaystackClient(
+                    PAYSTACK_SECRET_KEY,
+                    base_url=getattr(settings, 'PAYSTACK_BASE_URL', PAYSTACK_BASE_URL),
+                    connect_timeout=getattr(settings, 'PAYSTACK_CONNECT_TIMEOUT', 3.05),
+                    read_timeout=getattr(settings, 'PAYSTACK_READ_TIMEOUT', 20.0),
+                    pool_maxsize=getattr(settings, 'PAYSTACK_POOL_MAXSIZE', 10),
+                    max_retries=getattr(settings, 'PAYSTACK_MAX_RETRIES', 2),
+                    failure_threshold=getattr(settings, 'PAYSTACK_BREAKER_THRESHOLD', 5),
+                    reset_timeout=getattr(settings, 'PAYSTACK_BREAKER_RESET', 30.0),
+                )
+    return _client
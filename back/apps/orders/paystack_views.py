@@ -1,19 +1,23 @@
-import requests
 import json
+import logging
+import requests
 from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
-from decouple import config
+from .paystack import PAYSTACK_SECRET_KEY, CircuitOpenError, get_client
+from .payments import (
+    create_paid_order, get_verification, record_event, store_verification,
+    valid_signature, verification_lock, wait_for_verification
+)
+
+logger = logging.getLogger(__name__)
 
-# Get Paystack secret key from environment
-PAYSTACK_SECRET_KEY = config('PAYSTACK_SECRET_KEY', default='sk_test_your_secret_key_here')
-PAYSTACK_BASE_URL = 'https://api.paystack.co'
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -43,17 +47,7 @@ def initialize_payment(request):
         }
         
         # Make request to Paystack
-        headers = {
-            'Authorization': f'Bearer {PAYSTACK_SECRET_KEY}',
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.post(
-            f'{PAYSTACK_BASE_URL}/transaction/initialize',
-            headers=headers,
-            json=paystack_data,
-            timeout=30
-        )
+        response = get_client().initialize_transaction(paystack_data)
         
         if response.status_code == 200:
             return Response(response.json())
@@ -64,13 +58,20 @@ def initialize_payment(request):
                 'details': error_data
             }, status=status.HTTP_400_BAD_REQUEST)
             
+    except CircuitOpenError:
+        return Response({
+            'error': 'Payment gateway is temporarily unavailable, please retry shortly'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
     except requests.exceptions.RequestException as e:
+        logger.warning('Paystack request failed: %s', e)
         return Response({
             'error': 'Failed to connect to payment gateway',
             'details': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     except Exception as e:
+        logger.exception('Unexpected error calling Paystack')
         return Response({
             'error': 'An unexpected error occurred',
             'details': str(e)
@@ -81,11 +82,6 @@ def initialize_payment(request):
 @permission_classes([AllowAny])
 def verify_payment(request):
     """Verify Paystack payment and create order"""
-    from .models import Order, OrderItem, Cart
-    from apps.products.models import Product
-    from apps.content.models import DupeProduct
-    from django.contrib.contenttypes.models import ContentType
-    
     try:
         reference = request.data.get('reference')
         
@@ -94,126 +90,93 @@ def verify_payment(request):
                 'error': 'Payment reference is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Make request to Paystack
-        headers = {
-            'Authorization': f'Bearer {PAYSTACK_SECRET_KEY}',
-            'Content-Type': 'application/json'
-        }
-        
-        paystack_response = requests.get(
-            f'{PAYSTACK_BASE_URL}/transaction/verify/{reference}',
-            headers=headers,
-            timeout=30
-        )
+        # Already verified: answer from the stored result without the gateway
+        result = get_verification(reference)
+        if result is not None:
+            return Response(result)
         
-        if paystack_response.status_code == 200:
-            paystack_data = paystack_response.json()
+        with verification_lock(reference) as acquired:
+            if not acquired:
+                # A concurrent request is verifying this reference; reuse its result
+                result = wait_for_verification(reference)
+                if result is not None:
+                    return Response(result)
+                return Response({
+                    'error': 'Verification already in progress, please retry'
+                }, status=status.HTTP_409_CONFLICT)
             
-            # Check if payment was successful
-            if paystack_data.get('status') and paystack_data.get('data', {}).get('status') == 'success':
-                transaction_data = paystack_data['data']
-                
-                # Get customer details from metadata
-                metadata = transaction_data.get('metadata', {})
-                cart_id = metadata.get('cart_id')
-                customer_email = transaction_data.get('customer', {}).get('email')
-                amount = transaction_data.get('amount', 0) / 100  # Convert from kobo/pesewas
-                
-                # Create order
-                try:
-                    order = Order.objects.create(
-                        email=customer_email or metadata.get('email', 'unknown@email.com'),
-                        full_name=metadata.get('full_name', 'Customer'),
-                        phone=metadata.get('phone', '')[:50],  # Truncate to 50 chars
-                        shipping_address=metadata.get('shipping_address', ''),
-                        total_amount=amount,
-                        status='processing',
-                        payment_reference=reference[:100]  # Truncate to 100 chars
-                    )
-                except Exception as e:
-                    print(f"Error creating order: {e}")
-                    print(f"Data: email={customer_email}, full_name={metadata.get('full_name')}, phone={metadata.get('phone')}, reference={reference}")
-                    raise
+            # Make request to Paystack
+            paystack_response = get_client().verify_transaction(reference)
+            
+            if paystack_response.status_code == 200:
+                paystack_data = paystack_response.json()
                 
-                # Get cart items and create order items
-                if cart_id:
-                    try:
-                        cart = Cart.objects.get(id=cart_id)
-                        for cart_item in cart.items.all():
-                            # Get product details
-                            product_obj = cart_item.get_product()
-                            
-                            OrderItem.objects.create(
-                                order=order,
-                                product_name=cart_item.product_name or product_obj.name,
-                                product_price=cart_item.product_price or product_obj.price,
-                                quantity=cart_item.quantity,
-                                size=cart_item.size,
-                                subtotal=cart_item.get_subtotal()
-                            )
-                    except Cart.DoesNotExist:
-                        pass
+                # Check if payment was successful
+                if paystack_data.get('status') and paystack_data.get('data', {}).get('status') == 'success':
+                    order = create_paid_order(reference, paystack_data['data'])
+                    
+                    # Return success with order details
+                    return Response(store_verification(reference, order))
                 
-                # Return success with order details
+                return Response(paystack_data)
+            else:
+                error_data = paystack_response.json() if paystack_response.content else {'message': 'Payment verification failed'}
                 return Response({
-                    'status': True,
-                    'message': 'Verification successful',
-                    'data': {
-                        'status': 'success',
-                        'reference': reference,
-                        'amount': amount,
-                        'order_number': order.order_number,
-                        'total_amount': str(order.total_amount),
-                        'email': order.email,
-                        'full_name': order.full_name
-                    }
-                })
-            
-            return Response(paystack_data)
-        else:
-            error_data = paystack_response.json() if paystack_response.content else {'message': 'Payment verification failed'}
-            return Response({
-                'error': error_data.get('message', 'Payment verification failed'),
-                'details': error_data
-            }, status=status.HTTP_400_BAD_REQUEST)
+                    'error': error_data.get('message', 'Payment verification failed'),
+                    'details': error_data
+                }, status=status.HTTP_400_BAD_REQUEST)
             
+    except CircuitOpenError:
+        return Response({
+            'error': 'Payment gateway is temporarily unavailable, please retry shortly'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
     except requests.exceptions.RequestException as e:
+        logger.warning('Paystack request failed: %s', e)
         return Response({
             'error': 'Failed to connect to payment gateway',
             'details': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     except Exception as e:
+        logger.exception('Unexpected error calling Paystack')
         return Response({
             'error': 'An unexpected error occurred',
             'details': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def paystack_stats(request):
+    """Staff-only circuit breaker state and per-endpoint gateway latency"""
+    return Response(get_client().get_stats())
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def paystack_webhook(request):
-    """Handle Paystack webhook notifications"""
+    """
+    Receive Paystack webhook notifications.
+    
+    The signature is checked and the event stored; the process_payment_events
+    worker finalizes orders, so this returns without calling the gateway.
+    """
+    if not valid_signature(request.body, request.headers.get('x-paystack-signature'), PAYSTACK_SECRET_KEY):
+        logger.warning('Rejected Paystack webhook with invalid signature')
+        return JsonResponse({'error': 'Invalid signature'}, status=401)
+    
     try:
-        # Verify webhook signature (optional but recommended)
-        # signature = request.headers.get('x-paystack-signature')
-        
-        # Parse webhook data
         webhook_data = json.loads(request.body)
-        event = webhook_data.get('event')
-        data = webhook_data.get('data', {})
-        
-        if event == 'charge.success':
-            # Handle successful payment
-            reference = data.get('reference')
-            amount = data.get('amount')
-            customer_email = data.get('customer', {}).get('email')
-            
-            # TODO: Update order status, send confirmation email, etc.
-            print(f"Payment successful: {reference}, Amount: {amount}, Email: {customer_email}")
-        
-        return JsonResponse({'status': 'success'})
-        
-    except Exception as e:
-        print(f"Webhook error: {str(e)}")
-        return JsonResponse({'error': str(e)}, status=400)
\ No newline at end of file
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON payload'}, status=400)
+    
+    if not isinstance(webhook_data, dict) or not (webhook_data.get('data') or {}).get('reference'):
+        return JsonResponse({'error': 'Missing event reference'}, status=400)
+    
+    event, created = record_event(webhook_data)
+    logger.info(
+        'Paystack webhook %s for %s%s',
+        event.event, event.reference, '' if created else ' (duplicate)'
+    )
+    return JsonResponse({'status': 'success', 'duplicate': not created})
@@ -1,5 +1,7 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import Cart, CartItem, Order, OrderItem, PromoCode
+from .stock import InsufficientStock, cart_item_target, check_stock, reserve_stock, target_details
 from apps.products.serializers import ProductListSerializer
 
 
@@ -76,17 +78,22 @@ class CartSerializer(serializers.ModelSerializer):
         fields = ['id', 'items', 'promo_code', 'subtotal', 'discount_amount', 
                  'total', 'item_count', 'created_at', 'updated_at']
     
+    def to_representation(self, instance):
+        # Price the cart once; the summary fields below all read from it
+        self._summary = instance.get_summary()
+        return super().to_representation(instance)
+    
     def get_subtotal(self, obj):
-        return float(obj.get_subtotal())
+        return float(self._summary.subtotal)
     
     def get_discount_amount(self, obj):
-        return float(obj.get_discount_amount())
+        return float(self._summary.discount)
     
     def get_total(self, obj):
-        return float(obj.get_total())
+        return float(self._summary.total)
     
     def get_item_count(self, obj):
-        return obj.get_item_count()
+        return self._summary.item_count
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -134,69 +141,84 @@ class OrderCreateSerializer(serializers.Serializer):
         if not cart.items.exists():
             raise serializers.ValidationError("Cart is empty.")
         
-        # Validate stock availability
-        for item in cart.items.all():
-            product_obj = item.get_product()
-            if product_obj and product_obj.stock_quantity < item.quantity:
-                product_name = product_obj.name if hasattr(product_obj, 'name') else item.product_name
-                raise serializers.ValidationError(
-                    f"Insufficient stock for {product_name}. "
-                    f"Available: {product_obj.stock_quantity}, Requested: {item.quantity}"
-                )
+        # Validate stock availability (one query per stock model)
+        try:
+            check_stock(
+                (*cart_item_target(item), item.quantity)
+                for item in cart.items.all()
+            )
+        except InsufficientStock as exc:
+            raise serializers.ValidationError(str(exc))
         
         return data
     
     def create(self, validated_data):
-        """Create order from cart"""
+        """Create order from cart, reserving stock atomically"""
         cart = self.context.get('cart')
         request = self.context.get('request')
+        cart_items = list(cart.items.all())
         
-        # Calculate pricing
-        subtotal = cart.get_subtotal()
-        discount = cart.get_discount_amount()
-        total = cart.get_total()
-        
-        # Create order
-        order = Order.objects.create(
-            user=request.user if request.user.is_authenticated else None,
-            email=validated_data['email'],
-            full_name=validated_data['full_name'],
-            shipping_address=validated_data['shipping_address'],
-            phone=validated_data['phone'],
-            subtotal_amount=subtotal,
-            discount_amount=discount,
-            total_amount=total,
-            promo_code_used=cart.promo_code.code if cart.promo_code else '',
-            promo_discount_type=cart.promo_code.discount_type if cart.promo_code else '',
-            promo_discount_value=cart.promo_code.discount_value if cart.promo_code else None,
-        )
-        
-        # Create order items and reduce stock
-        for cart_item in cart.items.all():
-            # Get the actual product object (supports all product types)
-            product_obj = cart_item.get_product()
+        with transaction.atomic():
+            try:
+                reserve_stock(
+                    (*cart_item_target(cart_item), cart_item.quantity)
+                    for cart_item in cart_items
+                )
+            except InsufficientStock as exc:
+                raise serializers.ValidationError(str(exc))
+            
+            # Calculate pricing
+            subtotal, discount, total, _ = cart.get_summary()
             
-            OrderItem.objects.create(
-                order=order,
-                product=cart_item.product if cart_item.product else None,
-                product_name=cart_item.product_name or (product_obj.name if product_obj else 'Unknown'),
-                product_price=cart_item.product_price or (product_obj.price if product_obj else 0),
-                quantity=cart_item.quantity,
-                size=cart_item.size
+            # Create order
+            order = Order.objects.create(
+                user=request.user if request.user.is_authenticated else None,
+                email=validated_data['email'],
+                full_name=validated_data['full_name'],
+                shipping_address=validated_data['shipping_address'],
+                phone=validated_data['phone'],
+                subtotal_amount=subtotal,
+                discount_amount=discount,
+                total_amount=total,
+                promo_code_used=cart.promo_code.code if cart.promo_code else '',
+                promo_discount_type=cart.promo_code.discount_type if cart.promo_code else '',
+                promo_discount_value=cart.promo_code.discount_value if cart.promo_code else None,
             )
             
-            # Reduce stock quantity
-            if product_obj:
-                product_obj.stock_quantity -= cart_item.quantity
-                product_obj.save()
-        
-        # Apply promo code usage if used
-        if cart.promo_code:
-            cart.promo_code.apply_usage()
-        
-        # Clear cart
-        cart.items.all().delete()
-        cart.promo_code = None
-        cart.save()
+            # Line details come from the name/price cached on each cart item, falling
+            # back to the item itself (loaded in bulk) when the cache is empty
+            targets = [cart_item_target(cart_item) for cart_item in cart_items]
+            details = target_details(
+                target for cart_item, target in zip(cart_items, targets)
+                if not (cart_item.product_name and cart_item.product_price)
+            )
+            order_items = []
+            for cart_item, (model, pk) in zip(cart_items, targets):
+                name, price = cart_item.product_name, cart_item.product_price
+                if not (name and price):
+                    if model is None or (model._meta.label_lower, pk) not in details:
+                        raise serializers.ValidationError(
+                            f"{name or 'An item in your cart'} is no longer available."
+                        )
+                    target_name, target_price = details[(model._meta.label_lower, pk)]
+                    name, price = name or target_name, price or target_price
+                order_items.append(OrderItem(
+                    order=order,
+                    product_id=cart_item.product_id,
+                    product_name=name,
+                    product_price=price,
+                    quantity=cart_item.quantity,
+                    size=cart_item.size
+                ))
+            OrderItem.objects.bulk_create(order_items)
+            
+            # Apply promo code usage if used
+            if cart.promo_code:
+                cart.promo_code.apply_usage()
+            
+            # Clear cart
+            cart.items.all().delete()
+            cart.promo_code = None
+            cart.save()
         
         return order
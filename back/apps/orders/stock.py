@@ -0,0 +1,128 @@
+"""
+Race-free stock reservation for checkout.
+
+Every line is reserved with one conditional UPDATE:
+
+    UPDATE ... SET stock_quantity = stock_quantity - n
+    WHERE id = ... AND stock_quantity >= n
+
+so two checkouts can never both take the last unit. Rows are updated in a
+fixed (model, pk) order, which keeps concurrent checkouts from deadlocking
+on each other's row locks. Callers must run reserve_stock inside
+transaction.atomic so a failed line rolls back the lines before it.
+
+The UPDATE also sets updated_at, which the ETag/Last-Modified validators
+are built from. Once the transaction commits, the response cache versions
+of the reserved models are bumped, because update() sends no save signals.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from apps.products.models import Product
+from config.response_cache import bump_version
+
+
+class InsufficientStock(Exception):
+    """Raised when a line cannot be reserved"""
+
+    def __init__(self, name, available, requested):
+        self.name = name
+        self.available = available
+        self.requested = requested
+        super().__init__(
+            f"Insufficient stock for {name}. "
+            f"Available: {available}, Requested: {requested}"
+        )
+
+
+def cart_item_target(cart_item):
+    """(model, pk) of the stock row behind a cart item, without loading it"""
+    if cart_item.content_type_id and cart_item.object_id:
+        return ContentType.objects.get_for_id(cart_item.content_type_id).model_class(), cart_item.object_id
+    if cart_item.product_id:
+        return Product, cart_item.product_id
+    return None, None
+
+
+def _merge_lines(lines):
+    """{(model label, pk): (model, pk, total quantity)} for (model, pk, quantity) lines"""
+    totals = {}
+    for model, pk, quantity in lines:
+        if model is None:
+            continue
+        key = (model._meta.label_lower, pk)
+        _, _, current = totals.get(key, (model, pk, 0))
+        totals[key] = (model, pk, current + quantity)
+    return totals
+
+
+def target_details(targets):
+    """
+    {(model label, pk): (name, price)} for (model, pk) targets, loaded with
+    one query per model. Targets that no longer exist are left out.
+    """
+    pks_by_model = {}
+    for model, pk in targets:
+        if model is not None:
+            pks_by_model.setdefault(model, set()).add(pk)
+    details = {}
+    for model, pks in pks_by_model.items():
+        for pk, name, price in model.objects.filter(pk__in=pks).values_list('pk', 'name', 'price'):
+            details[(model._meta.label_lower, pk)] = (name, price)
+    return details
+
+
+def check_stock(lines):
+    """
+    Raise InsufficientStock for the first (model, pk, quantity) line that the
+    current stock cannot cover, without reserving anything.
+
+    Stock rows are loaded with one query per model.
+    """
+    totals = _merge_lines(lines)
+    pks_by_model = {}
+    for model, pk, _ in totals.values():
+        pks_by_model.setdefault(model, set()).add(pk)
+    stock = {}
+    for model, pks in pks_by_model.items():
+        for pk, name, available in model.objects.filter(pk__in=pks).values_list(
+            'pk', 'name', 'stock_quantity'
+        ):
+            stock[(model._meta.label_lower, pk)] = (name, available)
+
+    for key, (model, pk, quantity) in totals.items():
+        if key not in stock:
+            # Deleted since it was added to the cart: nothing to check
+            continue
+        name, available = stock[key]
+        if available < quantity:
+            raise InsufficientStock(name, available, quantity)
+
+
+def reserve_stock(lines):
+    """
+    Decrement stock for (model, pk, quantity) lines, all or nothing.
+
+    Quantities for the same row are merged first. Raises InsufficientStock
+    for the first row that cannot cover its quantity.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        raise RuntimeError('reserve_stock must run inside transaction.atomic')
+
+    totals = _merge_lines(lines)
+
+    for key in sorted(totals):
+        model, pk, quantity = totals[key]
+        reserved = model.objects.filter(pk=pk, stock_quantity__gte=quantity).update(
+            stock_quantity=F('stock_quantity') - quantity,
+            updated_at=Now(),
+        )
+        if not reserved:
+            name, available = model.objects.filter(pk=pk).values_list(
+                'name', 'stock_quantity'
+            ).first() or (str(pk), 0)
+            raise InsufficientStock(name, available, quantity)
+
+    for model in {model for model, _, _ in totals.values()}:
+        transaction.on_commit(lambda model=model: bump_version(model))
@@ -1,9 +1,37 @@
-from django.test import TestCase
+import csv
+import hashlib
+import hmac
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import requests
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
-from apps.products.models import Category, Product
-from .models import Cart, CartItem, Order, OrderItem
+from django.contrib.contenttypes.models import ContentType
+from django.db import OperationalError, connection, connections, transaction
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from apps.products.models import Category, Product, ProductImage
+from apps.content.models import DupeProduct, AirAmbience, PerfumeOil
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+from .models import Cart, CartItem, Order, OrderItem, PaymentEvent, PromoCode
+from django.core.cache import cache
+from config.logs import JsonFormatter, SampleFilter
+from .payments import MAX_ATTEMPTS, create_paid_order, process_pending_events, verification_lock
+from .paystack import CircuitOpenError, PaystackClient
+from .cart_resolution import make_cart_token, read_cart_token
+from .serializers import OrderCreateSerializer
+from .stock import InsufficientStock, reserve_stock
 
 
 class CartModelTest(TestCase):
@@ -29,6 +57,28 @@ class CartModelTest(TestCase):
         """Test cart item count"""
         CartItem.objects.create(cart=self.cart, product=self.product, quantity=3)
         self.assertEqual(self.cart.get_item_count(), 3)
+    
+    def test_cart_summary(self):
+        """Test summary matches with and without prefetched items"""
+        CartItem.objects.create(cart=self.cart, product=self.product, quantity=2)
+        CartItem.objects.create(cart=self.cart, product=self.product, quantity=1, size='100ml')
+        self.cart.promo_code = PromoCode.objects.create(
+            code='TEN', discount_type='percentage', discount_value=Decimal('10'),
+            valid_from=timezone.now() - timedelta(days=1),
+            valid_until=timezone.now() + timedelta(days=1)
+        )
+        self.cart.save()
+        
+        expected = (Decimal('150.00'), Decimal('15.00'), Decimal('135.00'), 3)
+        self.assertEqual(tuple(self.cart.get_summary()), expected)
+        
+        cart = Cart.objects.with_items().get(id=self.cart.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(tuple(cart.get_summary()), expected)
+    
+    def test_empty_cart_summary(self):
+        """Test summary of an empty cart"""
+        self.assertEqual(tuple(self.cart.get_summary()), (0, 0, 0, 0))
 
 
 class OrderModelTest(TestCase):
@@ -125,6 +175,138 @@ class CartAPITest(APITestCase):
         self.assertEqual(cart.items.count(), 0)
 
 
+class CartRenderingQueryTest(APITestCase):
+    """Test cart rendering runs a fixed number of queries"""
+    
+    def setUp(self):
+        self.category = Category.objects.create(name='Test')
+        self.cart = Cart.objects.create()
+    
+    def add_items(self, count):
+        """Add `count` items of each of the four item types"""
+        for i in range(count):
+            product = Product.objects.create(
+                name=f'Product {self.cart.items.count()}', description='Test',
+                price=50.00, category=self.category, stock_quantity=10
+            )
+            ProductImage.objects.create(product=product, image_url='https://example.com/p.jpg')
+            targets = [
+                product,
+                DupeProduct.objects.create(
+                    name=f'Dupe {product.id}', description='Test', price=20.00,
+                    designer_brand='Brand', designer_fragrance='Scent',
+                    designer_price=100.00, scent_notes='Notes'
+                ),
+                AirAmbience.objects.create(
+                    name=f'Candle {product.id}', description='Test',
+                    price=15.00, product_type='candle'
+                ),
+                PerfumeOil.objects.create(
+                    name=f'Oil {product.id}', description='Test', price=10.00
+                ),
+            ]
+            for target in targets:
+                CartItem.objects.create(
+                    cart=self.cart,
+                    content_type=ContentType.objects.get_for_model(target),
+                    object_id=target.id,
+                    product=product if target is product else None,
+                    quantity=1
+                )
+    
+    def get_cart(self):
+        return self.client.get('/api/cart/', HTTP_X_CART_ID=make_cart_token(self.cart.id))
+    
+    def test_cart_query_count_independent_of_items(self):
+        """Test GET /api/cart/ query count does not grow with items or types"""
+        self.add_items(1)
+        self.get_cart()  # warm the content type cache
+        with CaptureQueriesContext(connection) as small_cart:
+            response = self.get_cart()
+        self.assertEqual(len(response.data['items']), 4)
+        
+        self.add_items(5)
+        with self.assertNumQueries(len(small_cart)):
+            response = self.get_cart()
+        self.assertEqual(len(response.data['items']), 24)
+        self.assertTrue(all(item['product']['name'] for item in response.data['items']))
+
+
+class CartResolutionTest(APITestCase):
+    """Test guest cart resolution"""
+    
+    def setUp(self):
+        cache.clear()
+        self.cart = Cart.objects.create()
+    
+    def writes(self, queries):
+        return [
+            query['sql'] for query in queries
+            if query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ]
+    
+    def test_signed_token_read_issues_no_writes(self):
+        """Test reading a cart by signed token writes nothing"""
+        token = make_cart_token(self.cart.id)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/cart/', HTTP_X_CART_ID=token)
+        self.assertEqual(response.data['id'], self.cart.id)
+        self.assertEqual(response['X-Cart-ID'], token)
+        self.assertEqual(self.writes(queries), [])
+    
+    def test_session_cart_reads_issue_no_writes(self):
+        """Test only the first request of a cookie-only guest writes"""
+        first = self.client.get('/api/cart/')
+        self.assertEqual(read_cart_token(first['X-Cart-ID']), first.data['id'])
+        
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get('/api/cart/')
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(self.writes(queries), [])
+    
+    def test_tampered_token_is_rejected(self):
+        """Test a forged token does not expose another cart"""
+        token = make_cart_token(self.cart.id)
+        forged = f'{self.cart.id + 1}:{token.split(":", 1)[1]}'
+        other = Cart.objects.create()
+        self.assertEqual(other.id, self.cart.id + 1)
+        
+        response = self.client.get('/api/cart/', HTTP_X_CART_ID=forged)
+        self.assertNotIn(response.data['id'], [self.cart.id, other.id])
+    
+    def test_plain_id_is_rejected(self):
+        """Test a guessable plain id does not expose another guest's cart"""
+        response = self.client.get('/api/cart/', HTTP_X_CART_ID=str(self.cart.id))
+        self.assertNotEqual(response.data['id'], self.cart.id)
+    
+    def test_plain_id_is_upgraded_to_token_during_window(self):
+        """Test a legacy plain id resolves until the cutoff and is answered with a token"""
+        today = timezone.localdate()
+        with override_settings(CART_ACCEPT_UNSIGNED_IDS_UNTIL=today.isoformat()):
+            with self.assertLogs('apps.orders.cart_resolution', 'WARNING'):
+                response = self.client.get('/api/cart/', HTTP_X_CART_ID=str(self.cart.id))
+        self.assertEqual(response.data['id'], self.cart.id)
+        self.assertEqual(response['X-Cart-ID'], make_cart_token(self.cart.id))
+        
+        with override_settings(CART_ACCEPT_UNSIGNED_IDS_UNTIL=(today - timedelta(days=1)).isoformat()):
+            self.assertIsNone(read_cart_token(str(self.cart.id)))
+    
+    def test_checkout_uses_token_cart(self):
+        """Test order creation finds the cart from the signed token"""
+        product = Product.objects.create(
+            name='Test Product', description='Test', price=50.00,
+            category=Category.objects.create(name='Test'), stock_quantity=10
+        )
+        CartItem.objects.create(cart=self.cart, product=product, quantity=1)
+        response = self.client.post('/api/orders/', {
+            'email': 'test@example.com',
+            'full_name': 'Test User',
+            'shipping_address': '123 Test St',
+            'phone': '1234567890'
+        }, HTTP_X_CART_ID=make_cart_token(self.cart.id))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
 class OrderAPITest(APITestCase):
     """Test Order API endpoints"""
     
@@ -167,6 +349,23 @@ class OrderAPITest(APITestCase):
         # Verify cart was cleared
         self.assertEqual(cart.items.count(), 0)
     
+    def test_order_lines_fall_back_to_item_details(self):
+        """Test cart items without a cached name/price take them from the item"""
+        cart = Cart.objects.create(session_key=self.client.session.session_key or 'test')
+        item = CartItem.objects.create(cart=cart, product=self.product, quantity=2)
+        # As stored before cart items cached product details
+        CartItem.objects.filter(pk=item.pk).update(product_name='', product_price=0)
+        
+        response = self.client.post('/api/orders/', {
+            'email': 'test@example.com',
+            'full_name': 'Test User',
+            'shipping_address': '123 Test St',
+            'phone': '1234567890'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        line = OrderItem.objects.get(order__order_number=response.data['order_number'])
+        self.assertEqual((line.product_name, line.product_price), ('Test Product', Decimal('50.00')))
+    
     def test_create_order_with_insufficient_stock(self):
         """Test order creation fails with insufficient stock"""
         cart = Cart.objects.create(session_key=self.client.session.session_key or 'test')
@@ -181,6 +380,77 @@ class OrderAPITest(APITestCase):
         response = self.client.post('/api/orders/', order_data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
+    def test_failed_line_rolls_back_reservation(self):
+        """Test a later out-of-stock line releases the earlier lines"""
+        oil = PerfumeOil.objects.create(name='Oil', description='Test', price=10.00, stock_quantity=1)
+        cart = Cart.objects.create(session_key=self.client.session.session_key or 'test')
+        CartItem.objects.create(cart=cart, product=self.product, quantity=2)
+        CartItem.objects.create(
+            cart=cart, content_type=ContentType.objects.get_for_model(oil),
+            object_id=oil.id, quantity=3
+        )
+        
+        order_data = {
+            'email': 'test@example.com',
+            'full_name': 'Test User',
+            'shipping_address': '123 Test St',
+            'phone': '1234567890'
+        }
+        response = self.client.post('/api/orders/', order_data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        self.product.refresh_from_db()
+        oil.refresh_from_db()
+        self.assertEqual(self.product.stock_quantity, 10)
+        self.assertEqual(oil.stock_quantity, 1)
+        self.assertEqual(Order.objects.count(), 0)
+        self.assertEqual(cart.items.count(), 2)
+    
+    def test_reservation_invalidates_conditional_get(self):
+        """Test a conditional GET sees the stock taken by a reservation"""
+        url = f'/api/products/{self.product.slug}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        
+        with transaction.atomic():
+            reserve_stock([(Product, self.product.id, 3)])
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['stock_quantity'], 7)
+    
+    def test_stock_validation_queries_do_not_grow_with_lines(self):
+        """Test validating a checkout loads stock rows in bulk"""
+        cart = Cart.objects.create(session_key=self.client.session.session_key or 'test')
+        products = [
+            Product.objects.create(
+                name=f'Bulk {i}', description='Test', price=10.00,
+                category=self.category, stock_quantity=5
+            )
+            for i in range(5)
+        ]
+        CartItem.objects.bulk_create([
+            CartItem(cart=cart, product=product, product_name=product.name,
+                     product_price=product.price, quantity=1)
+            for product in products
+        ])
+        oil = PerfumeOil.objects.create(name='Oil', description='Test', price=10.00, stock_quantity=1)
+        CartItem.objects.create(
+            cart=cart, content_type=ContentType.objects.get_for_model(oil),
+            object_id=oil.id, quantity=2
+        )
+        
+        serializer = OrderCreateSerializer(data={
+            'email': 'test@example.com',
+            'full_name': 'Test User',
+            'shipping_address': '123 Test St',
+            'phone': '1234567890'
+        }, context={'cart': cart})
+        # exists, cart items, products, oils
+        with self.assertNumQueries(4):
+            self.assertFalse(serializer.is_valid())
+        self.assertIn('Insufficient stock for Oil', str(serializer.errors))
+    
     def test_list_user_orders(self):
         """Test listing user's orders"""
         self.client.force_authenticate(user=self.user)
@@ -212,3 +482,542 @@ class OrderAPITest(APITestCase):
         response = self.client.get(f'/api/orders/{order.order_number}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['order_number'], order.order_number)
+
+
+class StockReservationConcurrencyTest(TransactionTestCase):
+    """Test concurrent reservations never oversell"""
+    
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Threads need a file-backed or server test database')
+        category = Category.objects.create(name='Test')
+        self.product = Product.objects.create(
+            name='Last Units', description='Test', price=50.00,
+            category=category, stock_quantity=5
+        )
+        self.dupe = DupeProduct.objects.create(
+            name='Dupe', description='Test', price=20.00, stock_quantity=5,
+            designer_brand='Brand', designer_fragrance='Scent',
+            designer_price=100.00, scent_notes='Notes'
+        )
+    
+    MAX_ATTEMPTS = 50
+    
+    def checkout(self, lines, results):
+        try:
+            for _ in range(self.MAX_ATTEMPTS):
+                try:
+                    with transaction.atomic():
+                        reserve_stock(lines)
+                    results.append(True)
+                    return
+                except InsufficientStock:
+                    results.append(False)
+                    return
+                except OperationalError:
+                    # SQLite reports lock contention instead of waiting; retry
+                    time.sleep(0.01)
+            results.append(None)
+        finally:
+            connections.close_all()
+    
+    def test_no_oversell_under_concurrent_checkouts(self):
+        """Test 20 concurrent two-line checkouts against 5 units"""
+        results = []
+        # Half the threads list the lines in the opposite order
+        forward = [(Product, self.product.id, 1), (DupeProduct, self.dupe.id, 1)]
+        threads = [
+            threading.Thread(
+                target=self.checkout,
+                args=(forward if i % 2 else forward[::-1], results)
+            )
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertNotIn(None, results, 'A checkout gave up on lock contention')
+        self.product.refresh_from_db()
+        self.dupe.refresh_from_db()
+        self.assertEqual(results.count(True), 5)
+        self.assertEqual(self.product.stock_quantity, 0)
+        self.assertEqual(self.dupe.stock_quantity, 0)
+    
+    def test_requires_transaction(self):
+        """Test reserving outside a transaction is rejected"""
+        with self.assertRaises(RuntimeError):
+            reserve_stock([(Product, self.product.id, 1)])
+
+
+class PaystackVerifyTest(APITestCase):
+    """Test order creation on Paystack verification"""
+    
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Test')
+        self.products = [
+            Product.objects.create(
+                name=f'Product {i}', description='Test', price=50.00,
+                category=category, stock_quantity=10
+            )
+            for i in range(30)
+        ]
+    
+    def make_cart(self, count):
+        cart = Cart.objects.create()
+        for product in self.products[:count]:
+            CartItem.objects.create(
+                cart=cart, content_type=ContentType.objects.get_for_model(product),
+                object_id=product.id, product=product, quantity=2
+            )
+        return cart
+    
+    def verify(self, cart, reference, client=None):
+        paystack_response = mock.Mock(status_code=200)
+        paystack_response.json.return_value = {
+            'status': True,
+            'data': {
+                'status': 'success',
+                'amount': 10000,
+                'customer': {'email': 'buyer@example.com'},
+                'metadata': {'cart_id': cart.id, 'full_name': 'Buyer'},
+            },
+        }
+        client = client or mock.Mock()
+        client.verify_transaction.return_value = paystack_response
+        with mock.patch('apps.orders.paystack_views.get_client', return_value=client):
+            return self.client.post('/api/paystack/verify/', {'reference': reference})
+    
+    def test_verify_creates_order_items(self):
+        """Test verification creates one order item per cart item"""
+        response = self.verify(self.make_cart(3), 'ref-items')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        order = Order.objects.get(order_number=response.data['data']['order_number'])
+        self.assertEqual(order.items.count(), 3)
+        self.assertEqual(order.items.first().quantity, 2)
+        self.assertEqual(order.payment_reference, 'ref-items')
+    
+    def test_verify_query_count_independent_of_cart_size(self):
+        """Test a 30-item cart takes as many queries as a 3-item cart"""
+        small_cart, large_cart = self.make_cart(3), self.make_cart(30)
+        with CaptureQueriesContext(connection) as small:
+            self.verify(small_cart, 'ref-small')
+        with self.assertNumQueries(len(small)):
+            response = self.verify(large_cart, 'ref-large')
+        self.assertEqual(OrderItem.objects.filter(order__payment_reference='ref-large').count(), 30)
+    
+    def test_repeated_verify_uses_stored_result(self):
+        """Test duplicate verify calls hit the gateway once and share the order"""
+        cart = self.make_cart(2)
+        client = mock.Mock()
+        first = self.verify(cart, 'ref-dup', client)
+        second = self.verify(cart, 'ref-dup', client)
+        
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(client.verify_transaction.call_count, 1)
+        self.assertEqual(Order.objects.filter(payment_reference='ref-dup').count(), 1)
+    
+    def test_verify_after_webhook_skips_gateway(self):
+        """Test a reference finalized elsewhere is answered from the order"""
+        order = Order.objects.create(
+            email='buyer@example.com', full_name='Buyer', shipping_address='',
+            phone='', total_amount=100, payment_reference='ref-done'
+        )
+        client = mock.Mock()
+        response = self.verify(self.make_cart(1), 'ref-done', client)
+        self.assertEqual(response.data['data']['order_number'], order.order_number)
+        client.verify_transaction.assert_not_called()
+    
+    def test_concurrent_verify_waits_for_in_flight_request(self):
+        """Test a duplicate during an in-flight verify does not call the gateway"""
+        client = mock.Mock()
+        with verification_lock('ref-busy') as acquired:
+            self.assertTrue(acquired)
+            with mock.patch('apps.orders.payments.VERIFY_WAIT_SECONDS', 0.2):
+                response = self.verify(self.make_cart(1), 'ref-busy', client)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        client.verify_transaction.assert_not_called()
+        self.assertFalse(Order.objects.exists())
+    
+    def test_create_paid_order_survives_duplicate_insert(self):
+        """Test a concurrent insert of the same reference returns that order"""
+        existing = Order.objects.create(
+            email='buyer@example.com', full_name='Buyer', shipping_address='',
+            phone='', total_amount=100, payment_reference='ref-race'
+        )
+        missing = mock.Mock()
+        missing.first.side_effect = [None, existing]
+        with mock.patch.object(Order.objects, 'filter', return_value=missing):
+            order = create_paid_order('ref-race', {'amount': 10000, 'metadata': {}})
+        self.assertEqual(order, existing)
+
+
+@mock.patch('apps.orders.paystack_views.PAYSTACK_SECRET_KEY', 'sk_test_webhook')
+class PaystackWebhookTest(APITestCase):
+    """Test webhook verification, storage and queued processing"""
+    
+    def setUp(self):
+        category = Category.objects.create(name='Test')
+        self.product = Product.objects.create(
+            name='Test Product', description='Test', price=50.00,
+            category=category, stock_quantity=10
+        )
+        self.cart = Cart.objects.create()
+        CartItem.objects.create(cart=self.cart, product=self.product, quantity=2)
+    
+    def payload(self, reference='ref-hook', event='charge.success'):
+        return {
+            'event': event,
+            'data': {
+                'reference': reference,
+                'status': 'success',
+                'amount': 10000,
+                'customer': {'email': 'buyer@example.com'},
+                'metadata': {'cart_id': self.cart.id, 'full_name': 'Buyer'},
+            },
+        }
+    
+    def deliver(self, payload, secret='sk_test_webhook'):
+        body = json.dumps(payload).encode()
+        signature = hmac.new(secret.encode(), body, hashlib.sha512).hexdigest()
+        return self.client.post(
+            '/api/paystack/webhook/', body, content_type='application/json',
+            HTTP_X_PAYSTACK_SIGNATURE=signature
+        )
+    
+    def test_rejects_invalid_signature(self):
+        """Test deliveries signed with another key are rejected"""
+        response = self.deliver(self.payload(), secret='wrong')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(PaymentEvent.objects.exists())
+    
+    def test_duplicate_delivery_is_noop(self):
+        """Test a redelivered event is stored and processed once"""
+        self.assertEqual(self.deliver(self.payload()).status_code, 200)
+        response = self.deliver(self.payload())
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['duplicate'])
+        self.assertEqual(PaymentEvent.objects.count(), 1)
+        
+        # The webhook itself does not create the order
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(process_pending_events(), {PaymentEvent.STATUS_PROCESSED: 1})
+        self.assertEqual(process_pending_events(), {})
+        
+        order = Order.objects.get(payment_reference='ref-hook')
+        self.assertEqual(order.items.count(), 1)
+        self.assertEqual(order.status, 'processing')
+    
+    def test_worker_command_drains_queue(self):
+        """Test the worker finalizes orders and skips unhandled events"""
+        self.deliver(self.payload('ref-a'))
+        self.deliver(self.payload('ref-a', event='transfer.success'))
+        call_command('process_payment_events', '--once', stdout=mock.Mock())
+        
+        self.assertEqual(Order.objects.filter(payment_reference='ref-a').count(), 1)
+        self.assertFalse(PaymentEvent.objects.exclude(status=PaymentEvent.STATUS_PROCESSED).exists())
+    
+    def test_already_verified_reference_is_not_duplicated(self):
+        """Test an event for an order created by verify_payment is a no-op"""
+        Order.objects.create(
+            email='buyer@example.com', full_name='Buyer', shipping_address='',
+            phone='', total_amount=100, payment_reference='ref-hook'
+        )
+        self.deliver(self.payload())
+        self.assertEqual(process_pending_events(), {PaymentEvent.STATUS_PROCESSED: 1})
+        self.assertEqual(Order.objects.filter(payment_reference='ref-hook').count(), 1)
+    
+    def test_failed_event_is_retried_then_marked_failed(self):
+        """Test handler errors back off and give up after MAX_ATTEMPTS"""
+        self.deliver(self.payload())
+        with mock.patch('apps.orders.payments.create_paid_order', side_effect=RuntimeError('boom')):
+            self.assertEqual(process_pending_events(), {PaymentEvent.STATUS_PENDING: 1})
+            event = PaymentEvent.objects.get()
+            self.assertIn('boom', event.last_error)
+            # Not due again until the backoff expires
+            self.assertEqual(process_pending_events(), {})
+            
+            for _ in range(MAX_ATTEMPTS - 1):
+                PaymentEvent.objects.update(available_at=event.received_at)
+                process_pending_events()
+        
+        event.refresh_from_db()
+        self.assertEqual(event.status, PaymentEvent.STATUS_FAILED)
+        self.assertEqual(event.attempts, MAX_ATTEMPTS)
+        self.assertFalse(Order.objects.exists())
+
+
+class StubPaystackHandler(BaseHTTPRequestHandler):
+    """Replays the server's queued (status, body) responses, keeping connections alive"""
+    protocol_version = 'HTTP/1.1'
+    
+    def handle_one_request(self):
+        self.server.connections.add(self.client_address)
+        super().handle_one_request()
+    
+    def respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.requests.append((self.command, self.path))
+        status_code, body = self.server.responses.pop(0) if self.server.responses else (200, {'status': True})
+        payload = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    do_GET = respond
+    do_POST = respond
+    
+    def log_message(self, *args):
+        pass
+
+
+class PaystackClientTest(SimpleTestCase):
+    """Test the pooled Paystack client against a local stub server"""
+    
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubPaystackHandler)
+        self.server.responses = []
+        self.server.requests = []
+        self.server.connections = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = PaystackClient(
+            'sk_test_stub', base_url=f'http://127.0.0.1:{self.server.server_port}',
+            max_retries=2, backoff_base=0.001, failure_threshold=3, reset_timeout=60
+        )
+    
+    def tearDown(self):
+        self.client.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_reuses_pooled_connection(self):
+        """Test consecutive calls share one keep-alive connection"""
+        for _ in range(5):
+            self.assertEqual(self.client.verify_transaction('ref').status_code, 200)
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertEqual(self.client.get_stats()['endpoints']['verify']['count'], 5)
+    
+    def test_verify_retries_transient_errors(self):
+        """Test verify retries 5xx responses and then succeeds"""
+        self.server.responses = [(502, {}), (503, {}), (200, {'status': True})]
+        response = self.client.verify_transaction('ref/1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests[-1], ('GET', '/transaction/verify/ref%2F1'))
+        stats = self.client.get_stats()['endpoints']['verify']
+        self.assertEqual((stats['count'], stats['errors']), (3, 2))
+        self.assertEqual(self.client.get_stats()['circuit'], 'closed')
+    
+    def test_initialize_is_not_retried(self):
+        """Test the non-idempotent initialize call is sent once"""
+        self.server.responses = [(502, {'message': 'Bad gateway'})]
+        response = self.client.initialize_transaction({'email': 'a@b.co', 'amount': 100})
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(len(self.server.requests), 1)
+    
+    def test_circuit_opens_and_fails_fast(self):
+        """Test repeated failures open the circuit without calling the gateway"""
+        self.server.responses = [(500, {})] * 3
+        self.assertEqual(self.client.verify_transaction('ref').status_code, 500)
+        self.assertEqual(self.client.get_stats()['circuit'], 'open')
+        
+        with self.assertRaises(CircuitOpenError):
+            self.client.verify_transaction('ref')
+        self.assertEqual(len(self.server.requests), 3)
+        
+        # After the cool-down one trial request closes it again
+        self.client.breaker.opened_at -= 60
+        self.assertEqual(self.client.verify_transaction('ref').status_code, 200)
+        self.assertEqual(self.client.get_stats()['circuit'], 'closed')
+    
+    def test_other_request_errors_end_half_open_trial(self):
+        """Test a non-connection error during the trial reopens the circuit instead of wedging it"""
+        self.client.breaker.opened_at = time.monotonic() - 60
+        self.assertEqual(self.client.get_stats()['circuit'], 'half-open')
+        with mock.patch.object(
+            self.client.session, 'request',
+            side_effect=requests.exceptions.ChunkedEncodingError('truncated body')
+        ) as request:
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                self.client.verify_transaction('ref')
+        # Not a transient transport error: raised without retrying
+        self.assertEqual(request.call_count, 1)
+        self.assertEqual(self.client.get_stats()['circuit'], 'open')
+        
+        # The next cool-down lets a new trial through
+        self.client.breaker.opened_at -= 60
+        self.assertEqual(self.client.verify_transaction('ref').status_code, 200)
+        self.assertEqual(self.client.get_stats()['circuit'], 'closed')
+    
+    def test_connection_errors_are_retried(self):
+        """Test an unreachable gateway raises after the bounded retries"""
+        self.server.shutdown()
+        self.server.server_close()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.verify_transaction('ref')
+        self.assertEqual(self.client.get_stats()['endpoints']['verify']['errors'], 3)
+
+
+class LoggingTest(SimpleTestCase):
+    """Test the JSON formatter and debug sampling"""
+    
+    def record(self, level, **extra):
+        record = logging.makeLogRecord({
+            'name': 'apps.orders.views', 'levelno': level,
+            'levelname': logging.getLevelName(level),
+            'msg': 'Order %s created', 'args': ('ORD-1',), **extra,
+        })
+        return record
+    
+    def test_json_formatter_includes_extra_fields(self):
+        """Test records render as one JSON object with their extras"""
+        entry = json.loads(JsonFormatter().format(self.record(logging.INFO, cart_id=7)))
+        self.assertEqual(entry['message'], 'Order ORD-1 created')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['logger'], 'apps.orders.views')
+        self.assertEqual(entry['cart_id'], 7)
+    
+    def test_sample_filter_only_drops_debug(self):
+        """Test a zero sample rate drops DEBUG but keeps higher levels"""
+        sampler = SampleFilter(rate=0.0)
+        self.assertFalse(sampler.filter(self.record(logging.DEBUG)))
+        self.assertTrue(sampler.filter(self.record(logging.INFO)))
+        self.assertTrue(sampler.filter(self.record(logging.DEBUG, sample_rate=1.0)))
+
+
+class PurgeCartsCommandTest(TestCase):
+    """Test the purge_carts command"""
+    
+    def setUp(self):
+        category = Category.objects.create(name='Test')
+        self.product = Product.objects.create(
+            name='Test Product', description='Test', price=50.00,
+            category=category, stock_quantity=10
+        )
+        old = timezone.now() - timedelta(days=45)
+        self.abandoned = [Cart.objects.create(session_key=f'old-{i}') for i in range(5)]
+        for cart in self.abandoned:
+            CartItem.objects.create(cart=cart, product=self.product, quantity=1)
+        self.active = Cart.objects.create(session_key='active')
+        CartItem.objects.create(cart=self.active, product=self.product, quantity=1)
+        self.user_cart = Cart.objects.create(user=User.objects.create_user(username='buyer'))
+        Cart.objects.exclude(pk=self.active.pk).update(updated_at=old)
+    
+    def purge(self, *args):
+        out = mock.Mock()
+        call_command('purge_carts', *args, stdout=out)
+        return ''.join(call.args[0] for call in out.write.call_args_list)
+    
+    def test_dry_run_deletes_nothing(self):
+        """Test --dry-run only reports"""
+        output = self.purge('--dry-run')
+        self.assertIn('would delete 5 guest carts and 5 cart items', output)
+        self.assertEqual(Cart.objects.count(), 7)
+    
+    def test_purges_abandoned_guest_carts_in_batches(self):
+        """Test old guest carts go; active and user carts stay"""
+        output = self.purge('--batch-size', '2')
+        self.assertIn('Deleted 5 guest carts and 5 cart items in 3 batches', output)
+        self.assertEqual(
+            set(Cart.objects.values_list('pk', flat=True)),
+            {self.active.pk, self.user_cart.pk}
+        )
+        self.assertEqual(CartItem.objects.count(), 1)
+    
+    def test_item_changes_keep_cart_alive(self):
+        """Test adding an item refreshes the cart's activity time"""
+        cart = self.abandoned[0]
+        self.client.post(
+            '/api/cart/items/', {'product_id': self.product.id},
+            HTTP_X_CART_ID=make_cart_token(cart.id)
+        )
+        self.purge()
+        self.assertTrue(Cart.objects.filter(pk=cart.pk).exists())
+
+
+class OrderExportTest(APITestCase):
+    """Test the streaming order export"""
+    
+    def setUp(self):
+        category = Category.objects.create(name='Test')
+        product = Product.objects.create(name='Rose', description='d', price=10, category=category)
+        self.orders = []
+        for index, (day, order_status) in enumerate([(1, 'delivered'), (15, 'pending'), (31, 'cancelled')]):
+            order = Order.objects.create(
+                email=f'buyer{index}@example.com', full_name=f'Buyer {index}', shipping_address='1 Main St',
+                phone='123', status=order_status, total_amount=Decimal('30.00')
+            )
+            Order.objects.filter(pk=order.pk).update(
+                created_at=timezone.make_aware(timezone.datetime(2026, 1, day, 12))
+            )
+            self.orders.append(order)
+        OrderItem.objects.create(order=self.orders[0], product=product, product_name='Rose',
+                                 product_price=Decimal('10.00'), quantity=2, size='50ml')
+        OrderItem.objects.create(order=self.orders[0], product=None, product_name='Oud',
+                                 product_price=Decimal('10.00'), quantity=1, size='10ml')
+        self.url = '/api/orders/export.csv'
+        self.client.force_authenticate(User.objects.create_user(username='finance', is_staff=True))
+    
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+    
+    def test_csv_has_a_row_per_item(self):
+        """Test each item is a row and an order without items still appears"""
+        rows = list(csv.DictReader(io.StringIO(self.export(self.url))))
+        self.assertEqual(
+            [(row['order_number'], row['item_product_name']) for row in rows],
+            [(self.orders[0].order_number, 'Rose'), (self.orders[0].order_number, 'Oud'),
+             (self.orders[1].order_number, ''), (self.orders[2].order_number, '')]
+        )
+        self.assertEqual(rows[0]['item_line_total'], '20.00')
+    
+    def test_jsonl_nests_items_and_filters(self):
+        """Test date and status filters and nested JSONL items"""
+        lines = self.export('/api/orders/export.jsonl', date_from='2026-01-01', date_to='2026-01-15',
+                            status='delivered,pending').splitlines()
+        orders = [json.loads(line) for line in lines]
+        self.assertEqual([order['order_number'] for order in orders],
+                         [self.orders[0].order_number, self.orders[1].order_number])
+        self.assertEqual(len(orders[0]['items']), 2)
+        self.assertEqual(orders[1]['items'], [])
+    
+    def test_queries_do_not_grow_with_orders(self):
+        """Test items are prefetched per chunk, not per order"""
+        with CaptureQueriesContext(connection) as captured:
+            self.export(self.url)
+        baseline = len(captured)
+        for index in range(5):
+            order = Order.objects.create(email='x@example.com', full_name='X', shipping_address='a',
+                                         phone='1', total_amount=1)
+            OrderItem.objects.create(order=order, product_name='Rose', product_price=1, quantity=1, size='50ml')
+        with CaptureQueriesContext(connection) as captured:
+            self.export(self.url)
+        self.assertEqual(len(captured), baseline)
+    
+    def test_staff_only_and_validation(self):
+        """Test permissions, bad filters and unknown formats"""
+        self.assertEqual(self.client.get(self.url, {'status': 'lost'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'date_from': 'jan'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get('/api/orders/export.xml').status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(User.objects.create_user(username='shopper'))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_command_writes_file(self):
+        """Test export_orders writes the filtered export"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'orders.jsonl')
+        out = io.StringIO()
+        call_command('export_orders', output=path, status=['cancelled'], stdout=out)
+        self.assertIn('Exported 1 orders', out.getvalue())
+        with open(path) as handle:
+            self.assertEqual(json.loads(handle.read())['order_number'], self.orders[2].order_number)
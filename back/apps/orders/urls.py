@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CartViewSet, OrderViewSet
-from .paystack_views import initialize_payment, verify_payment, paystack_webhook
+from .views import CartViewSet, OrderExportView, OrderViewSet
+from .paystack_views import initialize_payment, verify_payment, paystack_webhook, paystack_stats
 
 router = DefaultRouter()
 router.register(r'orders', OrderViewSet, basename='order')
@@ -38,6 +38,9 @@ urlpatterns = [
         'get': 'debug_cart'
     }), name='cart-debug'),
     
+    # Before the router, whose format-suffix detail route would match export.csv
+    path('orders/export.<slug:file_format>', OrderExportView.as_view(), name='order-export'),
+    
     # Router handles order endpoints only
     path('', include(router.urls)),
     
@@ -45,4 +48,5 @@ urlpatterns = [
     path('paystack/initialize/', initialize_payment, name='paystack-initialize'),
     path('paystack/verify/', verify_payment, name='paystack-verify'),
     path('paystack/webhook/', paystack_webhook, name='paystack-webhook'),
+    path('paystack/stats/', paystack_stats, name='paystack-stats'),
 ]
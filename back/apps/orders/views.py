@@ -1,9 +1,18 @@
+import logging
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
+from rest_framework.views import APIView
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from .models import Cart, CartItem, Order, PromoCode
+from .cart_resolution import make_cart_token, resolve_cart
+from config.catalog_io import FORMATS, streaming_file_response
+from config.pagination import CursorOptInPagination
+from .export import export_lines, filter_orders
 from apps.products.models import Product
 from .serializers import (
     CartSerializer,
@@ -13,6 +22,8 @@ from .serializers import (
     PromoCodeSerializer
 )
 
+logger = logging.getLogger(__name__)
+
 
 class CartViewSet(viewsets.ViewSet):
     """
@@ -21,49 +32,25 @@ class CartViewSet(viewsets.ViewSet):
     """
     permission_classes = [AllowAny]
     
-    def get_cart(self, request):
+    def get_cart(self, request, queryset=None):
         """Get or create cart for current user/session"""
-        if request.user.is_authenticated:
-            cart, created = Cart.objects.get_or_create(user=request.user)
-            print(f"Authenticated user cart: {cart.id}, created: {created}")
-        else:
-            # Try to get cart ID from header (client-side tracking)
-            cart_id = request.headers.get('X-Cart-ID')
-            
-            if cart_id:
-                try:
-                    cart = Cart.objects.get(id=int(cart_id), user__isnull=True)
-                    print(f"Found existing cart from header: {cart.id}, items: {cart.items.count()}")
-                    return cart
-                except (Cart.DoesNotExist, ValueError):
-                    print(f"Cart ID {cart_id} not found, creating new cart")
-            
-            # Fallback to session key
-            session_key = request.session.session_key
-            if not session_key:
-                request.session.create()
-                session_key = request.session.session_key
-                print(f"Created new session: {session_key}")
-            
-            # Ensure session is saved to database
-            request.session.save()
-            
-            cart, created = Cart.objects.get_or_create(session_key=session_key)
-            print(f"Guest cart: {cart.id}, session: {session_key}, created: {created}, items: {cart.items.count()}")
+        cart = resolve_cart(request, queryset)
+        self.cart_id = cart.id
+        logger.debug('Resolved cart %s (authenticated=%s)', cart.id, request.user.is_authenticated)
         return cart
     
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Hand the client a signed token for the cart it is using"""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'cart_id', None):
+            response['X-Cart-ID'] = make_cart_token(self.cart_id)
+        return response
+    
     def list(self, request):
         """Get current cart - this is required for router to register the viewset"""
-        cart = self.get_cart(request)
-        # Optimize: Use select_related and prefetch_related to reduce queries
-        cart = Cart.objects.select_related('promo_code').prefetch_related(
-            'items__product__category',
-            'items__product__images'
-        ).get(id=cart.id)
+        cart = self.get_cart(request, Cart.objects.with_items())
         serializer = CartSerializer(cart, context={'request': request})
-        response = Response(serializer.data)
-        response['X-Cart-ID'] = str(cart.id)
-        return response
+        return Response(serializer.data)
     
     def create(self, request):
         """Alias for add_item to support POST to /cart/ endpoint"""
@@ -82,8 +69,6 @@ class CartViewSet(viewsets.ViewSet):
         quantity = int(request.data.get('quantity', 1))
         size = request.data.get('size', '50ml')
         
-        print(f"Adding item - Cart ID: {cart.id}, Product ID: {product_id}, Dupe ID: {dupe_id}, AirAmbience ID: {air_ambience_id}, PerfumeOil ID: {perfume_oil_id}, Quantity: {quantity}")
-        
         # Determine which type of product we're adding
         item_obj = None
         content_type = None
@@ -139,23 +124,13 @@ class CartViewSet(viewsets.ViewSet):
             # Update quantity if item already exists
             cart_item.quantity += quantity
             cart_item.save()
+        cart.touch()
         
-        print(f"Cart item created: {created}, Cart items count: {cart.items.count()}")
-        
-        # Refresh cart from database to ensure we have latest data
-        cart.refresh_from_db()
-        
-        # Reload cart with optimized prefetching
-        cart = Cart.objects.select_related('promo_code').prefetch_related(
-            'items__product__category',
-            'items__product__images'
-        ).get(id=cart.id)
+        # Reload cart with all item targets bulk-loaded
+        cart = Cart.objects.with_items().get(id=cart.id)
         
         serializer = CartSerializer(cart, context={'request': request})
-        
-        response = Response(serializer.data, status=status.HTTP_201_CREATED)
-        response['X-Cart-ID'] = str(cart.id)
-        return response
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     def update_item(self, request, item_id=None):
         """Update cart item quantity"""
@@ -178,12 +153,10 @@ class CartViewSet(viewsets.ViewSet):
                 )
             cart_item.quantity = quantity
             cart_item.save()
+        cart.touch()
         
-        # Reload cart with optimized prefetching
-        cart = Cart.objects.select_related('promo_code').prefetch_related(
-            'items__product__category',
-            'items__product__images'
-        ).get(id=cart.id)
+        # Reload cart with all item targets bulk-loaded
+        cart = Cart.objects.with_items().get(id=cart.id)
         serializer = CartSerializer(cart, context={'request': request})
         return Response(serializer.data)
     
@@ -192,12 +165,10 @@ class CartViewSet(viewsets.ViewSet):
         cart = self.get_cart(request)
         cart_item = get_object_or_404(CartItem, id=item_id, cart=cart)
         cart_item.delete()
+        cart.touch()
         
-        # Reload cart with optimized prefetching
-        cart = Cart.objects.select_related('promo_code').prefetch_related(
-            'items__product__category',
-            'items__product__images'
-        ).get(id=cart.id)
+        # Reload cart with all item targets bulk-loaded
+        cart = Cart.objects.with_items().get(id=cart.id)
         serializer = CartSerializer(cart, context={'request': request})
         return Response(serializer.data)
     
@@ -209,11 +180,8 @@ class CartViewSet(viewsets.ViewSet):
         cart.promo_code = None
         cart.save()
         
-        # Reload cart with optimized prefetching
-        cart = Cart.objects.select_related('promo_code').prefetch_related(
-            'items__product__category',
-            'items__product__images'
-        ).get(id=cart.id)
+        # Reload cart with all item targets bulk-loaded
+        cart = Cart.objects.with_items().get(id=cart.id)
         serializer = CartSerializer(cart, context={'request': request})
         return Response(serializer.data)
     
@@ -254,12 +222,10 @@ class CartViewSet(viewsets.ViewSet):
         cart_subtotal = Decimal(str(cart.get_subtotal()))
         minimum_required = Decimal(str(promo.minimum_order_amount))
         
-        print(f"Cart subtotal: {cart_subtotal} (type: {type(cart_subtotal)})")
-        print(f"Minimum required: {minimum_required} (type: {type(minimum_required)})")
-        print(f"Comparison result: {cart_subtotal} < {minimum_required} = {cart_subtotal < minimum_required}")
-        print(f"Cart items: {cart.items.count()}")
-        for item in cart.items.all():
-            print(f"  - {item.product_name}: {item.product_price} x {item.quantity} = {item.get_subtotal()}")
+        logger.debug(
+            'Promo %s on cart %s: subtotal %s, minimum %s',
+            promo.code, cart.id, cart_subtotal, minimum_required
+        )
         
         if cart_subtotal < minimum_required:
             return Response(
@@ -271,11 +237,8 @@ class CartViewSet(viewsets.ViewSet):
         cart.promo_code = promo
         cart.save()
         
-        # Reload cart with optimized prefetching
-        cart = Cart.objects.select_related('promo_code').prefetch_related(
-            'items__product__category',
-            'items__product__images'
-        ).get(id=cart.id)
+        # Reload cart with all item targets bulk-loaded
+        cart = Cart.objects.with_items().get(id=cart.id)
         serializer = CartSerializer(cart, context={'request': request})
         return Response({
             'message': f'Promo code "{promo_code}" applied successfully!',
@@ -289,11 +252,8 @@ class CartViewSet(viewsets.ViewSet):
         cart.promo_code = None
         cart.save()
         
-        # Reload cart with optimized prefetching
-        cart = Cart.objects.select_related('promo_code').prefetch_related(
-            'items__product__category',
-            'items__product__images'
-        ).get(id=cart.id)
+        # Reload cart with all item targets bulk-loaded
+        cart = Cart.objects.with_items().get(id=cart.id)
         serializer = CartSerializer(cart, context={'request': request})
         return Response({
             'message': 'Promo code removed',
@@ -337,11 +297,12 @@ class OrderViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing orders.
     - Create: Convert cart to order
-    - List: Get user's orders (authenticated only)
+    - List: Get user's orders (authenticated only), ?cursor= for keyset pagination
     - Retrieve: Get order details by order number
     """
     serializer_class = OrderSerializer
     lookup_field = 'order_number'
+    pagination_class = CursorOptInPagination
     
     def get_queryset(self):
         """Return orders for current user"""
@@ -351,30 +312,14 @@ class OrderViewSet(viewsets.ModelViewSet):
     
     def create(self, request):
         """Create order from cart"""
-        # Debug logging
-        print(f"Order creation request from user: {request.user}")
-        print(f"Session key: {request.session.session_key}")
-        print(f"Request data: {request.data}")
-        
-        # Get cart
-        if request.user.is_authenticated:
-            cart = Cart.objects.filter(user=request.user).first()
-            print(f"Looking for authenticated user cart: {cart}")
-        else:
-            session_key = request.session.session_key
-            if not session_key:
-                # Create session if it doesn't exist
-                request.session.create()
-                session_key = request.session.session_key
-                print(f"Created new session: {session_key}")
-            
-            cart = Cart.objects.filter(session_key=session_key).first()
-            print(f"Looking for guest cart with session {session_key}: {cart}")
+        # Get cart (signed X-Cart-ID, session or user), never creating one
+        cart = resolve_cart(request, create=False)
         
         if not cart:
-            # Try to find any cart for debugging
-            all_carts = Cart.objects.all()
-            print(f"No cart found. All carts in database: {list(all_carts)}")
+            logger.info(
+                'Checkout without a cart (user=%s, session=%s)',
+                request.user.pk, request.session.session_key
+            )
             return Response(
                 {'error': 'No cart found', 'debug': f'Session: {request.session.session_key}, User: {request.user}'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -382,14 +327,12 @@ class OrderViewSet(viewsets.ModelViewSet):
         
         # Check if cart has items
         if not cart.items.exists():
-            print(f"Cart {cart.id} exists but has no items")
+            logger.info('Checkout with empty cart %s', cart.id)
             return Response(
                 {'error': 'Cart is empty'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        print(f"Found cart {cart.id} with {cart.items.count()} items")
-        
         # Create order
         serializer = OrderCreateSerializer(
             data=request.data,
@@ -398,11 +341,11 @@ class OrderViewSet(viewsets.ModelViewSet):
         
         if serializer.is_valid():
             order = serializer.save()
-            print(f"Order created successfully: {order.order_number}")
+            logger.info('Order %s created from cart %s', order.order_number, cart.id)
             order_serializer = OrderSerializer(order)
             return Response(order_serializer.data, status=status.HTTP_201_CREATED)
         
-        print(f"Order creation validation errors: {serializer.errors}")
+        logger.info('Order creation rejected for cart %s: %s', cart.id, serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     def retrieve(self, request, order_number=None):
@@ -427,3 +370,27 @@ class OrderViewSet(viewsets.ModelViewSet):
         if self.action in ['create', 'retrieve']:
             return [AllowAny()]
         return [IsAuthenticated()]
+
+
+class OrderExportView(APIView):
+    """
+    Staff-only streaming export of orders and their items for accounting.
+    Query params: date_from, date_to (YYYY-MM-DD or ISO datetime, inclusive)
+    and status (comma-separated).
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request, file_format):
+        if file_format not in FORMATS:
+            raise NotFound()
+        statuses = [part.strip() for part in request.query_params.get('status', '').split(',') if part.strip()]
+        try:
+            orders = filter_orders(
+                date_from=request.query_params.get('date_from'),
+                date_to=request.query_params.get('date_to'),
+                statuses=statuses,
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError({'detail': exc.messages})
+        filename = f'orders-{timezone.localdate():%Y%m%d}.{file_format}'
+        return streaming_file_response(export_lines(orders, file_format), file_format, filename)
@@ -56,6 +56,20 @@ class ProductAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('name',)}
     inlines = [ProductImageInline]
     list_editable = ['price', 'stock_quantity', 'is_featured', 'is_new', 'is_best_seller']
+    # Maintained by the reviews app; shown for reference only
+    readonly_fields = ['average_rating', 'rating_count']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('category').prefetch_related('images')
+    
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Never write back the rating aggregates loaded with the form over concurrent F() updates
+        obj.save(update_fields=[
+            field.name for field in obj._meta.concrete_fields
+            if not field.primary_key and field.name not in Product.RATING_FIELDS
+        ])
     
     def primary_image_preview(self, obj):
         if obj.primary_image:
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.products'
+
+    def ready(self):
+        from config.images import track_image_derivatives
+        from config.response_cache import track_model_versions
+        from .models import Category, ProductImage
+        track_model_versions(Category)
+        track_image_derivatives(Category, ProductImage)
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from apps.products.models import Product
+from apps.reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored rating aggregates on every product from its reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of products to update per query (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # One grouped aggregate instead of a query per product
+        totals = {
+            row['product_id']: (row['total'], row['count'])
+            for row in Review.objects.values('product_id').annotate(
+                total=Sum('rating'), count=Count('id')
+            )
+        }
+
+        products = []
+        for product in Product.objects.only('id', 'rating_sum', 'rating_count', 'average_rating'):
+            rating_sum, rating_count = totals.get(product.id, (0, 0))
+            product.rating_sum = rating_sum
+            product.rating_count = rating_count
+            product.average_rating = round(rating_sum / rating_count, 1) if rating_count else 0
+            products.append(product)
+
+        with transaction.atomic():
+            Product.objects.bulk_update(
+                products,
+                ['rating_sum', 'rating_count', 'average_rating'],
+                batch_size=batch_size
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Updated rating aggregates for {len(products)} products '
+                f'({len(totals)} with reviews)'
+            )
+        )
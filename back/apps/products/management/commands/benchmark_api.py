@@ -0,0 +1,76 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from config.benchmark import (
+    DEFAULT_BUDGETS_PATH, check_budgets, isolated_database, load_budgets,
+    parse_scale, run_benchmarks, seed_catalog
+)
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic catalog in a test database and benchmark every API GET endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            default='1k',
+            help='Products, reviews and carts to seed: 1k, 10k, 100k or a number (default: 1k)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Requests per endpoint (default: 5)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk insert while seeding (default: 1000)'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON report to this file'
+        )
+        parser.add_argument(
+            '--budgets',
+            default=str(DEFAULT_BUDGETS_PATH),
+            help='Budget file to check the report against'
+        )
+        parser.add_argument(
+            '--no-budgets',
+            action='store_true',
+            help='Only report; do not fail on budget violations'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            count = parse_scale(options['scale'])
+        except ValueError:
+            raise CommandError(f'Invalid --scale: {options["scale"]}')
+
+        with isolated_database():
+            started = time.monotonic()
+            context = seed_catalog(count, batch_size=options['batch_size'])
+            self.stdout.write(f'Seeded {count} products, reviews and carts in {time.monotonic() - started:.1f}s')
+            report = run_benchmarks(context, iterations=options['iterations'], scale=count)
+
+        for name, result in report['endpoints'].items():
+            self.stdout.write(
+                f'{name:<50} {result["status"]:>3} {result["queries"]:>4} queries '
+                f'p50 {result["p50_ms"]:>8.2f}ms p95 {result["p95_ms"]:>8.2f}ms {result["bytes"]:>8} bytes'
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f'Report written to {options["output"]}')
+
+        if options['no_budgets']:
+            return
+        violations = check_budgets(report, load_budgets(options['budgets']))
+        if violations:
+            for violation in violations:
+                self.stdout.write(self.style.ERROR(violation))
+            raise CommandError(f'{len(violations)} budget violation(s)')
+        self.stdout.write(self.style.SUCCESS(f'{len(report["endpoints"])} endpoints within budget'))
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+from apps.content.views import AirAmbienceViewSet, DupeProductViewSet, PerfumeOilViewSet
+from apps.orders.views import OrderViewSet
+from apps.products.views import ProductViewSet
+
+# (label, viewset, query params) for every list query shape the API serves
+ENDPOINTS = [
+    ('products', ProductViewSet, {}),
+    ('products?category', ProductViewSet, {'category': 'oriental'}),
+    ('products?price range', ProductViewSet, {'min_price': '10', 'max_price': '100', 'sort_by': 'price'}),
+    ('products?featured', ProductViewSet, {'featured': 'true'}),
+    ('products?sort_by=name', ProductViewSet, {'sort_by': 'name'}),
+    ('dupes', DupeProductViewSet, {}),
+    ('dupes?brand', DupeProductViewSet, {'brand': 'Chanel'}),
+    ('dupes?featured', DupeProductViewSet, {'featured': 'true'}),
+    ('air-ambience', AirAmbienceViewSet, {}),
+    ('air-ambience?type', AirAmbienceViewSet, {'type': 'candle'}),
+    ('perfume-oils', PerfumeOilViewSet, {}),
+    ('perfume-oils?concentration', PerfumeOilViewSet, {'concentration': 'pure'}),
+    ('perfume-oils?custom_blend', PerfumeOilViewSet, {'custom_blend': 'true'}),
+    ('orders (user)', OrderViewSet, {}),
+]
+
+
+def list_queryset(viewset_class, params, user):
+    """The paginated queryset a viewset's list action would run for `params`"""
+    request = Request(RequestFactory().get('/', params))
+    request.user = user
+    view = viewset_class(request=request, format_kwarg=None, action='list', kwargs={}, args=())
+    queryset = view.filter_queryset(view.get_queryset())
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+    return queryset[:page_size]
+
+
+def full_scans(plan, vendor):
+    """Plan lines that read a whole table (or sort it) instead of using an index"""
+    flagged = []
+    for line in plan.splitlines():
+        text = line.strip()
+        if vendor == 'postgresql' and 'Seq Scan' in text:
+            flagged.append(text)
+        elif vendor == 'sqlite':
+            detail = text.split('|')[-1].strip() if '|' in text else text.lstrip('-` ')
+            if (detail.startswith('SCAN') and 'USING' not in detail) or 'TEMP B-TREE' in detail:
+                flagged.append(detail)
+    return flagged
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the list query of each catalog endpoint and flag sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fail-on-scan',
+            action='store_true',
+            help='Exit with an error if any endpoint plan contains a sequential scan'
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        # Unsaved user: only the query shape of "my orders" matters
+        user = User(pk=0, username='explain')
+        flagged_endpoints = []
+
+        for label, viewset_class, params in ENDPOINTS:
+            queryset = list_queryset(viewset_class, params, user)
+            plan = queryset.explain()
+            scans = full_scans(plan, vendor)
+
+            if scans:
+                flagged_endpoints.append(label)
+                self.stdout.write(self.style.WARNING(f'{label}: {len(scans)} full scan(s)'))
+                for scan in scans:
+                    self.stdout.write(f'    {scan}')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{label}: indexed'))
+            if options['verbosity'] > 1:
+                self.stdout.write(str(queryset.query))
+                self.stdout.write(plan)
+
+        summary = f'{len(ENDPOINTS) - len(flagged_endpoints)}/{len(ENDPOINTS)} endpoints use indexes only'
+        if flagged_endpoints and options['fail_on_scan']:
+            raise CommandError(f'{summary}; full scans in: {", ".join(flagged_endpoints)}')
+        self.stdout.write(self.style.SUCCESS(summary) if not flagged_endpoints else summary)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from config.catalog_io import DEFAULT_BATCH_SIZE, FORMATS, KINDS, detect_format, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Stream one catalog kind to CSV or JSONL in the import_catalog columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(KINDS), help='What to export')
+        parser.add_argument(
+            '--output',
+            help='File to write (default: stdout)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format (default: from the --output extension, else csv)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows fetched per database round trip (default: {DEFAULT_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or detect_format(options['output'])
+        lines = export_lines(options['kind'], file_format, chunk_size=options['batch_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        count = -1 if file_format == 'csv' else 0
+        with open(options['output'], 'w', newline='', encoding='utf-8') as handle:
+            for line in lines:
+                handle.write(line)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} {options['kind']} rows to {options['output']}"))
@@ -0,0 +1,92 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from config.images import (
+    TRACKED_MODELS, derivative_formats, derivative_widths, derive, image_fields,
+    init_worker, needs_processing, store_variants
+)
+
+
+class Command(BaseCommand):
+    help = 'Generate missing or stale responsive image derivatives for every uploaded image'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            choices=[model._meta.label for model in TRACKED_MODELS],
+            help='Only process this model (repeatable; default: all)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate derivatives that are already up to date (and retry failures)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes resizing images; 1 runs in this process (default: CPU count)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Images handed to the pool and saved per batch (default: 100)'
+        )
+
+    def handle(self, *args, **options):
+        models = [
+            model for model in TRACKED_MODELS
+            if not options['model'] or model._meta.label in options['model']
+        ]
+        self.stdout.write(
+            f"Widths {', '.join(map(str, derivative_widths()))}; "
+            f"formats {', '.join(derivative_formats()) or 'none'}"
+        )
+
+        executor = None
+        if options['workers'] > 1:
+            # Workers only touch storage; do not hand them this process's connections
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=options['workers'], initializer=init_worker)
+        mapper = executor.map if executor else map
+
+        started = time.monotonic()
+        processed = failed = 0
+        try:
+            for model in models:
+                for file_field, variants_field in image_fields(model):
+                    done, errors = self.process_field(model, file_field, variants_field, mapper, options)
+                    processed += done
+                    failed += errors
+                    if done:
+                        self.stdout.write(f'{model._meta.label}.{file_field}: {done} images ({errors} failed)')
+        finally:
+            if executor:
+                executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} images ({failed} failed) in {time.monotonic() - started:.1f}s'
+        ))
+
+    def process_field(self, model, file_field, variants_field, mapper, options):
+        rows = model._default_manager.order_by('pk').values_list('pk', file_field, variants_field)
+        pending = (
+            (pk, name or '', variants or {})
+            for pk, name, variants in rows.iterator(chunk_size=options['batch_size'])
+            if (options['force'] and name) or needs_processing(name or '', variants or {})
+        )
+
+        done = errors = 0
+        while True:
+            batch = [job for _, job in zip(range(options['batch_size']), pending)]
+            if not batch:
+                return done, errors
+            records = mapper(derive, [name for _, name, _ in batch], [variants for _, _, variants in batch])
+            records = {pk: record for (pk, _, _), record in zip(batch, records)}
+            store_variants(model, variants_field, records)
+            done += len(records)
+            errors += sum(1 for record in records.values() if 'error' in record)
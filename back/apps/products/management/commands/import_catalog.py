@@ -0,0 +1,62 @@
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from config.catalog_io import (
+    DEFAULT_BATCH_SIZE, FORMATS, KINDS, CatalogImportError, detect_format, import_catalog
+)
+
+
+class Command(BaseCommand):
+    help = 'Bulk upsert catalog rows (products, product images, dupes, air ambience, perfume oils) from CSV or JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(KINDS), help='What the file contains')
+        parser.add_argument('path', help="CSV or JSONL file, or '-' for stdin")
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format (default: from the file extension, else csv)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per bulk upsert (default: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate and report without keeping any changes'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or detect_format(path)
+        started = time.monotonic()
+        try:
+            if path == '-':
+                report = self._import(options, sys.stdin, file_format)
+            else:
+                with open(path, newline='', encoding='utf-8-sig') as handle:
+                    report = self._import(options, handle, file_format)
+        except (CatalogImportError, OSError) as exc:
+            raise CommandError(str(exc))
+
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']}: {'; '.join(error['errors'])}"))
+        if report['error_count'] > len(report['errors']):
+            self.stdout.write(self.style.WARNING(f"... {report['error_count'] - len(report['errors'])} more errors"))
+
+        summary = (
+            f"{report['rows']} {options['kind']} rows in {time.monotonic() - started:.1f}s: "
+            f"{report['created']} created, {report['updated']} updated, {report['error_count']} skipped"
+        )
+        if options['dry_run']:
+            summary += ' (dry run, nothing saved)'
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def _import(self, options, lines, file_format):
+        return import_catalog(
+            options['kind'], lines, file_format,
+            batch_size=options['batch_size'], dry_run=options['dry_run']
+        )
@@ -7,6 +7,297 @@ from django.utils import timezone
 from datetime import timedelta
 import random
 
+# Sample data shapes, also used by the benchmark seeder (config.benchmark)
+CATEGORIES = [
+    {
+        'name': 'Men\'s Fragrances',
+        'description': 'Premium fragrances designed for men'
+    },
+    {
+        'name': 'Women\'s Fragrances', 
+        'description': 'Elegant fragrances for women'
+    },
+    {
+        'name': 'Unisex Fragrances',
+        'description': 'Versatile fragrances for everyone'
+    },
+    {
+        'name': 'Perfume Oils',
+        'description': 'Concentrated fragrance oils with long-lasting wear'
+    },
+    {
+        'name': 'Air Fresheners',
+        'description': 'Home and car air fresheners, room sprays, and diffusers'
+    }
+]
+
+PRODUCTS = [
+    # Men's Fragrances
+    {
+        'name': 'Midnight Oud',
+        'description': 'A sophisticated blend of oud, amber, and sandalwood. Perfect for evening wear.',
+        'price': 150.00,
+        'category': 'Men\'s Fragrances',
+        'product_type': 'perfume',
+        'scent_family': 'woody',
+        'scent_notes': 'Top: Bergamot, Cardamom | Middle: Oud, Rose | Base: Amber, Sandalwood',
+        'size_options': '50ml, 100ml',
+        'stock_quantity': 25,
+        'is_featured': True,
+        'is_best_seller': True,
+        'images': [
+            'https://images.unsplash.com/photo-1541643600914-78b084683601?w=400',
+            'https://images.unsplash.com/photo-1592945403244-b3fbafd7f539?w=400'
+        ]
+    },
+    {
+        'name': 'Ocean Breeze',
+        'description': 'Fresh aquatic fragrance with citrus top notes and marine accords.',
+        'price': 120.00,
+        'category': 'Men\'s Fragrances',
+        'product_type': 'perfume',
+        'scent_family': 'fresh',
+        'scent_notes': 'Top: Lemon, Sea Salt | Middle: Marine Accord, Jasmine | Base: Driftwood, Musk',
+        'size_options': '50ml, 100ml',
+        'stock_quantity': 30,
+        'is_new': True,
+        'images': [
+            'https://images.unsplash.com/photo-1594736797933-d0401ba2fe65?w=400'
+        ]
+    },
+
+    # Women's Fragrances
+    {
+        'name': 'Rose Garden',
+        'description': 'Romantic floral bouquet with Bulgarian rose and peony.',
+        'price': 140.00,
+        'category': 'Women\'s Fragrances',
+        'product_type': 'perfume',
+        'scent_family': 'floral',
+        'scent_notes': 'Top: Pink Pepper, Bergamot | Middle: Bulgarian Rose, Peony | Base: White Musk, Cedar',
+        'size_options': '30ml, 50ml, 100ml',
+        'stock_quantity': 20,
+        'is_featured': True,
+        'images': [
+            'https://images.unsplash.com/photo-1588405748880-12d1d2a59d75?w=400'
+        ]
+    },
+    {
+        'name': 'Vanilla Dreams',
+        'description': 'Sweet and warm vanilla with hints of caramel and amber.',
+        'price': 110.00,
+        'category': 'Women\'s Fragrances',
+        'product_type': 'perfume',
+        'scent_family': 'oriental',
+        'scent_notes': 'Top: Mandarin, Pink Pepper | Middle: Vanilla, Caramel | Base: Amber, Tonka Bean',
+        'size_options': '50ml, 100ml',
+        'stock_quantity': 35,
+        'is_best_seller': True,
+        'images': [
+            'https://images.unsplash.com/photo-1563170351-be82bc888aa4?w=400'
+        ]
+    },
+
+    # Unisex Fragrances
+    {
+        'name': 'Citrus Burst',
+        'description': 'Energizing citrus blend perfect for any occasion.',
+        'price': 95.00,
+        'category': 'Unisex Fragrances',
+        'product_type': 'perfume',
+        'scent_family': 'citrus',
+        'scent_notes': 'Top: Grapefruit, Lemon, Orange | Middle: Mint, Green Tea | Base: White Musk',
+        'size_options': '50ml, 100ml',
+        'stock_quantity': 40,
+        'is_new': True,
+        'images': [
+            'https://images.unsplash.com/photo-1615634260167-c8cdede054de?w=400'
+        ]
+    },
+
+    # Perfume Oils
+    {
+        'name': 'Amber Essence Oil',
+        'description': 'Concentrated amber oil with long-lasting projection.',
+        'price': 75.00,
+        'category': 'Perfume Oils',
+        'product_type': 'perfume_oil',
+        'scent_family': 'oriental',
+        'scent_notes': 'Pure amber with hints of vanilla and musk',
+        'size_options': '10ml, 20ml',
+        'stock_quantity': 50,
+        'is_limited_edition': True,
+        'images': [
+            'https://images.unsplash.com/photo-1571875257727-256c39da42af?w=400'
+        ]
+    },
+    {
+        'name': 'Oud Royal Oil',
+        'description': 'Premium oud oil from sustainable sources. Intense and long-lasting.',
+        'price': 120.00,
+        'category': 'Perfume Oils',
+        'product_type': 'perfume_oil',
+        'scent_family': 'woody',
+        'scent_notes': 'Pure oud with rose and saffron accents',
+        'size_options': '5ml, 10ml, 20ml',
+        'stock_quantity': 15,
+        'is_featured': True,
+        'is_limited_edition': True,
+        'images': [
+            'https://images.unsplash.com/photo-1594736797933-d0401ba2fe65?w=400'
+        ]
+    },
+    {
+        'name': 'Jasmine Night Oil',
+        'description': 'Exotic jasmine oil perfect for evening wear.',
+        'price': 65.00,
+        'category': 'Perfume Oils',
+        'product_type': 'perfume_oil',
+        'scent_family': 'floral',
+        'scent_notes': 'Jasmine, white tea, soft musk',
+        'size_options': '10ml, 20ml',
+        'stock_quantity': 30,
+        'is_new': True,
+        'images': [
+            'https://images.unsplash.com/photo-1588405748880-12d1d2a59d75?w=400'
+        ]
+    },
+    {
+        'name': 'Sandalwood Serenity Oil',
+        'description': 'Calming sandalwood oil with meditative properties.',
+        'price': 80.00,
+        'category': 'Perfume Oils',
+        'product_type': 'perfume_oil',
+        'scent_family': 'woody',
+        'scent_notes': 'Australian sandalwood, cedar, white musk',
+        'size_options': '10ml, 20ml',
+        'stock_quantity': 25,
+        'images': [
+            'https://images.unsplash.com/photo-1563170351-be82bc888aa4?w=400'
+        ]
+    },
+    {
+        'name': 'Musk Al Tahara Oil',
+        'description': 'Traditional white musk oil, clean and pure.',
+        'price': 45.00,
+        'category': 'Perfume Oils',
+        'product_type': 'perfume_oil',
+        'scent_family': 'fresh',
+        'scent_notes': 'White musk, clean cotton, soft powder',
+        'size_options': '10ml, 20ml, 30ml',
+        'stock_quantity': 60,
+        'is_best_seller': True,
+        'images': [
+            'https://images.unsplash.com/photo-1615634260167-c8cdede054de?w=400'
+        ]
+    },
+
+    # Air Fresheners
+    {
+        'name': 'Lavender Fields Car Freshener',
+        'description': 'Calming lavender scent for your car interior.',
+        'price': 25.00,
+        'category': 'Air Fresheners',
+        'product_type': 'air_ambience',
+        'scent_family': 'floral',
+        'scent_notes': 'Pure lavender with eucalyptus undertones',
+        'size_options': 'Standard',
+        'stock_quantity': 100,
+        'images': [
+            'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=400'
+        ]
+    },
+    {
+        'name': 'Ocean Mist Room Spray',
+        'description': 'Fresh ocean breeze for any room in your home.',
+        'price': 35.00,
+        'category': 'Air Fresheners',
+        'product_type': 'air_ambience',
+        'scent_family': 'fresh',
+        'scent_notes': 'Sea salt, marine accord, clean cotton',
+        'size_options': '250ml, 500ml',
+        'stock_quantity': 75,
+        'is_new': True,
+        'images': [
+            'https://images.unsplash.com/photo-1594736797933-d0401ba2fe65?w=400'
+        ]
+    },
+    {
+        'name': 'Vanilla Spice Home Diffuser',
+        'description': 'Warm vanilla and spice blend for cozy atmospheres.',
+        'price': 45.00,
+        'category': 'Air Fresheners',
+        'product_type': 'air_ambience',
+        'scent_family': 'oriental',
+        'scent_notes': 'Vanilla, cinnamon, warm amber',
+        'size_options': '200ml with reeds',
+        'stock_quantity': 40,
+        'is_featured': True,
+        'images': [
+            'https://images.unsplash.com/photo-1571875257727-256c39da42af?w=400'
+        ]
+    },
+    {
+        'name': 'Citrus Burst Car Gel',
+        'description': 'Long-lasting citrus gel freshener for vehicles.',
+        'price': 20.00,
+        'category': 'Air Fresheners',
+        'product_type': 'air_ambience',
+        'scent_family': 'citrus',
+        'scent_notes': 'Lemon, orange, grapefruit zest',
+        'size_options': 'Standard gel',
+        'stock_quantity': 120,
+        'is_best_seller': True,
+        'images': [
+            'https://images.unsplash.com/photo-1615634260167-c8cdede054de?w=400'
+        ]
+    },
+    {
+        'name': 'Rose Garden Reed Diffuser',
+        'description': 'Elegant rose scent with continuous fragrance release.',
+        'price': 55.00,
+        'category': 'Air Fresheners',
+        'product_type': 'air_ambience',
+        'scent_family': 'floral',
+        'scent_notes': 'Bulgarian rose, peony, green leaves',
+        'size_options': '300ml with premium reeds',
+        'stock_quantity': 30,
+        'images': [
+            'https://images.unsplash.com/photo-1588405748880-12d1d2a59d75?w=400'
+        ]
+    },
+    {
+        'name': 'Oud Wood Room Mist',
+        'description': 'Luxurious oud scent for special occasions.',
+        'price': 65.00,
+        'category': 'Air Fresheners',
+        'product_type': 'air_ambience',
+        'scent_family': 'woody',
+        'scent_notes': 'Oud wood, sandalwood, amber',
+        'size_options': '250ml spray',
+        'stock_quantity': 25,
+        'is_limited_edition': True,
+        'images': [
+            'https://images.unsplash.com/photo-1541643600914-78b084683601?w=400'
+        ]
+    },
+    {
+        'name': 'Fresh Linen Fabric Spray',
+        'description': 'Clean linen scent for fabrics and upholstery.',
+        'price': 30.00,
+        'category': 'Air Fresheners',
+        'product_type': 'air_ambience',
+        'scent_family': 'fresh',
+        'scent_notes': 'Clean cotton, white musk, soft powder',
+        'size_options': '300ml spray',
+        'stock_quantity': 80,
+        'images': [
+            'https://images.unsplash.com/photo-1563170351-be82bc888aa4?w=400'
+        ]
+    }
+]
+
+
 class Command(BaseCommand):
     help = 'Populate database with sample data for fragrances store'
 
@@ -31,30 +322,7 @@ class Command(BaseCommand):
 
     def create_categories(self):
         """Create product categories"""
-        categories_data = [
-            {
-                'name': 'Men\'s Fragrances',
-                'description': 'Premium fragrances designed for men'
-            },
-            {
-                'name': 'Women\'s Fragrances', 
-                'description': 'Elegant fragrances for women'
-            },
-            {
-                'name': 'Unisex Fragrances',
-                'description': 'Versatile fragrances for everyone'
-            },
-            {
-                'name': 'Perfume Oils',
-                'description': 'Concentrated fragrance oils with long-lasting wear'
-            },
-            {
-                'name': 'Air Fresheners',
-                'description': 'Home and car air fresheners, room sprays, and diffusers'
-            }
-        ]
-        
-        for cat_data in categories_data:
+        for cat_data in CATEGORIES:
             category, created = Category.objects.get_or_create(
                 name=cat_data['name'],
                 defaults={'description': cat_data['description']}
@@ -66,273 +334,8 @@ class Command(BaseCommand):
         """Create sample products"""
         categories = Category.objects.all()
         
-        products_data = [
-            # Men's Fragrances
-            {
-                'name': 'Midnight Oud',
-                'description': 'A sophisticated blend of oud, amber, and sandalwood. Perfect for evening wear.',
-                'price': 150.00,
-                'category': 'Men\'s Fragrances',
-                'product_type': 'perfume',
-                'scent_family': 'woody',
-                'scent_notes': 'Top: Bergamot, Cardamom | Middle: Oud, Rose | Base: Amber, Sandalwood',
-                'size_options': '50ml, 100ml',
-                'stock_quantity': 25,
-                'is_featured': True,
-                'is_best_seller': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1541643600914-78b084683601?w=400',
-                    'https://images.unsplash.com/photo-1592945403244-b3fbafd7f539?w=400'
-                ]
-            },
-            {
-                'name': 'Ocean Breeze',
-                'description': 'Fresh aquatic fragrance with citrus top notes and marine accords.',
-                'price': 120.00,
-                'category': 'Men\'s Fragrances',
-                'product_type': 'perfume',
-                'scent_family': 'fresh',
-                'scent_notes': 'Top: Lemon, Sea Salt | Middle: Marine Accord, Jasmine | Base: Driftwood, Musk',
-                'size_options': '50ml, 100ml',
-                'stock_quantity': 30,
-                'is_new': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1594736797933-d0401ba2fe65?w=400'
-                ]
-            },
-            
-            # Women's Fragrances
-            {
-                'name': 'Rose Garden',
-                'description': 'Romantic floral bouquet with Bulgarian rose and peony.',
-                'price': 140.00,
-                'category': 'Women\'s Fragrances',
-                'product_type': 'perfume',
-                'scent_family': 'floral',
-                'scent_notes': 'Top: Pink Pepper, Bergamot | Middle: Bulgarian Rose, Peony | Base: White Musk, Cedar',
-                'size_options': '30ml, 50ml, 100ml',
-                'stock_quantity': 20,
-                'is_featured': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1588405748880-12d1d2a59d75?w=400'
-                ]
-            },
-            {
-                'name': 'Vanilla Dreams',
-                'description': 'Sweet and warm vanilla with hints of caramel and amber.',
-                'price': 110.00,
-                'category': 'Women\'s Fragrances',
-                'product_type': 'perfume',
-                'scent_family': 'oriental',
-                'scent_notes': 'Top: Mandarin, Pink Pepper | Middle: Vanilla, Caramel | Base: Amber, Tonka Bean',
-                'size_options': '50ml, 100ml',
-                'stock_quantity': 35,
-                'is_best_seller': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1563170351-be82bc888aa4?w=400'
-                ]
-            },
-            
-            # Unisex Fragrances
-            {
-                'name': 'Citrus Burst',
-                'description': 'Energizing citrus blend perfect for any occasion.',
-                'price': 95.00,
-                'category': 'Unisex Fragrances',
-                'product_type': 'perfume',
-                'scent_family': 'citrus',
-                'scent_notes': 'Top: Grapefruit, Lemon, Orange | Middle: Mint, Green Tea | Base: White Musk',
-                'size_options': '50ml, 100ml',
-                'stock_quantity': 40,
-                'is_new': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1615634260167-c8cdede054de?w=400'
-                ]
-            },
-            
-            # Perfume Oils
-            {
-                'name': 'Amber Essence Oil',
-                'description': 'Concentrated amber oil with long-lasting projection.',
-                'price': 75.00,
-                'category': 'Perfume Oils',
-                'product_type': 'perfume_oil',
-                'scent_family': 'oriental',
-                'scent_notes': 'Pure amber with hints of vanilla and musk',
-                'size_options': '10ml, 20ml',
-                'stock_quantity': 50,
-                'is_limited_edition': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1571875257727-256c39da42af?w=400'
-                ]
-            },
-            {
-                'name': 'Oud Royal Oil',
-                'description': 'Premium oud oil from sustainable sources. Intense and long-lasting.',
-                'price': 120.00,
-                'category': 'Perfume Oils',
-                'product_type': 'perfume_oil',
-                'scent_family': 'woody',
-                'scent_notes': 'Pure oud with rose and saffron accents',
-                'size_options': '5ml, 10ml, 20ml',
-                'stock_quantity': 15,
-                'is_featured': True,
-                'is_limited_edition': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1594736797933-d0401ba2fe65?w=400'
-                ]
-            },
-            {
-                'name': 'Jasmine Night Oil',
-                'description': 'Exotic jasmine oil perfect for evening wear.',
-                'price': 65.00,
-                'category': 'Perfume Oils',
-                'product_type': 'perfume_oil',
-                'scent_family': 'floral',
-                'scent_notes': 'Jasmine, white tea, soft musk',
-                'size_options': '10ml, 20ml',
-                'stock_quantity': 30,
-                'is_new': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1588405748880-12d1d2a59d75?w=400'
-                ]
-            },
-            {
-                'name': 'Sandalwood Serenity Oil',
-                'description': 'Calming sandalwood oil with meditative properties.',
-                'price': 80.00,
-                'category': 'Perfume Oils',
-                'product_type': 'perfume_oil',
-                'scent_family': 'woody',
-                'scent_notes': 'Australian sandalwood, cedar, white musk',
-                'size_options': '10ml, 20ml',
-                'stock_quantity': 25,
-                'images': [
-                    'https://images.unsplash.com/photo-1563170351-be82bc888aa4?w=400'
-                ]
-            },
-            {
-                'name': 'Musk Al Tahara Oil',
-                'description': 'Traditional white musk oil, clean and pure.',
-                'price': 45.00,
-                'category': 'Perfume Oils',
-                'product_type': 'perfume_oil',
-                'scent_family': 'fresh',
-                'scent_notes': 'White musk, clean cotton, soft powder',
-                'size_options': '10ml, 20ml, 30ml',
-                'stock_quantity': 60,
-                'is_best_seller': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1615634260167-c8cdede054de?w=400'
-                ]
-            },
-            
-            # Air Fresheners
-            {
-                'name': 'Lavender Fields Car Freshener',
-                'description': 'Calming lavender scent for your car interior.',
-                'price': 25.00,
-                'category': 'Air Fresheners',
-                'product_type': 'air_ambience',
-                'scent_family': 'floral',
-                'scent_notes': 'Pure lavender with eucalyptus undertones',
-                'size_options': 'Standard',
-                'stock_quantity': 100,
-                'images': [
-                    'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=400'
-                ]
-            },
-            {
-                'name': 'Ocean Mist Room Spray',
-                'description': 'Fresh ocean breeze for any room in your home.',
-                'price': 35.00,
-                'category': 'Air Fresheners',
-                'product_type': 'air_ambience',
-                'scent_family': 'fresh',
-                'scent_notes': 'Sea salt, marine accord, clean cotton',
-                'size_options': '250ml, 500ml',
-                'stock_quantity': 75,
-                'is_new': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1594736797933-d0401ba2fe65?w=400'
-                ]
-            },
-            {
-                'name': 'Vanilla Spice Home Diffuser',
-                'description': 'Warm vanilla and spice blend for cozy atmospheres.',
-                'price': 45.00,
-                'category': 'Air Fresheners',
-                'product_type': 'air_ambience',
-                'scent_family': 'oriental',
-                'scent_notes': 'Vanilla, cinnamon, warm amber',
-                'size_options': '200ml with reeds',
-                'stock_quantity': 40,
-                'is_featured': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1571875257727-256c39da42af?w=400'
-                ]
-            },
-            {
-                'name': 'Citrus Burst Car Gel',
-                'description': 'Long-lasting citrus gel freshener for vehicles.',
-                'price': 20.00,
-                'category': 'Air Fresheners',
-                'product_type': 'air_ambience',
-                'scent_family': 'citrus',
-                'scent_notes': 'Lemon, orange, grapefruit zest',
-                'size_options': 'Standard gel',
-                'stock_quantity': 120,
-                'is_best_seller': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1615634260167-c8cdede054de?w=400'
-                ]
-            },
-            {
-                'name': 'Rose Garden Reed Diffuser',
-                'description': 'Elegant rose scent with continuous fragrance release.',
-                'price': 55.00,
-                'category': 'Air Fresheners',
-                'product_type': 'air_ambience',
-                'scent_family': 'floral',
-                'scent_notes': 'Bulgarian rose, peony, green leaves',
-                'size_options': '300ml with premium reeds',
-                'stock_quantity': 30,
-                'images': [
-                    'https://images.unsplash.com/photo-1588405748880-12d1d2a59d75?w=400'
-                ]
-            },
-            {
-                'name': 'Oud Wood Room Mist',
-                'description': 'Luxurious oud scent for special occasions.',
-                'price': 65.00,
-                'category': 'Air Fresheners',
-                'product_type': 'air_ambience',
-                'scent_family': 'woody',
-                'scent_notes': 'Oud wood, sandalwood, amber',
-                'size_options': '250ml spray',
-                'stock_quantity': 25,
-                'is_limited_edition': True,
-                'images': [
-                    'https://images.unsplash.com/photo-1541643600914-78b084683601?w=400'
-                ]
-            },
-            {
-                'name': 'Fresh Linen Fabric Spray',
-                'description': 'Clean linen scent for fabrics and upholstery.',
-                'price': 30.00,
-                'category': 'Air Fresheners',
-                'product_type': 'air_ambience',
-                'scent_family': 'fresh',
-                'scent_notes': 'Clean cotton, white musk, soft powder',
-                'size_options': '300ml spray',
-                'stock_quantity': 80,
-                'images': [
-                    'https://images.unsplash.com/photo-1563170351-be82bc888aa4?w=400'
-                ]
-            }
-        ]
-        
-        for product_data in products_data:
+        for product_data in PRODUCTS:
+            product_data = dict(product_data)
             category = Category.objects.get(name=product_data['category'])
             images = product_data.pop('images', [])
             
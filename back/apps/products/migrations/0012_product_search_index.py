@@ -0,0 +1,67 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS product_search_vector_gin '
+    'ON products_product USING GIN (search_vector)',
+    'CREATE INDEX IF NOT EXISTS product_name_trgm '
+    'ON products_product USING GIN (name gin_trgm_ops)',
+    """
+    UPDATE products_product p SET search_vector =
+        setweight(to_tsvector(coalesce(p.name, '')), 'A') ||
+        setweight(to_tsvector(coalesce(c.name, '')), 'B') ||
+        setweight(to_tsvector(coalesce(p.scent_notes, '')), 'B') ||
+        setweight(to_tsvector(coalesce(p.description, '')), 'C')
+    FROM products_category c WHERE c.id = p.category_id
+    """,
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS product_name_trgm',
+    'DROP INDEX IF EXISTS product_search_vector_gin',
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_product_fts USING fts5("
+    "name, description, scent_notes, category_name, tokenize='unicode61 remove_diacritics 2')",
+    """
+    INSERT INTO products_product_fts (rowid, name, description, scent_notes, category_name)
+    SELECT p.id, p.name, p.description, p.scent_notes, c.name
+    FROM products_product p JOIN products_category c ON c.id = p.category_id
+    """,
+]
+
+SQLITE_REVERSE = [
+    'DROP TABLE IF EXISTS products_product_fts',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_product_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # Vendor-specific search structures: GIN + trigram indexes on
+        # PostgreSQL, an FTS5 virtual table on SQLite
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}),
+        ),
+    ]
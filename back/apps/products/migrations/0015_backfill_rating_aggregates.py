@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill(apps, schema_editor):
+    """Fill the rating aggregates added in 0011 from the reviews written before them"""
+    Product = apps.get_model('products', 'Product')
+    Review = apps.get_model('reviews', 'Review')
+
+    # One grouped aggregate instead of a query per product
+    products = []
+    for row in Review.objects.values('product_id').annotate(total=Sum('rating'), count=Count('id')):
+        products.append(Product(
+            pk=row['product_id'],
+            rating_sum=row['total'],
+            rating_count=row['count'],
+            average_rating=round(row['total'] / row['count'], 1),
+        ))
+    Product.objects.bulk_update(products, ['rating_sum', 'rating_count', 'average_rating'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_image_variants'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        # The aggregates are derived from the reviews, so there is nothing to undo
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,9 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.db.models import Case, Count, F, FloatField, Sum, When
+from django.db.models.functions import Cast, Now, Round
 from django.utils.text import slugify
 
 
@@ -22,6 +27,12 @@ class Category(models.Model):
         null=True,
         help_text="Upload category image from your computer"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of image_file (config.images)"
+    )
     
     class Meta:
         verbose_name_plural = 'Categories'
@@ -81,7 +92,14 @@ class Product(models.Model):
     is_best_seller = models.BooleanField(default=False)
     is_limited_edition = models.BooleanField(default=False)
     
-
+    # Denormalized review aggregates (kept current by the reviews app)
+    RATING_FIELDS = ('rating_sum', 'rating_count', 'average_rating')
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    average_rating = models.FloatField(default=0, editable=False)
+    
+    # Full-text search document (PostgreSQL only; see apps.products.search)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -89,6 +107,19 @@ class Product(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        # Shaped after ProductViewSet filters/sorts and the ETag aggregate
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['category', '-created_at']),
+            models.Index(fields=['price']),
+            models.Index(fields=['name']),
+            models.Index(fields=['updated_at']),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_featured=True) | models.Q(is_best_seller=True),
+                name='products_featured_created_idx'
+            ),
+        ]
     
     def __str__(self):
         return self.name
@@ -111,28 +142,69 @@ class Product(models.Model):
             return 'Featured'
         return None
     
+    def _primary_image_record(self):
+        """
+        The primary ProductImage, else the first one.
+        Iterates images.all() so a prefetch_related('images') cache is used
+        instead of issuing per-product queries.
+        """
+        images = list(self.images.all())
+        for image in images:
+            if image.is_primary:
+                return image
+        return images[0] if images else None
+    
     @property
     def primary_image(self):
         """Get the primary product image URL"""
-        primary = self.images.filter(is_primary=True).first()
-        if primary:
-            return primary.url
-        # Fallback to first image
-        first_image = self.images.first()
-        return first_image.url if first_image else None
+        image = self._primary_image_record()
+        return image.url if image else None
     
     @property
-    def average_rating(self):
-        """Calculate average rating from reviews"""
-        reviews = self.reviews.all()
-        if reviews.exists():
-            return round(sum(r.rating for r in reviews) / reviews.count(), 1)
-        return 0
+    def primary_image_variants(self):
+        """Resized copies of the primary image (see config.images)"""
+        image = self._primary_image_record()
+        return image.image_variants if image else {}
     
     @property
     def review_count(self):
         """Get total number of reviews"""
-        return self.reviews.count()
+        return self.rating_count
+    
+    def adjust_rating(self, rating_delta, count_delta):
+        """
+        Atomically add a review's rating to (or remove it from) the stored
+        aggregates with a single UPDATE, then refresh the in-memory values.
+        """
+        new_sum = F('rating_sum') + rating_delta
+        new_count = F('rating_count') + count_delta
+        updated = Product.objects.filter(pk=self.pk).update(
+            updated_at=Now(),
+            rating_sum=new_sum,
+            rating_count=new_count,
+            average_rating=Case(
+                When(rating_count__gt=-count_delta, then=Round(
+                    Cast(new_sum, FloatField()) / Cast(new_count, FloatField()), 1
+                )),
+                default=0.0,
+                output_field=FloatField(),
+            ),
+        )
+        if updated:
+            self.refresh_from_db(fields=['rating_sum', 'rating_count', 'average_rating', 'updated_at'])
+    
+    def refresh_rating(self):
+        """Recompute the stored rating aggregates from this product's reviews"""
+        totals = self.reviews.aggregate(total=Sum('rating'), count=Count('id'))
+        self.rating_sum = totals['total'] or 0
+        self.rating_count = totals['count']
+        self.average_rating = round(self.rating_sum / self.rating_count, 1) if self.rating_count else 0
+        Product.objects.filter(pk=self.pk).update(
+            updated_at=Now(),
+            rating_sum=self.rating_sum,
+            rating_count=self.rating_count,
+            average_rating=self.average_rating,
+        )
 
 
 class ProductImage(models.Model):
@@ -153,6 +225,12 @@ class ProductImage(models.Model):
         null=True,
         help_text="Upload image from your computer"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of image_file (config.images)"
+    )
     
     alt_text = models.CharField(
         max_length=200, 
@@ -179,3 +257,33 @@ class ProductImage(models.Model):
         from django.core.exceptions import ValidationError
         if not self.image_url and not self.image_file:
             raise ValidationError('Please provide either an image URL or upload an image file.')
+
+
+@receiver(post_save, sender=Product)
+def index_product_for_search(sender, instance, **kwargs):
+    """Keep the full-text search index in sync with product edits"""
+    from .search import index_products
+    index_products([instance])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product_for_search(sender, instance, **kwargs):
+    from .search import remove_product
+    remove_product(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_products(sender, instance, created, **kwargs):
+    """Category names are searchable, so re-index the category's products"""
+    if not created:
+        from .search import reindex_category
+        reindex_category(instance)
+        # Products embed their category, so their representation changed too
+        instance.products.update(updated_at=Now())
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def touch_product_on_image_change(sender, instance, **kwargs):
+    """Bump the product's updated_at so ETag/Last-Modified see image changes"""
+    Product.objects.filter(pk=instance.product_id).update(updated_at=Now())
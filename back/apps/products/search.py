@@ -0,0 +1,237 @@
+"""
+Product full-text search.
+
+One interface over two database-specific backends:
+- PostgreSQL: weighted tsvector stored in Product.search_vector (GIN index)
+  combined with pg_trgm similarity on the name for typo tolerance. Both
+  filters are indexable operators (@@ and %), so the two GIN indexes are
+  combined in a BitmapOr; TrigramSimilarity is only used for ranking. A
+  misspelled name matches at pg_trgm.similarity_threshold (TRIGRAM_THRESHOLD).
+- SQLite: an FTS5 virtual table kept in sync on Product/Category save.
+  The MATCH runs once, in a derived table of (rowid, bm25 rank) joined to
+  the products, so every match is ranked and counted without a cap.
+
+Any other database falls back to the original icontains filter.
+"""
+import re
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import Expression
+from django.db.models.sql.constants import INNER
+
+FTS_TABLE = 'products_product_fts'
+
+# pg_trgm.similarity_threshold default: the cut-off of the trigram_similar (%) filter
+TRIGRAM_THRESHOLD = 0.3
+
+# Alias of the ranked-matches derived table joined by search_products on SQLite
+FTS_RANK_ALIAS = 'products_product_fts_rank'
+
+# bm25 column weights: name, description, scent_notes, category_name
+BM25_WEIGHTS = '10.0, 1.0, 4.0, 4.0'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _vendor():
+    return connection.vendor
+
+
+def _postgres_vector(category_name):
+    """Weighted search vector expression for a product row"""
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector('name', weight='A')
+        + SearchVector(Value(category_name or ''), weight='B')
+        + SearchVector('scent_notes', weight='B')
+        + SearchVector('description', weight='C')
+    )
+
+
+def fts_match_expression(query):
+    """Quote each token and allow prefix matches: 'ros oud' -> '"ros"* "oud"*'"""
+    tokens = _TOKEN_RE.findall(query.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def index_products(products):
+    """Write the given products (with category loaded) into the search index"""
+    vendor = _vendor()
+    if vendor == 'postgresql':
+        from .models import Product
+
+        # One UPDATE per category; the vector is computed by the database
+        by_category = {}
+        for product in products:
+            category_name = product.category.name if product.category_id else ''
+            by_category.setdefault(category_name, []).append(product.pk)
+        for category_name, ids in by_category.items():
+            Product.objects.filter(pk__in=ids).update(
+                search_vector=_postgres_vector(category_name)
+            )
+    elif vendor == 'sqlite':
+        rows = [
+            (
+                product.pk,
+                product.name,
+                product.description,
+                product.scent_notes,
+                product.category.name if product.category_id else '',
+            )
+            for product in products
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(row[0],) for row in rows]
+            )
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description, scent_notes, category_name) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                rows
+            )
+
+
+def remove_product(product_id):
+    """Drop a deleted product from the search index"""
+    if _vendor() == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [product_id])
+
+
+def reindex_category(category):
+    """Refresh indexed category names after a category is renamed"""
+    from .models import Product
+
+    if _vendor() == 'postgresql':
+        Product.objects.filter(category=category).update(
+            search_vector=_postgres_vector(category.name)
+        )
+    else:
+        index_products(Product.objects.filter(category=category).select_related('category'))
+
+
+def rebuild_index(batch_size=1000):
+    """Re-index every product; returns the number of products indexed"""
+    from .models import Category, Product
+
+    vendor = _vendor()
+    if vendor == 'postgresql':
+        for category in Category.objects.all():
+            reindex_category(category)
+        return Product.objects.count()
+
+    if vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    total = 0
+    batch = []
+    for product in Product.objects.select_related('category').iterator(chunk_size=batch_size):
+        batch.append(product)
+        if len(batch) >= batch_size:
+            index_products(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        index_products(batch)
+        total += len(batch)
+    return total
+
+
+class FtsRankJoin:
+    """
+    INNER JOIN (SELECT rowid, bm25(...) AS rank FROM <fts> WHERE <fts> MATCH %s)
+    on the product id, as an entry of Query.alias_map
+    """
+    join_type = INNER
+    nullable = False
+    filtered_relation = None
+
+    def __init__(self, parent_alias, table_alias, match):
+        # Query.table_map is keyed on table_name, which must survive relabeling
+        self.table_name = FTS_RANK_ALIAS
+        self.parent_alias = parent_alias
+        self.table_alias = table_alias
+        self.match = match
+
+    def as_sql(self, compiler, connection):
+        return (
+            f'INNER JOIN (SELECT rowid, bm25({FTS_TABLE}, {BM25_WEIGHTS}) AS rank '
+            f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s) {compiler.quote_name_unless_alias(self.table_alias)} '
+            f'ON ({compiler.quote_name_unless_alias(self.table_alias)}.rowid = '
+            f'{compiler.quote_name_unless_alias(self.parent_alias)}."id")',
+            [self.match],
+        )
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(
+            change_map.get(self.parent_alias, self.parent_alias),
+            change_map.get(self.table_alias, self.table_alias),
+            self.match,
+        )
+
+    def demote(self):
+        return self
+
+    def promote(self):
+        return self
+
+
+class FtsRank(Expression):
+    """The bm25 rank column of the joined FtsRankJoin (lower is more relevant)"""
+    output_field = FloatField()
+
+    def __init__(self, alias=FTS_RANK_ALIAS):
+        super().__init__()
+        self.alias = alias
+
+    def as_sql(self, compiler, connection):
+        return f'{compiler.quote_name_unless_alias(self.alias)}.rank', []
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(change_map.get(self.alias, self.alias))
+
+
+def _join_fts_rank(queryset, match):
+    """Clone of `queryset` inner-joined to the ranked FTS matches, with search_rank"""
+    queryset = queryset.all()
+    query = queryset.query
+    parent_alias = query.get_initial_alias()
+    query.alias_map[FTS_RANK_ALIAS] = FtsRankJoin(parent_alias, FTS_RANK_ALIAS, match)
+    query.alias_refcount[FTS_RANK_ALIAS] = 1
+    query.table_map[FTS_RANK_ALIAS] = [FTS_RANK_ALIAS]
+    return queryset.annotate(search_rank=FtsRank())
+
+
+def search_products(queryset, query):
+    """
+    Filter a Product queryset to matches for `query`, annotated with
+    `search_rank` and ordered by relevance (best first).
+    """
+    vendor = _vendor()
+
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+
+        search_query = SearchQuery(query, search_type='websearch')
+        return queryset.filter(
+            Q(search_vector=search_query) | Q(name__trigram_similar=query)
+        ).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query) + TrigramSimilarity('name', query),
+        ).order_by('-search_rank')
+
+    if vendor == 'sqlite':
+        match = fts_match_expression(query)
+        if not match:
+            return queryset.none()
+        # bm25 is lower-is-better, so ascending search_rank puts the best first
+        return _join_fts_rank(queryset, match).order_by('search_rank')
+
+    return queryset.filter(
+        Q(name__icontains=query) |
+        Q(description__icontains=query) |
+        Q(scent_notes__icontains=query) |
+        Q(category__name__icontains=query)
+    )
@@ -1,40 +1,50 @@
 from rest_framework import serializers
 from django.db.models import Avg
+from config.images import SrcsetField
+from config.projection import SparseFieldsetMixin
 from .models import Category, Product, ProductImage
 
 
 class CategorySerializer(serializers.ModelSerializer):
     """Serializer for Category model"""
     image = serializers.ReadOnlyField()  # Returns the image property (file or URL)
+    image_srcset = SrcsetField(source='image_variants')
     
     class Meta:
         model = Category
-        fields = ['id', 'name', 'slug', 'description', 'image', 'image_url']
+        fields = ['id', 'name', 'slug', 'description', 'image', 'image_srcset', 'image_url']
         read_only_fields = ['slug']
 
 
 class ProductImageSerializer(serializers.ModelSerializer):
     """Serializer for ProductImage model"""
     url = serializers.CharField(read_only=True)
+    srcset = SrcsetField(source='image_variants')
     
     class Meta:
         model = ProductImage
-        fields = ['id', 'image_url', 'image_file', 'url', 'alt_text', 'is_primary', 'order']
+        fields = ['id', 'image_url', 'image_file', 'url', 'srcset', 'alt_text', 'is_primary', 'order']
         read_only_fields = ['url']
 
 
-class ProductListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for product list views"""
+class ProductListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Lightweight serializer for product list views (supports ?fields=/?omit=)"""
     category = CategorySerializer(read_only=True)
     primary_image = serializers.SerializerMethodField()
+    primary_image_srcset = SrcsetField(source='primary_image_variants')
     tag = serializers.CharField(read_only=True)
     
     class Meta:
         model = Product
         fields = [
             'id', 'name', 'slug', 'price', 'category', 'product_type',
-            'scent_family', 'stock_quantity', 'primary_image', 'tag', 'created_at'
+            'scent_family', 'stock_quantity', 'primary_image', 'primary_image_srcset', 'tag', 'created_at'
         ]
+        field_dependencies = {
+            'primary_image': ['images'],
+            'primary_image_srcset': ['images'],
+            'tag': ['is_limited_edition', 'is_new', 'is_best_seller', 'is_featured'],
+        }
     
     def get_primary_image(self, obj):
         """Get the primary image URL"""
@@ -46,9 +56,10 @@ class ProductDetailSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     images = ProductImageSerializer(many=True, read_only=True)
     average_rating = serializers.FloatField(read_only=True)
-    review_count = serializers.IntegerField(read_only=True)
+    review_count = serializers.IntegerField(source='rating_count', read_only=True)
     tag = serializers.CharField(read_only=True)
     primary_image = serializers.CharField(read_only=True)
+    primary_image_srcset = SrcsetField(source='primary_image_variants')
     
     class Meta:
         model = Product
@@ -56,7 +67,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             'id', 'name', 'slug', 'description', 'price', 'category',
             'product_type', 'scent_family', 'scent_notes', 'size_options',
             'stock_quantity', 'is_featured', 'is_new', 'is_best_seller', 'is_limited_edition',
-            'images', 'primary_image', 'average_rating', 'review_count', 'tag',
+            'images', 'primary_image', 'primary_image_srcset', 'average_rating', 'review_count', 'tag',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['slug', 'created_at', 'updated_at']
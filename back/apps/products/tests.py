@@ -1,8 +1,29 @@
-from django.test import TestCase
-from rest_framework.test import APITestCase
+import os
+import tempfile
+import time
+from io import BytesIO, StringIO
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
+from PIL import Image
+from apps.content.models import DupeProduct
+from config.benchmark import check_budgets, load_budgets, run_benchmarks, seed_catalog
+from config.catalog_io import CatalogImportError, export_lines, import_catalog
+from config.images import srcset
+from config.pagination import ApproximateCountPagination, ApproximateCountPaginator, estimate_count
+from .admin import ProductAdmin
 from .models import Category, Product, ProductImage
+from .search import rebuild_index
 
 
 class ProductModelTest(TestCase):
@@ -35,6 +56,36 @@ class ProductModelTest(TestCase):
         self.assertEqual(product.slug, 'my-awesome-product')
 
 
+    def test_admin_leaves_rating_aggregates_alone(self):
+        """Test the admin form neither shows nor writes back the rating counters"""
+        admin_user = User.objects.create_superuser('staff', 'staff@example.com', 'pass')
+        product = Product.objects.create(name='Oud', description='Test', price=50, category=self.category)
+        self.client.force_login(admin_user)
+        url = f'/admin/products/product/{product.pk}/change/'
+        form = self.client.get(url).context['adminform'].form
+        self.assertFalse(set(Product.RATING_FIELDS) & set(form.fields))
+        
+        # A review lands between loading the form and saving it
+        data = {name: value for name, value in form.initial.items() if value is not None}
+        data.update({
+            'name': 'Oud Royal', 'slug': product.slug, 'category': self.category.pk,
+            'images-TOTAL_FORMS': 0, 'images-INITIAL_FORMS': 0,
+        })
+        get_object = ProductAdmin.get_object
+        
+        def load_then_review(admin_self, *args, **kwargs):
+            obj = get_object(admin_self, *args, **kwargs)
+            Product.objects.filter(pk=obj.pk).update(rating_sum=5, rating_count=1, average_rating=5.0)
+            return obj
+        
+        with mock.patch.object(ProductAdmin, 'get_object', load_then_review):
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        product.refresh_from_db()
+        self.assertEqual(product.name, 'Oud Royal')
+        self.assertEqual((product.rating_sum, product.rating_count), (5, 1))
+
+
 class ProductAPITest(APITestCase):
     """Test Product API endpoints"""
     
@@ -97,6 +148,86 @@ class ProductAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
     
+    def test_search_ranks_name_matches_first(self):
+        """Test search covers notes and category and ranks by relevance"""
+        Product.objects.create(
+            name='Velvet Night',
+            description='A rose accord buried under amber',
+            price=70.00,
+            category=self.category,
+            stock_quantity=5
+        )
+        response = self.client.get('/api/products/?search=rose')
+        names = [p['name'] for p in response.data['results']]
+        self.assertEqual(names, ['Rose Perfume', 'Velvet Night'])
+        
+        # Category names and prefixes are searchable
+        response = self.client.get('/api/products/?search=flor')
+        self.assertEqual(len(response.data['results']), 3)
+    
+    def test_broad_search_is_not_capped(self):
+        """Test every match is counted and reachable, however many there are"""
+        Product.objects.bulk_create([
+            Product(name=f'Musk {index}', slug=f'musk-{index}', description='Test', price=10, category=self.category)
+            for index in range(1005)
+        ])
+        rebuild_index()
+        response = self.client.get('/api/products/?search=musk&page=51')
+        self.assertEqual(response.data['count'], 1005)
+        self.assertEqual(len(response.data['results']), 5)
+        
+        # Ranking still applies across the full set
+        Product.objects.create(name='Musk Musk', description='Musk musk', price=10, category=self.category)
+        response = self.client.get('/api/products/?search=musk')
+        self.assertEqual(response.data['results'][0]['name'], 'Musk Musk')
+        
+        # Keyset pages walk the ranked matches too
+        first = self.client.get('/api/products/?search=musk&page_size=100&cursor=')
+        second = self.client.get(first.data['next'])
+        self.assertEqual(first.data['results'][0]['name'], 'Musk Musk')
+        self.assertEqual(len(second.data['results']), 100)
+        self.assertFalse(
+            {item['id'] for item in first.data['results']} & {item['id'] for item in second.data['results']}
+        )
+    
+    def test_broad_search_matches_once(self):
+        """Test a broad match runs the FTS query once per SQL statement and stays fast"""
+        Product.objects.bulk_create([
+            Product(name=f'Amber {index}', slug=f'amber-{index}', description='Amber', price=10, category=self.category)
+            for index in range(5000)
+        ], batch_size=500)
+        rebuild_index()
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/?search=amber&page=3')
+        elapsed = time.perf_counter() - started
+        self.assertEqual(response.data['count'], 5000)
+        self.assertEqual(len(response.data['results']), 20)
+        matches = [query['sql'].count('MATCH') for query in queries.captured_queries]
+        self.assertEqual(max(matches), 1)
+        # A per-row correlated MATCH took seconds at this size
+        self.assertLess(elapsed, 2)
+    
+    def test_search_vector_not_loaded(self):
+        """Test list and detail queries leave the tsvector column unread"""
+        for url in ['/api/products/', f'/api/products/{self.product1.slug}/', '/api/products/?search=rose']:
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+            self.assertFalse(any(
+                '"products_product"."search_vector"' in query['sql'] for query in queries.captured_queries
+            ))
+    
+    def test_search_index_follows_edits(self):
+        """Test the search index is kept in sync on save and delete"""
+        self.product2.name = 'Tuberose Dream'
+        self.product2.save()
+        response = self.client.get('/api/products/?search=tuberose')
+        self.assertEqual(len(response.data['results']), 1)
+        
+        self.product2.delete()
+        response = self.client.get('/api/products/?search=tuberose')
+        self.assertEqual(len(response.data['results']), 0)
+    
     def test_pagination(self):
         """Test product pagination"""
         # Create more products
@@ -137,3 +268,575 @@ class ProductAPITest(APITestCase):
         }
         response = self.client.post('/api/products/', data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+    
+    def test_list_products_constant_queries(self):
+        """Test product list query count does not grow with rows or images"""
+        for i in range(10):
+            product = Product.objects.create(
+                name=f'Imaged Product {i}',
+                description='Test',
+                price=50.00,
+                category=self.category,
+                stock_quantity=10
+            )
+            ProductImage.objects.create(product=product, image_url='https://example.com/a.jpg')
+            ProductImage.objects.create(
+                product=product, image_url='https://example.com/b.jpg', is_primary=True
+            )
+        
+        # ETag aggregate (its COUNT also feeds pagination), products with categories, prefetched images
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/products/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        imaged = [p for p in response.data['results'] if p['name'].startswith('Imaged')]
+        self.assertTrue(all(p['primary_image'] == 'https://example.com/b.jpg' for p in imaged))
+    
+    def test_conditional_get_list(self):
+        """Test list responses carry validators and answer 304 without serializing"""
+        response = self.client.get('/api/products/')
+        etag = response['ETag']
+        # MAX(updated_at) misses deletes and deactivations, so lists carry no Last-Modified
+        self.assertNotIn('Last-Modified', response)
+        
+        # Paginator count and the page's rows: no image prefetch, no serializing
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        
+        # Different filters get a different validator
+        response = self.client.get('/api/products/?featured=true', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        # Any change to a listed product changes the validator
+        ProductImage.objects.create(product=self.product1, image_url='https://example.com/new.jpg')
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        
+        # If-Modified-Since alone never yields a 304 that would hide a removed row
+        self.product2.delete()
+        response = self.client.get('/api/products/', HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 3600))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_conditional_get_detail(self):
+        """Test detail responses answer 304 until the product changes"""
+        url = f'/api/products/{self.product1.slug}/'
+        etag = self.client.get(url)['ETag']
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.product1.price = 79.00
+        self.product1.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ExplainCatalogCommandTest(TestCase):
+    """Test the catalog EXPLAIN command"""
+    
+    def test_catalog_queries_use_indexes(self):
+        """Test every endpoint's list query is served by an index"""
+        out = StringIO()
+        call_command('explain_catalog', '--fail-on-scan', stdout=out)
+        self.assertIn('endpoints use indexes only', out.getvalue())
+
+
+
+class KeysetPaginationTest(APITestCase):
+    """Test opt-in ?cursor= keyset pagination of the product list"""
+    
+    def setUp(self):
+        self.category = Category.objects.create(name='Woody')
+        # Repeated prices and featured flags so the id tie-breaker matters
+        for index in range(25):
+            Product.objects.create(
+                name=f'Cedar {index}',
+                description='Test',
+                price=Decimal('10.00') + index % 3,
+                category=self.category,
+                is_featured=index % 5 == 0
+            )
+    
+    def walk(self, url):
+        """Follow next links from `url`, returning the slugs in order"""
+        slugs = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            slugs.extend(item['slug'] for item in response.data['results'])
+            url = response.data['next']
+        return slugs
+    
+    def test_cursor_pages_match_page_number_order(self):
+        """Test every sort_by walks the same rows with cursors as with page numbers"""
+        for sort_by in ['', 'price', 'price-low', 'price-high', 'name', 'featured', 'created_at', '-created_at']:
+            with self.subTest(sort_by=sort_by):
+                expected = self.walk(f'/api/products/?sort_by={sort_by}')
+                walked = self.walk(f'/api/products/?sort_by={sort_by}&page_size=7&cursor=')
+                self.assertEqual(len(walked), 25)
+                self.assertEqual(len(set(walked)), 25)
+                if sort_by in ('', 'name', 'created_at', '-created_at'):
+                    self.assertEqual(walked, expected)
+                else:
+                    # Only the order within equal sort keys may differ
+                    self.assertEqual(sorted(walked), sorted(expected))
+    
+    def test_cursor_response_has_no_count(self):
+        """Test keyset pages return next/previous/results only"""
+        response = self.client.get('/api/products/?cursor=')
+        self.assertEqual(set(response.data), {'next', 'previous', 'results'})
+    
+    def test_previous_link_returns_previous_page(self):
+        """Test the previous cursor serves the page before"""
+        first = self.client.get('/api/products/?sort_by=price&page_size=10&cursor=')
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNotNone(back.data['next'])
+    
+    def test_deep_pages_cost_the_same(self):
+        """Test a deep cursor page runs the same queries as the first, without OFFSET"""
+        url = '/api/products/?page_size=5&cursor='
+        pages = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            pages.append(queries.captured_queries)
+            url = response.data['next']
+        self.assertEqual(len(pages), 5)
+        self.assertEqual({len(page) for page in pages}, {len(pages[0])})
+        for page in pages:
+            self.assertFalse(any('OFFSET' in query['sql'] for query in page))
+            self.assertFalse(any('COUNT(' in query['sql'] for query in page))
+    
+    def test_conditional_cursor_page(self):
+        """Test keyset pages answer 304 until a row on the page changes"""
+        url = '/api/products/?page_size=5&cursor='
+        response = self.client.get(url)
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        # A deletion elsewhere leaves the page alone; one on the page does not
+        Product.objects.filter(name='Cedar 0').delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Product.objects.filter(slug=self.client.get(url).data['results'][0]['slug']).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_page_number_mode_unchanged(self):
+        """Test requests without ?cursor= keep count/next/previous page numbers"""
+        response = self.client.get('/api/products/?page=2')
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertEqual(response.data['previous'], 'http://testserver/api/products/')
+    
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is a 404, like DRF's CursorPagination"""
+        response = self.client.get('/api/products/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ApproximateCountPaginationTest(APITestCase):
+    """Test estimated counts in page-number pagination"""
+    
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Citrus')
+        for index in range(8):
+            Product.objects.create(name=f'Lime {index}', description='Test', price=20, category=self.category)
+        self.queryset = Product.objects.order_by('pk')
+    
+    def test_small_counts_are_exact(self):
+        """Test counts below the threshold are always exact"""
+        paginator = ApproximateCountPaginator(self.queryset, 4, threshold=100)
+        self.assertEqual(paginator.count, 8)
+        self.assertTrue(paginator.count_is_exact)
+        self.assertIsNone(estimate_count(self.queryset))
+    
+    def test_large_counts_come_from_cache(self):
+        """Test a repeated filter signature reuses the cached count"""
+        first = ApproximateCountPaginator(self.queryset, 4, threshold=5)
+        self.assertEqual(first.count, 8)
+        self.assertTrue(first.count_is_exact)
+        
+        Product.objects.create(name='Lime extra', description='Test', price=20, category=self.category)
+        second = ApproximateCountPaginator(self.queryset, 4, threshold=5)
+        with self.assertNumQueries(0):
+            self.assertEqual(second.count, 8)
+        self.assertFalse(second.count_is_exact)
+        
+        # Pages past the estimate still exist and know whether more follow
+        self.assertTrue(second.page(2).has_next())
+        last = second.page(3)
+        self.assertEqual(len(last), 1)
+        self.assertFalse(last.has_next())
+        
+        other_filter = ApproximateCountPaginator(self.queryset.filter(price__gt=10), 4, threshold=5)
+        self.assertEqual(other_filter.count, 9)
+        self.assertTrue(other_filter.count_is_exact)
+    
+    @override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=5)
+    def test_response_flags_estimated_count(self):
+        """Test paginated responses say whether the count is exact"""
+        flags = []
+        for _ in range(2):
+            pagination = ApproximateCountPagination()
+            pagination.page_size = 4
+            request = Request(APIRequestFactory().get('/api/products/', {'page': 2}))
+            pagination.paginate_queryset(self.queryset, request)
+            response = pagination.get_paginated_response([])
+            self.assertEqual(response.data['count'], 8)
+            flags.append(response.data['count_exact'])
+        self.assertEqual(flags, [True, False])
+    
+    def test_conditional_list_counts_once(self):
+        """Test the ETag reuses the paginator's count instead of counting again"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/')
+        self.assertEqual(response.data['count'], 8)
+        self.assertEqual(sum('COUNT(' in query['sql'] for query in queries.captured_queries), 1)
+    
+    @override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=5)
+    def test_viewset_uses_estimated_count(self):
+        """Test large listings on a real viewset take the estimate, not COUNT(*)"""
+        with mock.patch('config.pagination.estimate_count', return_value=5000) as estimate:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/products/')
+            etag = response['ETag']
+            self.assertEqual(response.data['count'], 5000)
+            self.assertFalse(response.data['count_exact'])
+            self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+            estimate.assert_called_once()
+            
+            # Validators still follow the rows on the page
+            self.assertEqual(self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            Product.objects.get(name='Lime 0').save()
+            self.assertEqual(self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+    
+    @override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=5)
+    def test_viewset_reuses_cached_count(self):
+        """Test without planner statistics a repeated listing reuses its cached count"""
+        first = self.client.get('/api/products/')
+        self.assertTrue(first.data['count_exact'])
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get('/api/products/')
+        self.assertEqual(second.data['count'], 8)
+        self.assertFalse(second.data['count_exact'])
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+
+
+class SparseFieldsetTest(APITestCase):
+    """Test ?fields=/?omit= projection of the product list"""
+    
+    def setUp(self):
+        self.category = Category.objects.create(name='Amber')
+        for index in range(6):
+            product = Product.objects.create(
+                name=f'Amber {index}',
+                description='A long description ' * 50,
+                price=30 + index,
+                category=self.category
+            )
+            ProductImage.objects.create(product=product, image_url='https://example.com/a.jpg', is_primary=True)
+    
+    def get_with_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in queries.captured_queries]
+    
+    def test_fields_prunes_output_and_columns(self):
+        """Test ?fields= returns only those keys and loads only their columns"""
+        response, queries = self.get_with_queries('/api/products/?fields=id,name,price,primary_image')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name', 'price', 'primary_image'})
+        self.assertEqual(response.data['results'][0]['primary_image'], 'https://example.com/a.jpg')
+        # Paginator COUNT, products, prefetched images: no category join, no description
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn('products_category', queries[1])
+        self.assertNotIn('"description"', queries[1])
+    
+    def test_omit_drops_relations(self):
+        """Test ?omit= removes fields and the joins and prefetches they needed"""
+        response, queries = self.get_with_queries('/api/products/?omit=category,primary_image,primary_image_srcset')
+        item = response.data['results'][0]
+        self.assertNotIn('category', item)
+        self.assertNotIn('primary_image', item)
+        self.assertIn('tag', item)
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('JOIN', queries[1])
+        
+        full = self.client.get('/api/products/')
+        self.assertLess(len(response.content), len(full.content))
+    
+    def test_projection_with_cursor_pagination(self):
+        """Test keyset pages still read their sort columns when they are not requested"""
+        url = '/api/products/?fields=id&sort_by=price-high&page_size=4&cursor='
+        response, queries = self.get_with_queries(url)
+        self.assertEqual(len(queries), 1)
+        next_page, queries = self.get_with_queries(response.data['next'])
+        self.assertEqual(len(queries), 1)
+        ids = [item['id'] for item in response.data['results'] + next_page.data['results']]
+        self.assertEqual(ids, list(Product.objects.order_by('-price').values_list('id', flat=True)))
+    
+    def test_nested_and_detail_serializers_unaffected(self):
+        """Test ?fields= does not prune nested serializers or detail views"""
+        response = self.client.get('/api/products/?fields=category')
+        self.assertIn('description', response.data['results'][0]['category'])
+        detail = self.client.get(f'/api/products/{Product.objects.first().slug}/?fields=id')
+        self.assertIn('description', detail.data)
+
+
+class BenchmarkHarnessTest(TestCase):
+    """Test the API benchmark harness at a small scale"""
+    
+    def test_small_catalog_within_budgets(self):
+        """Test every endpoint is measured and the checked-in budgets hold"""
+        context = seed_catalog(20)
+        report = run_benchmarks(context, iterations=1, scale=20)
+        self.assertIn('product-detail', report['endpoints'])
+        self.assertIn('order-detail', report['endpoints'])
+        self.assertEqual(check_budgets(report, load_budgets()), [])
+    
+    def test_budget_violations_reported(self):
+        """Test exceeded budgets and server errors become violations"""
+        report = {'endpoints': {
+            'product-list': {'status': 200, 'queries': 9, 'p50_ms': 1, 'p95_ms': 2, 'bytes': 10},
+            'faq-list': {'status': 500, 'queries': 1, 'p50_ms': 1, 'p95_ms': 2, 'bytes': 10},
+        }}
+        budgets = {'default': {'queries': 3}, 'endpoints': {'faq-list': {'queries': 5}}}
+        self.assertEqual(check_budgets(report, budgets), [
+            'product-list: queries 9 > budget 3',
+            'faq-list: HTTP 500',
+        ])
+
+
+class CatalogImportExportTest(APITestCase):
+    """Test bulk catalog import/export"""
+    
+    def setUp(self):
+        self.category = Category.objects.create(name='Floral')
+    
+    def import_csv(self, kind, text, **kwargs):
+        return import_catalog(kind, StringIO(text), 'csv', **kwargs)
+    
+    def test_import_creates_and_updates_by_slug(self):
+        """Test rows upsert on the slug and only provided columns change"""
+        report = self.import_csv('product', (
+            'name,description,price,category,stock_quantity,is_featured\n'
+            'Rose Oud,Rich rose,99.50,Floral,5,yes\n'
+            'Amber Musk,Warm amber,45,Woody Notes,0,false\n'
+        ))
+        self.assertEqual((report['created'], report['updated'], report['error_count']), (2, 0, 0))
+        rose = Product.objects.get(slug='rose-oud')
+        self.assertEqual(rose.category, self.category)
+        self.assertEqual(rose.price, Decimal('99.50'))
+        self.assertTrue(rose.is_featured)
+        # Missing categories are created on the fly
+        self.assertEqual(Product.objects.get(slug='amber-musk').category.name, 'Woody Notes')
+        
+        report = self.import_csv('product', 'slug,price\nrose-oud,120\n')
+        self.assertEqual((report['created'], report['updated']), (0, 1))
+        rose_after = Product.objects.get(slug='rose-oud')
+        self.assertEqual(rose_after.pk, rose.pk)
+        self.assertEqual(rose_after.price, Decimal('120'))
+        self.assertEqual(rose_after.description, 'Rich rose')
+        self.assertEqual(rose_after.created_at, rose.created_at)
+    
+    def test_invalid_rows_are_reported_and_skipped(self):
+        """Test bad values and missing required columns skip only their row"""
+        report = self.import_csv('product', (
+            'name,description,price,category,product_type\n'
+            'Good,Fine,10,Floral,perfume\n'
+            'Bad Price,Fine,abc,Floral,perfume\n'
+            'Bad Type,Fine,10,Floral,shampoo\n'
+            'No Category,Fine,10,,perfume\n'
+        ))
+        self.assertEqual(report['created'], 1)
+        self.assertEqual([error['row'] for error in report['errors']], [2, 3, 4])
+        self.assertEqual(report['errors'][2]['errors'], ['category: required for a new product'])
+        self.assertEqual(Product.objects.count(), 1)
+    
+    def test_unknown_column_rejects_file(self):
+        """Test an unknown column aborts the import"""
+        with self.assertRaises(CatalogImportError):
+            self.import_csv('product', 'name,colour\nRose,red\n')
+    
+    def test_dry_run_keeps_nothing(self):
+        """Test dry runs report without saving"""
+        report = self.import_csv('dupe', (
+            'name,description,price,designer_brand,designer_fragrance,designer_price,scent_notes\n'
+            'Coco Dupe,Inspired,40,Chanel,Coco,150,Rose\n'
+        ), dry_run=True)
+        self.assertEqual(report['created'], 1)
+        self.assertFalse(DupeProduct.objects.exists())
+    
+    def test_import_indexes_for_search(self):
+        """Test imported rows are searchable although bulk writes skip signals"""
+        import_catalog('perfume_oil', StringIO(
+            '{"name": "Saffron Oud Oil", "description": "Smoky", "price": "30.00"}\n'
+        ), 'jsonl')
+        response = self.client.get('/api/search/', {'q': 'saffron'})
+        self.assertEqual([result['slug'] for result in response.data['results']], ['saffron-oud-oil'])
+    
+    def test_image_import_replaces_product_images(self):
+        """Test image rows replace the product's existing image set"""
+        product = Product.objects.create(name='Lily', description='d', price=10, category=self.category)
+        ProductImage.objects.create(product=product, image_url='https://example.com/old.jpg')
+        report = self.import_csv('product_image', (
+            'product,image_url,is_primary,order\n'
+            'lily,https://example.com/a.jpg,true,0\n'
+            'lily,https://example.com/b.jpg,false,1\n'
+            'missing,https://example.com/c.jpg,false,0\n'
+        ), batch_size=1)
+        self.assertEqual(report['created'], 2)
+        self.assertEqual(report['errors'][0]['row'], 3)
+        self.assertEqual(
+            list(product.images.values_list('image_url', flat=True)),
+            ['https://example.com/a.jpg', 'https://example.com/b.jpg']
+        )
+    
+    def test_export_round_trips(self):
+        """Test an export imports back unchanged"""
+        Product.objects.create(
+            name='Lily, "White"', description='Line one\nline two', price=Decimal('12.30'),
+            category=self.category, is_new=True
+        )
+        for file_format in ('csv', 'jsonl'):
+            exported = ''.join(export_lines('product', file_format))
+            report = import_catalog('product', StringIO(exported), file_format)
+            self.assertEqual((report['updated'], report['error_count']), (1, 0))
+        product = Product.objects.get()
+        self.assertEqual(product.description, 'Line one\nline two')
+        self.assertEqual(product.price, Decimal('12.30'))
+        self.assertTrue(product.is_new)
+    
+    def test_commands_round_trip_through_a_file(self):
+        """Test export_catalog output feeds import_catalog"""
+        Product.objects.create(name='Lily', description='d', price=10, category=self.category)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'products.jsonl')
+        call_command('export_catalog', 'product', output=path, stdout=StringIO())
+        out = StringIO()
+        call_command('import_catalog', 'product', path, stdout=out)
+        self.assertIn('0 created, 1 updated, 0 skipped', out.getvalue())
+    
+    def test_api_requires_staff_and_streams(self):
+        """Test the staff endpoint imports uploads and streams exports"""
+        url = '/api/catalog/product.csv'
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        staff = User.objects.create_user(username='staff', password='pass', is_staff=True)
+        self.client.force_authenticate(staff)
+        upload = SimpleUploadedFile('products.csv', b'name,description,price,category\nIris,Powdery,20,Floral\n')
+        response = self.client.post(url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['slug', 'name', 'description'])
+        self.assertTrue(lines[1].startswith('iris,Iris,Powdery'))
+        self.assertEqual(self.client.get('/api/catalog/product.xml').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ImageDerivativeTest(APITestCase):
+    """Test responsive image derivatives"""
+    
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.settings_override = override_settings(
+            MEDIA_ROOT=media.name, IMAGE_DERIVATIVE_WIDTHS=[320, 640], IMAGE_DERIVATIVE_FORMATS=['webp']
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.media_root = media.name
+        self.category = Category.objects.create(name='Floral')
+        self.product = Product.objects.create(name='Rose', description='d', price=10, category=self.category)
+    
+    def upload(self, name='rose.png', size=(800, 600), mode='RGB'):
+        buffer = BytesIO()
+        Image.new(mode, size, 'red').save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+    
+    def test_upload_generates_derivatives(self):
+        """Test saving an upload records resized WebP copies and their sizes"""
+        image = ProductImage.objects.create(product=self.product, image_file=self.upload(), is_primary=True)
+        image.refresh_from_db()
+        variants = image.image_variants
+        self.assertEqual(variants['source'], image.image_file.name)
+        self.assertEqual((variants['width'], variants['height']), (800, 600))
+        self.assertEqual(
+            [(entry['width'], entry['height']) for entry in variants['formats']['webp']],
+            [(320, 240), (640, 480)]
+        )
+        for entry in variants['formats']['webp']:
+            with Image.open(os.path.join(self.media_root, entry['name'])) as derivative:
+                self.assertEqual((derivative.format, derivative.width), ('WEBP', entry['width']))
+    
+    def test_small_images_are_not_upscaled(self):
+        """Test an image narrower than every width is stored once at its own size"""
+        image = ProductImage.objects.create(product=self.product, image_file=self.upload(size=(200, 100), mode='P'))
+        image.refresh_from_db()
+        self.assertEqual(
+            [(entry['width'], entry['height']) for entry in image.image_variants['formats']['webp']],
+            [(200, 100)]
+        )
+    
+    def test_serializers_expose_srcset(self):
+        """Test list and detail responses carry srcset strings"""
+        image = ProductImage.objects.create(product=self.product, image_file=self.upload(), is_primary=True)
+        image.refresh_from_db()
+        expected = srcset(image.image_variants)
+        self.assertRegex(expected['webp'], r'^/media/derivatives/products/rose\S*-320w\.webp 320w, \S+ 640w$')
+        
+        response = self.client.get('/api/products/')
+        self.assertEqual(response.data['results'][0]['primary_image_srcset'], expected)
+        response = self.client.get(f'/api/products/{self.product.slug}/')
+        self.assertEqual(response.data['images'][0]['srcset'], expected)
+        self.assertIsNone(response.data['category']['image_srcset'])
+    
+    def test_replacing_and_deleting_cleans_up_derivatives(self):
+        """Test old derivative files are removed with the image they came from"""
+        image = ProductImage.objects.create(product=self.product, image_file=self.upload())
+        old_names = [entry['name'] for entry in image.image_variants['formats']['webp']]
+        image.image_file = self.upload('tulip.png')
+        image.save()
+        for name in old_names:
+            self.assertFalse(os.path.exists(os.path.join(self.media_root, name)))
+        new_names = [entry['name'] for entry in image.image_variants['formats']['webp']]
+        image.delete()
+        for name in new_names:
+            self.assertFalse(os.path.exists(os.path.join(self.media_root, name)))
+    
+    def test_broken_upload_is_recorded_not_raised(self):
+        """Test an unreadable image saves and records the failure"""
+        broken = SimpleUploadedFile('broken.png', b'not an image', content_type='image/png')
+        with self.assertLogs('config.images', 'WARNING'):
+            image = ProductImage.objects.create(product=self.product, image_file=broken)
+        self.assertIn('error', image.image_variants)
+        self.assertIsNone(srcset(image.image_variants))
+    
+    def test_backfill_command(self):
+        """Test the backfill processes only stale images"""
+        self.category.image_file = self.upload('floral.png')
+        self.category.save()
+        Category.objects.filter(pk=self.category.pk).update(image_variants={})
+        out = StringIO()
+        call_command('generate_image_derivatives', workers=1, stdout=out)
+        self.assertIn('products.Category.image_file: 1 images (0 failed)', out.getvalue())
+        self.category.refresh_from_db()
+        self.assertEqual(len(self.category.image_variants['formats']['webp']), 2)
+        
+        out = StringIO()
+        call_command('generate_image_derivatives', workers=1, stdout=out)
+        self.assertIn('Processed 0 images', out.getvalue())
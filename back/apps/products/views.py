@@ -3,6 +3,11 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
 from .models import Category, Product
+from .search import search_products
+from config.response_cache import CachedResponseMixin
+from config.conditional import ConditionalGetMixin
+from config.pagination import CursorOptInPagination
+from config.projection import FieldProjectionMixin
 from .serializers import (
     CategorySerializer, 
     ProductListSerializer, 
@@ -11,26 +16,33 @@ from .serializers import (
 )
 
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing categories.
     List and retrieve only (no create/update/delete).
+    Responses are served from the versioned response cache.
     """
+    cache_models = [Category]
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = 'slug'
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(FieldProjectionMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing products.
     - List: Public access with filtering, search, and sorting
+    - List: ?cursor= switches to keyset pagination (no COUNT, stable deep pages)
+    - List: ?fields=/?omit= return (and load) only some fields
     - Retrieve: Public access
+    - List sends an ETag, Retrieve ETag/Last-Modified; both answer 304 when unchanged
     - Create/Update/Delete: Admin only
     """
-    queryset = Product.objects.select_related('category').prefetch_related('images', 'reviews')
+    # search_vector is only read by the database when filtering ?search=
+    queryset = Product.objects.defer('search_vector').select_related('category').prefetch_related('images')
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'slug'
+    pagination_class = CursorOptInPagination
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -52,7 +64,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         - category (slug or id)
         - min_price and max_price
         - featured (boolean)
-        - search (name or description)
+        - search (name, description, scent notes or category name)
         - sort_by (price, -price, name, -name, created_at, -created_at)
         """
         queryset = super().get_queryset()
@@ -79,12 +91,10 @@ class ProductViewSet(viewsets.ModelViewSet):
         if featured and featured.lower() in ['true', '1', 'yes']:
             queryset = queryset.filter(Q(is_featured=True) | Q(is_best_seller=True))
         
-        # Search filter
+        # Full-text search (ranked by relevance unless sort_by is given)
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(description__icontains=search)
-            )
+            queryset = search_products(queryset, search)
         
         # Sorting
         sort_by = self.request.query_params.get('sort_by')
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from apps.products.models import Product
 
 
@@ -21,3 +23,19 @@ class Review(models.Model):
     
     def __str__(self):
         return f"{self.reviewer_name} - {self.product.name} ({self.rating}/5)"
+
+
+@receiver(post_save, sender=Review)
+def update_product_rating_on_save(sender, instance, created, **kwargs):
+    """Keep the product's stored rating aggregates current"""
+    if created:
+        instance.product.adjust_rating(instance.rating, 1)
+    else:
+        # Rating may have been edited; recompute for this product only
+        instance.product.refresh_rating()
+
+
+@receiver(post_delete, sender=Review)
+def update_product_rating_on_delete(sender, instance, **kwargs):
+    """Remove a deleted review's rating from the product aggregates"""
+    Product(pk=instance.product_id).adjust_rating(-instance.rating, -1)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from django.db import transaction
 from .models import Review
 
 
@@ -27,9 +28,10 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
         product = self.context.get('product')
         user = self.context.get('request').user if self.context.get('request').user.is_authenticated else None
         
-        review = Review.objects.create(
-            product=product,
-            user=user,
-            **validated_data
-        )
+        with transaction.atomic():
+            review = Review.objects.create(
+                product=product,
+                user=user,
+                **validated_data
+            )
         return review
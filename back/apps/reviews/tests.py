@@ -1,8 +1,12 @@
+from importlib import import_module
+from django.apps import apps
 from django.test import TestCase
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
+from django.db import connection
 from django.db.models import Avg
+from django.test.utils import CaptureQueriesContext
 from apps.products.models import Category, Product
 from .models import Review
 
@@ -43,6 +47,24 @@ class ReviewModelTest(TestCase):
             review.full_clean()
 
 
+    def test_migration_backfills_aggregates(self):
+        """Test reviews written before the aggregate columns are counted after migrating"""
+        for rating in (5, 4, 4):
+            Review.objects.create(product=self.product, reviewer_name='Early', rating=rating, comment='Test')
+        # As left by 0011: columns added with their defaults
+        Product.objects.update(rating_sum=0, rating_count=0, average_rating=0)
+        
+        import_module('apps.products.migrations.0015_backfill_rating_aggregates').backfill(apps, None)
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.rating_sum, self.product.rating_count), (13, 3))
+        self.assertEqual(self.product.average_rating, 4.3)
+        
+        # Deleting a pre-existing review no longer drives the count below zero
+        Review.objects.filter(product=self.product).first().delete()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.rating_count, 2)
+
+
 class ReviewAPITest(APITestCase):
     """Test Review API endpoints"""
     
@@ -155,3 +177,41 @@ class ReviewAPITest(APITestCase):
         response = self.client.get(f'/api/products/{self.product.slug}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['average_rating'], 4.0)
+    
+    def test_rating_aggregates_follow_create_and_delete(self):
+        """Test stored rating aggregates are kept current by the API"""
+        for rating in (5, 4):
+            self.client.post(f'/api/products/{self.product.id}/reviews/', {
+                'reviewer_name': 'User',
+                'rating': rating,
+                'comment': 'Nice'
+            })
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.rating_count, 2)
+        self.assertEqual(self.product.rating_sum, 9)
+        self.assertEqual(self.product.average_rating, 4.5)
+        
+        self.client.force_authenticate(user=self.admin_user)
+        review = Review.objects.filter(product=self.product, rating=5).first()
+        self.client.delete(f'/api/reviews/{review.id}/')
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.rating_count, 1)
+        self.assertEqual(self.product.average_rating, 4.0)
+    
+    def test_product_detail_does_not_scan_reviews(self):
+        """Test product detail query count does not grow with reviews"""
+        url = f'/api/products/{self.product.slug}/'
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(url)
+        
+        for i in range(10):
+            Review.objects.create(
+                product=self.product,
+                reviewer_name=f'User {i}',
+                rating=4,
+                comment='Good'
+            )
+        with self.assertNumQueries(len(baseline)):
+            response = self.client.get(url)
+        self.assertEqual(response.data['review_count'], 10)
+        self.assertEqual(response.data['average_rating'], 4.0)
@@ -2,6 +2,7 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser, AllowAny
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from .models import Review
 from apps.products.models import Product
 from .serializers import ReviewSerializer, ReviewCreateSerializer
@@ -27,7 +28,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         product_id = self.kwargs.get('product_id')
         if product_id:
             return Review.objects.filter(product_id=product_id)
-        return Review.objects.all()
+        return Review.objects.select_related('product')
     
     def get_serializer_class(self):
         """Use create serializer for create action"""
@@ -50,3 +51,8 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return Response(review_serializer.data, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    def perform_destroy(self, instance):
+        """Delete the review and its product rating adjustment together"""
+        with transaction.atomic():
+            instance.delete()
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['title', 'kind', 'object_id', 'price', 'is_active', 'updated_at']
+    list_filter = ['kind', 'is_active']
+    search_fields = ['title', 'subtitle']
+    readonly_fields = ['updated_at']
@@ -0,0 +1,276 @@
+"""
+Shared search index across Product, DupeProduct, AirAmbience and PerfumeOil.
+
+Every catalog item is mirrored into one SearchDocument row, kept current by
+save/delete signals. Queries hit that single table:
+- PostgreSQL: weighted tsvector (GIN) plus pg_trgm similarity on the title
+  (GIN gin_trgm_ops). Both filters are indexable operators (@@ and %);
+  TrigramSimilarity only ranks.
+- SQLite: an FTS5 virtual table over title/subtitle/body, ranked with bm25.
+"""
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_save, post_delete
+from apps.products.search import fts_match_expression
+from .models import SearchDocument
+
+FTS_TABLE = 'search_searchdocument_fts'
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+def _join(*parts):
+    return '\n'.join(part for part in parts if part)
+
+
+def _product_document(product):
+    return {
+        'title': product.name,
+        'subtitle': product.category.name if product.category_id else '',
+        'slug': product.slug,
+        'price': product.price,
+        'image': product.primary_image or '',
+        'body': _join(product.description, product.scent_notes),
+        'is_active': True,
+    }
+
+
+def _dupe_document(dupe):
+    return {
+        'title': dupe.name,
+        'subtitle': f"{dupe.designer_brand} {dupe.designer_fragrance}",
+        'slug': dupe.slug,
+        'price': dupe.price,
+        'image': dupe.url,
+        'body': _join(dupe.description, dupe.scent_notes),
+        'is_active': dupe.is_active,
+    }
+
+
+def _air_ambience_document(item):
+    return {
+        'title': item.name,
+        'subtitle': item.get_product_type_display(),
+        'slug': item.slug,
+        'price': item.price,
+        'image': item.url,
+        'body': _join(item.description, item.scent_notes, item.features),
+        'is_active': item.is_active,
+    }
+
+
+def _perfume_oil_document(oil):
+    return {
+        'title': oil.name,
+        'subtitle': ' · '.join(part for part in [oil.get_concentration_display(), oil.scent_family] if part),
+        'slug': oil.slug,
+        'price': oil.price,
+        'image': oil.url,
+        'body': _join(oil.description, ', '.join(oil.get_all_notes())),
+        'is_active': oil.is_active,
+    }
+
+
+# kind -> (model label, document builder, related lookups for bulk loads)
+SOURCES = {
+    'product': ('products.Product', _product_document, {
+        'select_related': ['category'], 'prefetch_related': ['images'],
+    }),
+    'dupe': ('content.DupeProduct', _dupe_document, {}),
+    'air_ambience': ('content.AirAmbience', _air_ambience_document, {}),
+    'perfume_oil': ('content.PerfumeOil', _perfume_oil_document, {}),
+}
+
+
+def _source_queryset(kind):
+    label, _, related = SOURCES[kind]
+    queryset = apps.get_model(label).objects.all()
+    if related.get('select_related'):
+        queryset = queryset.select_related(*related['select_related'])
+    if related.get('prefetch_related'):
+        queryset = queryset.prefetch_related(*related['prefetch_related'])
+    return queryset
+
+
+def _refresh_search_text(document_ids=None):
+    """Recompute the database-side search structures for the given documents"""
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+
+        documents = SearchDocument.objects.all()
+        if document_ids is not None:
+            documents = documents.filter(pk__in=document_ids)
+        documents.update(search_vector=(
+            SearchVector('title', weight='A')
+            + SearchVector('subtitle', weight='B')
+            + SearchVector('body', weight='C')
+        ))
+    elif vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            if document_ids is None:
+                cursor.execute(f'DELETE FROM {FTS_TABLE}')
+                cursor.execute(
+                    f'INSERT INTO {FTS_TABLE} (rowid, title, subtitle, body) '
+                    f'SELECT id, title, subtitle, body FROM search_searchdocument'
+                )
+                return
+            params = [(pk,) for pk in document_ids]
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', params)
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, subtitle, body) '
+                f'SELECT id, title, subtitle, body FROM search_searchdocument WHERE id = %s',
+                params
+            )
+
+
+def index_object(kind, instance):
+    """Create or update the search document for one catalog item"""
+    _, build, _ = SOURCES[kind]
+    document, _ = SearchDocument.objects.update_or_create(
+        kind=kind, object_id=instance.pk, defaults=build(instance)
+    )
+    _refresh_search_text([document.pk])
+    return document
+
+
+def index_objects(kind, object_ids, batch_size=1000):
+    """Upsert the documents for many catalog items (bulk writes skip the save signals)"""
+    _, build, _ = SOURCES[kind]
+    documents = [
+        SearchDocument(kind=kind, object_id=obj.pk, **build(obj))
+        for obj in _source_queryset(kind).filter(pk__in=object_ids)
+    ]
+    if not documents:
+        return 0
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['title', 'subtitle', 'slug', 'price', 'image', 'body', 'is_active', 'updated_at'],
+    )
+    _refresh_search_text(list(
+        SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).values_list('pk', flat=True)
+    ))
+    return len(documents)
+
+
+def remove_object(kind, object_id):
+    """Drop a deleted catalog item from the index"""
+    ids = list(SearchDocument.objects.filter(kind=kind, object_id=object_id).values_list('pk', flat=True))
+    if not ids:
+        return
+    SearchDocument.objects.filter(pk__in=ids).delete()
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in ids])
+
+
+def rebuild(batch_size=1000):
+    """Rebuild every search document; returns {kind: count}"""
+    counts = {}
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for kind, (_, build, _) in SOURCES.items():
+            documents = [
+                SearchDocument(kind=kind, object_id=obj.pk, **build(obj))
+                for obj in _source_queryset(kind).iterator(chunk_size=batch_size)
+            ]
+            SearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+            counts[kind] = len(documents)
+        _refresh_search_text()
+    return counts
+
+
+def search(query, kinds=None, limit=DEFAULT_LIMIT):
+    """
+    Return up to `limit` active SearchDocuments matching `query`, best
+    first, each with a `score` attribute (higher is more relevant).
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    vendor = connection.vendor
+
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+
+        search_query = SearchQuery(query, search_type='websearch')
+        documents = SearchDocument.objects.filter(is_active=True)
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        return list(documents.filter(
+            Q(search_vector=search_query) | Q(title__trigram_similar=query)
+        ).annotate(
+            score=SearchRank(F('search_vector'), search_query) + TrigramSimilarity('title', query),
+        ).order_by('-score')[:limit])
+
+    if vendor == 'sqlite':
+        match = fts_match_expression(query)
+        if not match:
+            return []
+        kind_filter = ''
+        params = [match]
+        if kinds:
+            kind_filter = f"AND d.kind IN ({', '.join(['%s'] * len(kinds))})"
+            params.extend(kinds)
+        params.append(limit)
+        # bm25 is lower-is-better; negate so score is higher-is-better
+        return list(SearchDocument.objects.raw(
+            f'SELECT d.*, -bm25({FTS_TABLE}, 10.0, 4.0, 1.0) AS score '
+            f'FROM {FTS_TABLE} JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND d.is_active {kind_filter} '
+            f'ORDER BY score DESC LIMIT %s',
+            params
+        ))
+
+    documents = SearchDocument.objects.filter(is_active=True).filter(
+        Q(title__icontains=query) | Q(subtitle__icontains=query) | Q(body__icontains=query)
+    )
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    documents = list(documents[:limit])
+    for document in documents:
+        document.score = 1.0
+    return documents
+
+
+def _connect_source(kind, model):
+    def on_save(sender, instance, **kwargs):
+        index_object(kind, instance)
+
+    def on_delete(sender, instance, **kwargs):
+        remove_object(kind, instance.pk)
+
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'search_index_{kind}')
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'search_unindex_{kind}')
+
+
+def connect_signals():
+    """Wire catalog model signals to the index (called from AppConfig.ready)"""
+    for kind, (label, _, _) in SOURCES.items():
+        _connect_source(kind, apps.get_model(label))
+
+    Product = apps.get_model('products.Product')
+    ProductImage = apps.get_model('products.ProductImage')
+    Category = apps.get_model('products.Category')
+
+    # The product document carries its primary image and category name
+    def on_image_change(sender, instance, **kwargs):
+        product = Product.objects.filter(pk=instance.product_id).prefetch_related('images').first()
+        if product:
+            index_object('product', product)
+
+    def on_category_save(sender, instance, created, **kwargs):
+        if not created:
+            documents = SearchDocument.objects.filter(
+                kind='product', object_id__in=instance.products.values('pk')
+            )
+            ids = list(documents.values_list('pk', flat=True))
+            documents.update(subtitle=instance.name)
+            _refresh_search_text(ids)
+
+    post_save.connect(on_image_change, sender=ProductImage, weak=False, dispatch_uid='search_product_image_save')
+    post_delete.connect(on_image_change, sender=ProductImage, weak=False, dispatch_uid='search_product_image_delete')
+    post_save.connect(on_category_save, sender=Category, weak=False, dispatch_uid='search_category_save')
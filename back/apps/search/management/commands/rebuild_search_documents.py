@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from apps.search.index import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the unified cross-catalog search index from the source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows to load and insert per batch (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild(batch_size=options['batch_size'])
+        for kind, count in counts.items():
+            self.stdout.write(f'  - {kind}: {count} documents')
+        self.stdout.write(self.style.SUCCESS(f'Indexed {sum(counts.values())} documents'))
@@ -0,0 +1,70 @@
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS search_document_vector_gin '
+    'ON search_searchdocument USING GIN (search_vector)',
+    'CREATE INDEX IF NOT EXISTS search_document_title_trgm '
+    'ON search_searchdocument USING GIN (title gin_trgm_ops)',
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS search_document_title_trgm',
+    'DROP INDEX IF EXISTS search_document_vector_gin',
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_searchdocument_fts USING fts5("
+    "title, subtitle, body, tokenize='unicode61 remove_diacritics 2')",
+]
+
+SQLITE_REVERSE = [
+    'DROP TABLE IF EXISTS search_searchdocument_fts',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0012_product_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('product', 'Product'), ('dupe', 'Dupe Product'), ('air_ambience', 'Air Ambience'), ('perfume_oil', 'Perfume Oil')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('subtitle', models.CharField(blank=True, max_length=300)),
+                ('slug', models.SlugField(blank=True, max_length=200)),
+                ('price', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('image', models.CharField(blank=True, max_length=500)),
+                ('body', models.TextField(blank=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        # Existing catalog rows are indexed by 0002_backfill_search_documents
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,127 @@
+from django.db import migrations
+
+FTS_TABLE = 'search_searchdocument_fts'
+
+
+def _join(*parts):
+    return '\n'.join(part for part in parts if part)
+
+
+def _image_url(item, placeholder):
+    if item.image_file:
+        return item.image_file.url
+    return item.image_url or placeholder
+
+
+def _notes(oil):
+    notes = []
+    for field in (oil.top_notes, oil.middle_notes, oil.base_notes):
+        if field:
+            notes.extend(note.strip() for note in field.split(','))
+    return notes
+
+
+# Mirrors the builders in apps.search.index, against the models as of this migration
+
+def _product_document(product):
+    images = list(product.images.all())
+    primary = next((image for image in images if image.is_primary), images[0] if images else None)
+    return {
+        'title': product.name,
+        'subtitle': product.category.name if product.category_id else '',
+        'slug': product.slug,
+        'price': product.price,
+        'image': _image_url(primary, 'https://via.placeholder.com/300x300?text=No+Image') if primary else '',
+        'body': _join(product.description, product.scent_notes),
+        'is_active': True,
+    }
+
+
+def _dupe_document(dupe):
+    return {
+        'title': dupe.name,
+        'subtitle': f"{dupe.designer_brand} {dupe.designer_fragrance}",
+        'slug': dupe.slug,
+        'price': dupe.price,
+        'image': _image_url(dupe, 'https://via.placeholder.com/300x300?text=Dupe+Product'),
+        'body': _join(dupe.description, dupe.scent_notes),
+        'is_active': dupe.is_active,
+    }
+
+
+def _air_ambience_document(item):
+    return {
+        'title': item.name,
+        'subtitle': item.get_product_type_display(),
+        'slug': item.slug,
+        'price': item.price,
+        'image': _image_url(item, 'https://via.placeholder.com/300x300?text=Air+Ambience'),
+        'body': _join(item.description, item.scent_notes, item.features),
+        'is_active': item.is_active,
+    }
+
+
+def _perfume_oil_document(oil):
+    return {
+        'title': oil.name,
+        'subtitle': ' · '.join(part for part in [oil.get_concentration_display(), oil.scent_family] if part),
+        'slug': oil.slug,
+        'price': oil.price,
+        'image': _image_url(oil, 'https://via.placeholder.com/300x300?text=Perfume+Oil'),
+        'body': _join(oil.description, ', '.join(_notes(oil))),
+        'is_active': oil.is_active,
+    }
+
+
+SOURCES = [
+    ('product', 'products', 'Product', _product_document),
+    ('dupe', 'content', 'DupeProduct', _dupe_document),
+    ('air_ambience', 'content', 'AirAmbience', _air_ambience_document),
+    ('perfume_oil', 'content', 'PerfumeOil', _perfume_oil_document),
+]
+
+
+def backfill(apps, schema_editor):
+    """Index the existing catalog so /api/search/ has results right after deploy"""
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    connection = schema_editor.connection
+
+    SearchDocument.objects.all().delete()
+    for kind, app_label, model_name, build in SOURCES:
+        queryset = apps.get_model(app_label, model_name).objects.all()
+        if kind == 'product':
+            queryset = queryset.select_related('category').prefetch_related('images')
+        SearchDocument.objects.bulk_create(
+            [SearchDocument(kind=kind, object_id=obj.pk, **build(obj)) for obj in queryset.iterator(chunk_size=1000)],
+            batch_size=1000,
+        )
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+
+        SearchDocument.objects.update(search_vector=(
+            SearchVector('title', weight='A')
+            + SearchVector('subtitle', weight='B')
+            + SearchVector('body', weight='C')
+        ))
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, subtitle, body) '
+                f'SELECT id, title, subtitle, body FROM search_searchdocument'
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('products', '0014_image_variants'),
+        ('content', '0010_image_variants'),
+    ]
+
+    operations = [
+        # Search documents are rebuilt from source, so there is nothing to undo
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS search_document_title_trgm '
+    'ON search_searchdocument USING GIN (title gin_trgm_ops)',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_backfill_search_documents'),
+    ]
+
+    operations = [
+        # Records the title trigram index in the model state. 0001 already created
+        # it on PostgreSQL; other databases have no gin_trgm_ops and skip it
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='searchdocument',
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        fields=['title'], name='search_document_title_trgm', opclasses=['gin_trgm_ops']
+                    ),
+                ),
+            ],
+            database_operations=[
+                # Reversing leaves the index to 0001, which owns it
+                migrations.RunPython(_run({'postgresql': POSTGRES_FORWARD}), migrations.RunPython.noop),
+            ],
+        ),
+    ]
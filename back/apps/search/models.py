@@ -0,0 +1,40 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """Denormalized, searchable copy of a catalog item (one row per item)"""
+    KIND_CHOICES = [
+        ('product', 'Product'),
+        ('dupe', 'Dupe Product'),
+        ('air_ambience', 'Air Ambience'),
+        ('perfume_oil', 'Perfume Oil'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    
+    # Display fields returned with results (no join back to the source table)
+    title = models.CharField(max_length=200)
+    subtitle = models.CharField(max_length=300, blank=True)
+    slug = models.SlugField(max_length=200, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    image = models.CharField(max_length=500, blank=True)
+    
+    # Searchable text
+    body = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        indexes = [
+            # Serves title__trigram_similar; created by raw SQL in 0001 on PostgreSQL only
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='search_document_title_trgm'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from .models import SearchDocument
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    """Typed search hit; `id`/`slug` identify the item within its type"""
+    type = serializers.CharField(source='kind', read_only=True)
+    id = serializers.IntegerField(source='object_id', read_only=True)
+    name = serializers.CharField(source='title', read_only=True)
+    score = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = SearchDocument
+        fields = ['type', 'id', 'slug', 'name', 'subtitle', 'price', 'image', 'score']
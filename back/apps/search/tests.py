@@ -0,0 +1,113 @@
+from importlib import import_module
+from types import SimpleNamespace
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from rest_framework.test import APITestCase
+from rest_framework import status
+from apps.products.models import Category, Product, ProductImage
+from apps.content.models import DupeProduct, AirAmbience, PerfumeOil
+from .index import rebuild
+from .models import SearchDocument
+
+
+class UnifiedSearchAPITest(APITestCase):
+    """Test the cross-catalog /api/search/ endpoint"""
+    
+    def setUp(self):
+        self.category = Category.objects.create(name='Floral')
+        self.product = Product.objects.create(
+            name='Rose Perfume',
+            description='Beautiful rose scent',
+            price=89.00,
+            category=self.category,
+            stock_quantity=50
+        )
+        ProductImage.objects.create(
+            product=self.product, image_url='https://example.com/rose.jpg', is_primary=True
+        )
+        self.dupe = DupeProduct.objects.create(
+            name='Rose Noir',
+            description='Inspired by a classic',
+            price=45.00,
+            designer_brand='Chanel',
+            designer_fragrance='Coco Mademoiselle',
+            designer_price=180.00,
+            scent_notes='Rose, patchouli'
+        )
+        self.candle = AirAmbience.objects.create(
+            name='Cedar Candle',
+            description='Warm cedar glow',
+            price=30.00,
+            product_type='candle'
+        )
+        self.oil = PerfumeOil.objects.create(
+            name='Amber Oil',
+            description='Rich amber',
+            price=25.00,
+            top_notes='Rose',
+            base_notes='Amber'
+        )
+    
+    def test_search_returns_typed_results_across_catalogs(self):
+        """Test one request returns matches from every catalog, name matches first"""
+        response = self.client.get('/api/search/?q=rose')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        types = [result['type'] for result in response.data['results']]
+        self.assertEqual(sorted(types), ['dupe', 'perfume_oil', 'product'])
+        # Title matches outrank a note buried in the body
+        self.assertEqual(response.data['results'][-1]['type'], 'perfume_oil')
+        
+        product_hit = next(r for r in response.data['results'] if r['type'] == 'product')
+        self.assertEqual(product_hit['id'], self.product.id)
+        self.assertEqual(product_hit['slug'], self.product.slug)
+        self.assertEqual(product_hit['image'], 'https://example.com/rose.jpg')
+    
+    def test_search_single_query(self):
+        """Test the endpoint answers with one indexed lookup"""
+        with self.assertNumQueries(1):
+            self.client.get('/api/search/?q=rose')
+    
+    def test_filter_by_type(self):
+        """Test restricting results to specific types"""
+        response = self.client.get('/api/search/?q=rose&type=dupe')
+        self.assertEqual([r['type'] for r in response.data['results']], ['dupe'])
+        
+        response = self.client.get('/api/search/?q=rose&type=shoes')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_index_follows_source_changes(self):
+        """Test deactivated or deleted items drop out of results"""
+        self.dupe.is_active = False
+        self.dupe.save()
+        self.candle.delete()
+        
+        response = self.client.get('/api/search/?q=rose&type=dupe')
+        self.assertEqual(response.data['count'], 0)
+        response = self.client.get('/api/search/?q=cedar')
+        self.assertEqual(response.data['count'], 0)
+        self.assertFalse(SearchDocument.objects.filter(kind='air_ambience').exists())
+    
+    def test_rebuild(self):
+        """Test rebuilding the index from the source tables"""
+        SearchDocument.objects.all().delete()
+        counts = rebuild()
+        self.assertEqual(counts, {'product': 1, 'dupe': 1, 'air_ambience': 1, 'perfume_oil': 1})
+        response = self.client.get('/api/search/?q=cedar')
+        self.assertEqual(response.data['results'][0]['name'], 'Cedar Candle')
+    
+    def test_migration_backfills_documents(self):
+        """Test the backfill migration indexes catalog rows that predate the index"""
+        SearchDocument.objects.all().delete()
+        migration = import_module('apps.search.migrations.0002_backfill_search_documents')
+        # Run against the historical models, as `migrate` does
+        state = MigrationExecutor(connection).loader.project_state(('search', '0002_backfill_search_documents'))
+        migration.backfill(state.apps, SimpleNamespace(connection=connection))
+        self.assertEqual(SearchDocument.objects.count(), 4)
+        response = self.client.get('/api/search/?q=rose')
+        self.assertEqual(response.data['count'], 3)
+        
+        # Same documents as the live builders produce
+        fields = ['kind', 'object_id', 'title', 'subtitle', 'slug', 'price', 'image', 'body', 'is_active']
+        backfilled = list(SearchDocument.objects.order_by('kind', 'object_id').values(*fields))
+        rebuild()
+        self.assertEqual(list(SearchDocument.objects.order_by('kind', 'object_id').values(*fields)), backfilled)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import UnifiedSearchView
+
+urlpatterns = [
+    path('search/', UnifiedSearchView.as_view(), name='unified-search'),
+]
@@ -0,0 +1,48 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import AllowAny
+from rest_framework import status
+from .index import search, DEFAULT_LIMIT
+from .models import SearchDocument
+from .serializers import SearchResultSerializer
+
+
+class UnifiedSearchView(APIView):
+    """
+    Search every catalog (products, dupes, air ambience, perfume oils) in one
+    round trip.
+    - q (or search): the search text
+    - type: optional comma-separated kinds to restrict results to
+    - limit: maximum number of results (default 20, max 50)
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        query = (request.query_params.get('q') or request.query_params.get('search') or '').strip()
+        if not query:
+            return Response({'query': '', 'count': 0, 'results': []})
+        
+        kinds = None
+        requested_types = request.query_params.get('type')
+        if requested_types:
+            valid_kinds = dict(SearchDocument.KIND_CHOICES)
+            kinds = [kind.strip() for kind in requested_types.split(',') if kind.strip()]
+            unknown = [kind for kind in kinds if kind not in valid_kinds]
+            if unknown:
+                return Response(
+                    {'error': f"Unknown type(s): {', '.join(unknown)}. "
+                              f"Valid types: {', '.join(valid_kinds)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        
+        results = search(query, kinds=kinds, limit=limit)
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': SearchResultSerializer(results, many=True).data,
+        })
@@ -0,0 +1,37 @@
+"""
+pytest setup for the API benchmarks: `pytest benchmarks/` from back/.
+
+BENCH_SCALE (1k, 10k, 100k or a number), BENCH_ITERATIONS and BENCH_OUTPUT
+(path for the JSON report) configure the run; BENCH_BUDGETS overrides the
+budget file.
+"""
+import json
+import os
+import django
+import pytest
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from config.benchmark import (  # noqa: E402  (needs django.setup())
+    DEFAULT_BUDGETS_PATH, isolated_database, load_budgets, parse_scale, run_benchmarks, seed_catalog
+)
+
+
+@pytest.fixture(scope='session')
+def benchmark_report():
+    """Seed once per session and measure every endpoint"""
+    count = parse_scale(os.environ.get('BENCH_SCALE', '1k'))
+    with isolated_database():
+        context = seed_catalog(count)
+        report = run_benchmarks(context, iterations=int(os.environ.get('BENCH_ITERATIONS', 5)), scale=count)
+    output = os.environ.get('BENCH_OUTPUT')
+    if output:
+        with open(output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    return report
+
+
+@pytest.fixture(scope='session')
+def budgets():
+    return load_budgets(os.environ.get('BENCH_BUDGETS', DEFAULT_BUDGETS_PATH))
@@ -0,0 +1,15 @@
+from config.benchmark import check_budgets
+
+
+def test_every_endpoint_measured(benchmark_report):
+    """Every router GET route (and the variants) produced a measurement"""
+    endpoints = benchmark_report['endpoints']
+    assert 'product-list' in endpoints
+    assert 'cart-list' in endpoints
+    assert all(result['status'] < 500 for result in endpoints.values())
+
+
+def test_within_budgets(benchmark_report, budgets):
+    """No endpoint exceeds its query, latency or size budget"""
+    violations = check_budgets(benchmark_report, budgets)
+    assert not violations, '\n'.join(violations)
@@ -0,0 +1,326 @@
+"""
+API benchmark harness.
+
+Seeds a synthetic catalog (products, reviews and carts at 1k/10k/100k scale,
+in the populate_database data shapes), requests every GET route of the API
+routers with the DRF test client, and records per endpoint:
+- queries: the most SQL queries any one request ran (the N+1 guard),
+- p50_ms / p95_ms: request latency percentiles,
+- bytes: response body size.
+
+Caches are cleared before every request, so each measurement is the
+uncached path. check_budgets() compares a report with the budgets in
+benchmark_budgets.json ("default" limits, overridden per endpoint).
+
+Entry points: `manage.py benchmark_api` and `pytest benchmarks/`, both of
+which run in a throwaway test database (isolated_database()).
+"""
+import json
+import math
+import random
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from urllib.parse import urlencode
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework.test import APIClient
+from apps.blog.models import BlogPost
+from apps.content.models import (
+    FAQ, Testimonial, GalleryImage, ShippingInfo, ReturnPolicy,
+    TermsAndConditions, PrivacyPolicy, GiftCard, DupeProduct, AirAmbience, PerfumeOil
+)
+from apps.orders.models import Cart, CartItem, Order, OrderItem
+from apps.products.management.commands.populate_database import CATEGORIES, PRODUCTS
+from apps.products.models import Category, Product, ProductImage
+from apps.reviews.models import Review
+
+SCALES = {'1k': 1000, '10k': 10000, '100k': 100000}
+
+DEFAULT_BUDGETS_PATH = Path(__file__).with_name('benchmark_budgets.json')
+
+BUDGET_METRICS = ('queries', 'p50_ms', 'p95_ms', 'bytes')
+
+# Filtered/sorted variants of routes worth measuring on their own
+VARIANTS = [
+    ('product-list', {'search': 'oud'}),
+    ('product-list', {'sort_by': 'price-high'}),
+    ('product-list', {'featured': 'true'}),
+    ('product-list', {'cursor': ''}),
+    ('product-list', {'fields': 'id,name,price,primary_image'}),
+    ('dupe-list', {'brand': 'Chanel'}),
+    ('unified-search', {'q': 'rose'}),
+]
+
+# Diagnostic route that dumps every cart: its cost grows with the table by design
+SKIPPED_ROUTES = {'cart-debug'}
+
+SEED_USERNAME = 'benchmark'
+
+
+def parse_scale(value):
+    """Row count for a scale name (1k, 10k, 100k) or a plain number"""
+    value = str(value).lower()
+    if value in SCALES:
+        return SCALES[value]
+    count = int(value)
+    if count < 1:
+        raise ValueError('Scale must be positive')
+    return count
+
+
+@contextmanager
+def isolated_database(verbosity=0):
+    """Run the block against a freshly created test database, destroyed afterwards"""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def seed_catalog(count, batch_size=1000):
+    """
+    Bulk-create `count` products, reviews and guest carts, plus content,
+    blog posts and a user with a cart and orders. Returns the seeded user
+    and the URL kwargs for routes that cannot be sampled from a queryset.
+    """
+    rng = random.Random(count)
+    minor = max(10, count // 10)
+
+    categories = {}
+    for data in CATEGORIES:
+        categories[data['name']] = Category.objects.create(name=data['name'], description=data['description'])
+
+    products, images = [], []
+    for index in range(count):
+        shape = PRODUCTS[index % len(PRODUCTS)]
+        products.append(Product(
+            name=f"{shape['name']} {index}",
+            slug=f"{slugify(shape['name'])}-{index}",
+            description=shape['description'],
+            price=Decimal(str(shape['price'])),
+            category=categories[shape['category']],
+            product_type=shape['product_type'],
+            scent_family=shape['scent_family'],
+            scent_notes=shape['scent_notes'],
+            size_options=shape['size_options'],
+            stock_quantity=shape['stock_quantity'],
+            is_featured=shape.get('is_featured', False),
+            is_new=shape.get('is_new', False),
+            is_best_seller=shape.get('is_best_seller', False),
+            is_limited_edition=shape.get('is_limited_edition', False),
+        ))
+    products = Product.objects.bulk_create(products, batch_size=batch_size)
+    for index, product in enumerate(products):
+        for order, url in enumerate(PRODUCTS[index % len(PRODUCTS)].get('images', [])):
+            images.append(ProductImage(product=product, image_url=url, is_primary=order == 0, order=order))
+    ProductImage.objects.bulk_create(images, batch_size=batch_size)
+
+    Review.objects.bulk_create([
+        Review(
+            product=products[rng.randrange(count)],
+            reviewer_name=f'Reviewer {index}',
+            rating=rng.randint(1, 5),
+            comment='Lovely scent, lasts all day.',
+        )
+        for index in range(count)
+    ], batch_size=batch_size)
+
+    dupes = DupeProduct.objects.bulk_create([
+        DupeProduct(
+            name=f'Dupe {index}', slug=f'dupe-{index}', description='Inspired by a designer classic.',
+            price=Decimal('45.00'), designer_brand=['Chanel', 'Dior', 'Tom Ford'][index % 3],
+            designer_fragrance=f'Designer {index}', designer_price=Decimal('180.00'),
+            scent_notes='Bergamot, rose, musk',
+        )
+        for index in range(minor)
+    ], batch_size=batch_size)
+    oils = PerfumeOil.objects.bulk_create([
+        PerfumeOil(
+            name=f'Oil {index}', slug=f'oil-{index}', description='Concentrated perfume oil.',
+            price=Decimal('35.00'), top_notes='Saffron', middle_notes='Rose', base_notes='Oud',
+            scent_family='Oriental',
+        )
+        for index in range(minor)
+    ], batch_size=batch_size)
+    ambience = AirAmbience.objects.bulk_create([
+        AirAmbience(
+            name=f'Ambience {index}', slug=f'ambience-{index}', description='Room fragrance.',
+            price=Decimal('25.00'), product_type='candle',
+        )
+        for index in range(minor)
+    ], batch_size=batch_size)
+
+    author = User.objects.create_user(username='benchmark-author', is_staff=True)
+    BlogPost.objects.bulk_create([
+        BlogPost(
+            title=f'Fragrance notes {index}', slug=f'fragrance-notes-{index}', content='Body ' * 400,
+            excerpt='Tips and history.', author=author, is_published=True,
+            published_at=timezone.now(),
+        )
+        for index in range(minor)
+    ], batch_size=batch_size)
+    for index in range(20):
+        FAQ.objects.create(question=f'Question {index}?', answer='Answer.')
+        Testimonial.objects.create(customer_name=f'Customer {index}', comment='Great.', is_featured=index < 5)
+        GalleryImage.objects.create(title=f'Image {index}', image_url='https://example.com/gallery.jpg')
+        GiftCard.objects.create(name=f'Gift card {index}', description='Gift.', amount=Decimal('50.00'),
+                                image_url='https://example.com/gift.jpg')
+    ShippingInfo.objects.create(content='Shipping policy.')
+    ReturnPolicy.objects.create(content='Return policy.')
+    TermsAndConditions.objects.create(content='Terms.', effective_date=timezone.now().date())
+    PrivacyPolicy.objects.create(content='Privacy.', effective_date=timezone.now().date())
+
+    # Guest carts with two product lines each
+    product_type = ContentType.objects.get_for_model(Product)
+    carts = Cart.objects.bulk_create(
+        [Cart(session_key=f'benchmark{index}') for index in range(count)], batch_size=batch_size
+    )
+    CartItem.objects.bulk_create([
+        CartItem(
+            cart=cart, content_type=product_type, object_id=product.pk, product=product,
+            product_name=product.name, product_price=product.price, quantity=1,
+        )
+        for cart in carts
+        for product in rng.sample(products, min(2, count))
+    ], batch_size=batch_size)
+
+    # The measured user: a cart with every item type, and a page of orders
+    user = User.objects.create_user(username=SEED_USERNAME)
+    cart = Cart.objects.create(user=user)
+    for item in (products[0], dupes[0], oils[0], ambience[0]):
+        CartItem.objects.create(cart=cart, item=item, quantity=2)
+    for index in range(10):
+        order = Order.objects.create(
+            order_number=f'ORD-BENCH-{index}', user=user, email='bench@example.com',
+            full_name='Bench User', shipping_address='1 Test Street', phone='0200000000',
+            subtotal_amount=Decimal('300.00'), total_amount=Decimal('300.00'),
+        )
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product=product, product_name=product.name,
+                      product_price=product.price, quantity=1, size='50ml')
+            for product in products[:3]
+        ])
+
+    call_command('backfill_ratings', stdout=StringIO())
+    call_command('rebuild_search_index', stdout=StringIO())
+    call_command('rebuild_search_documents', stdout=StringIO())
+
+    return {
+        'user': user,
+        'kwargs': {'product_id': products[0].pk, 'order_number': order.order_number},
+    }
+
+
+def _router_routes(patterns):
+    """URL patterns served by viewsets (they carry an `actions` mapping)"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _router_routes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and getattr(pattern.callback, 'actions', None):
+            yield pattern
+
+
+def _sample_kwargs(pattern, context):
+    """URL kwargs for a route, from the seeded context or the viewset's queryset"""
+    names = list(pattern.pattern.regex.groupindex)
+    if not names:
+        return {}
+    viewset = pattern.callback.cls
+    kwargs = {}
+    for name in names:
+        if name in context['kwargs']:
+            kwargs[name] = context['kwargs'][name]
+            continue
+        obj = viewset.queryset.order_by('pk').first() if viewset.queryset is not None else None
+        if obj is None:
+            return None
+        kwargs[name] = getattr(obj, viewset.lookup_field if name != 'pk' else 'pk')
+    return kwargs
+
+
+def discover_endpoints(context):
+    """(name, url) for every GET route of the API routers, plus VARIANTS"""
+    endpoints = []
+    seen = set()
+    for pattern in _router_routes(get_resolver().url_patterns):
+        if 'get' not in pattern.callback.actions or pattern.name in seen | SKIPPED_ROUTES:
+            continue
+        kwargs = _sample_kwargs(pattern, context)
+        if kwargs is None:
+            continue
+        seen.add(pattern.name)
+        endpoints.append((pattern.name, reverse(pattern.name, kwargs=kwargs)))
+    for name, params in VARIANTS:
+        endpoints.append((f'{name}?{urlencode(params)}', f'{reverse(name)}?{urlencode(params)}'))
+    return endpoints
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def measure(client, url, iterations):
+    """Query count, latency percentiles and size of `iterations` uncached GETs"""
+    timings, queries = [], 0
+    for _ in range(iterations):
+        cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(captured))
+    return {
+        'url': url,
+        'status': response.status_code,
+        'queries': queries,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'bytes': len(response.content),
+    }
+
+
+def run_benchmarks(context, iterations=5, scale=None):
+    """Measure every endpoint as the seeded user; returns the JSON-ready report"""
+    client = APIClient()
+    client.force_authenticate(context['user'])
+    endpoints = {name: measure(client, url, iterations) for name, url in discover_endpoints(context)}
+    return {
+        'scale': scale,
+        'database': connection.vendor,
+        'iterations': iterations,
+        'endpoints': endpoints,
+    }
+
+
+def load_budgets(path=DEFAULT_BUDGETS_PATH):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def check_budgets(report, budgets):
+    """Budget violations (and server errors) in a report, as messages"""
+    violations = []
+    default = budgets.get('default', {})
+    for name, result in report['endpoints'].items():
+        if result['status'] >= 500:
+            violations.append(f'{name}: HTTP {result["status"]}')
+        limits = {**default, **budgets.get('endpoints', {}).get(name, {})}
+        for metric in BUDGET_METRICS:
+            if metric in limits and result[metric] > limits[metric]:
+                violations.append(f'{name}: {metric} {result[metric]} > budget {limits[metric]}')
+    return violations
@@ -0,0 +1,493 @@
+"""
+Bulk catalog import/export as streaming CSV or JSONL.
+
+Supported kinds are product, product_image, dupe, air_ambience and
+perfume_oil. Each row is keyed on its slug, which comes from the `slug`
+column or is derived from `name`. Rows are read lazily and written in
+batches. Each batch is one bulk_create(update_conflicts=True) upsert on
+the slug. Only the columns present in the file are updated on existing
+rows, so a file holding just `slug,price,stock_quantity` is a valid price
+and stock update. Categories are resolved through an in-memory slug/name
+map, and any that are missing are created in bulk.
+
+ProductImage has no natural key. Instead of upserting, an import replaces
+the image set of every product it mentions.
+
+Bulk writes skip the save signals. After each batch the importer updates
+the search indexes and touches the products whose images changed. At the
+end it bumps the response cache versions of the models it wrote.
+
+Exports stream rows with values_list().iterator(chunk_size=...) in the
+same columns, so an export can be imported back.
+
+Entry points: `manage.py import_catalog` / `manage.py export_catalog` and
+the staff-only /api/catalog/<kind>.<csv|jsonl> endpoint (GET exports,
+POST imports an uploaded `file`).
+"""
+import codecs
+import csv
+import json
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import BooleanField, CharField, Q, TextField
+from django.db.models.functions import Now
+from django.http import StreamingHttpResponse
+from django.utils.text import slugify
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from config.response_cache import bump_version
+
+FORMATS = ('csv', 'jsonl')
+
+CONTENT_TYPES = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Row errors listed in a report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'f', 'no', 'n'}
+
+_MISSING = object()
+
+
+class CatalogKind:
+    """Model, file columns and foreign-key columns of one importable kind"""
+
+    def __init__(self, label, columns, relations=None, search_kind=None, required=()):
+        self.label = label
+        self.columns = columns
+        # column -> model label of the related object, referenced by slug
+        self.relations = relations or {}
+        self.search_kind = search_kind
+        self.extra_required = required
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    @property
+    def keyed(self):
+        return 'slug' in self.columns
+
+
+KINDS = {
+    'product': CatalogKind('products.Product', [
+        'slug', 'name', 'description', 'price', 'category', 'product_type', 'scent_family',
+        'scent_notes', 'size_options', 'stock_quantity', 'is_featured', 'is_new',
+        'is_best_seller', 'is_limited_edition',
+    ], relations={'category': 'products.Category'}, search_kind='product'),
+    'product_image': CatalogKind('products.ProductImage', [
+        'product', 'image_url', 'alt_text', 'is_primary', 'order',
+    ], relations={'product': 'products.Product'}, required=('image_url',)),
+    'dupe': CatalogKind('content.DupeProduct', [
+        'slug', 'name', 'description', 'price', 'designer_brand', 'designer_fragrance',
+        'designer_price', 'designer_image_url', 'similarity_percentage', 'scent_notes',
+        'longevity', 'image_url', 'stock_quantity', 'is_featured', 'is_active',
+    ], search_kind='dupe'),
+    'air_ambience': CatalogKind('content.AirAmbience', [
+        'slug', 'name', 'description', 'price', 'product_type', 'scent_notes', 'size_options',
+        'usage_instructions', 'features', 'coverage_area', 'duration', 'image_url',
+        'stock_quantity', 'is_featured', 'is_active',
+    ], search_kind='air_ambience'),
+    'perfume_oil': CatalogKind('content.PerfumeOil', [
+        'slug', 'name', 'description', 'price', 'concentration', 'size_options', 'longevity',
+        'top_notes', 'middle_notes', 'base_notes', 'scent_family', 'application_tips',
+        'ingredients', 'image_url', 'stock_quantity', 'is_featured', 'is_custom_blend', 'is_active',
+    ], search_kind='perfume_oil'),
+}
+
+
+class CatalogImportError(Exception):
+    """The file as a whole cannot be imported (unknown kind, format or columns)"""
+
+
+def get_kind(name):
+    try:
+        return KINDS[name]
+    except KeyError:
+        raise CatalogImportError(f"Unknown kind '{name}' (choose from {', '.join(KINDS)})")
+
+
+def detect_format(filename, default='csv'):
+    """File format from a file name's extension"""
+    if filename and filename.lower().endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if filename and filename.lower().endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def read_rows(lines, file_format):
+    """Yield (row number, dict) from an iterable of text lines"""
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            # Cells beyond the header land under the None key
+            row.pop(None, None)
+            yield number, row
+    elif file_format == 'jsonl':
+        number = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                raise CatalogImportError(f'Row {number} is not valid JSON: {exc}')
+            if not isinstance(row, dict):
+                raise CatalogImportError(f'Row {number} is not a JSON object')
+            yield number, row
+    else:
+        raise CatalogImportError(f"Unknown format '{file_format}' (choose from {', '.join(FORMATS)})")
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValidationError(f"'{value}' is not a boolean")
+
+
+def _clean_value(field, raw):
+    """Python value for a cell, or _MISSING when the cell is empty"""
+    if raw is None or (isinstance(raw, str) and not raw.strip()):
+        if isinstance(field, (CharField, TextField)) and field.blank:
+            return ''
+        return _MISSING
+    if isinstance(field, BooleanField):
+        return _parse_bool(raw)
+    return field.clean(raw, None)
+
+
+class _Entry:
+    """One parsed row waiting for its batch"""
+    __slots__ = ('number', 'key', 'values', 'relations')
+
+    def __init__(self, number, key, values, relations):
+        self.number = number
+        self.key = key
+        self.values = values
+        self.relations = relations
+
+
+class CatalogImporter:
+    """Upsert rows of one kind in batches; see the module docstring"""
+
+    def __init__(self, kind, batch_size=DEFAULT_BATCH_SIZE):
+        self.kind_name = kind
+        self.kind = get_kind(kind)
+        self.model = self.kind.model
+        self.batch_size = batch_size
+        meta = self.model._meta
+        self.fields = {
+            column: meta.get_field(column)
+            for column in self.kind.columns if column not in self.kind.relations
+        }
+        self.required = {
+            field.attname for field in meta.concrete_fields
+            if field.name in self.kind.columns and field.name != 'slug'
+            and not field.blank and not field.has_default()
+        } | {meta.get_field(name).attname for name in self.kind.extra_required}
+        self.related_ids = {column: {} for column in self.kind.relations}
+        self.replaced_products = set()
+        self.created_categories = False
+        self.pending = []
+        self.rows = self.created = self.updated = self.error_count = 0
+        self.errors = []
+
+    def run(self, rows):
+        """Import (row number, dict) pairs and return the report"""
+        for number, row in rows:
+            self.rows += 1
+            unknown = set(row) - set(self.kind.columns)
+            if unknown:
+                raise CatalogImportError(
+                    f"Unknown column(s) for {self.kind_name}: {', '.join(sorted(unknown))}"
+                )
+            try:
+                self.pending.append(self._parse(number, row))
+            except ValidationError as exc:
+                self._error(number, exc)
+            if len(self.pending) >= self.batch_size:
+                self._flush()
+        self._flush()
+        self._bump_versions()
+        return self.report()
+
+    def report(self):
+        return {
+            'kind': self.kind_name,
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+    def _error(self, number, exc):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            messages = exc.messages if isinstance(exc, ValidationError) else [str(exc)]
+            self.errors.append({'row': number, 'errors': messages})
+
+    def _parse(self, number, row):
+        values, errors = {}, []
+        for column, field in self.fields.items():
+            if column not in row or column == 'slug':
+                continue
+            try:
+                value = _clean_value(field, row[column])
+            except ValidationError as exc:
+                errors.extend(f'{column}: {message}' for message in exc.messages)
+                continue
+            if value is not _MISSING:
+                values[field.attname] = value
+        if errors:
+            raise ValidationError(errors)
+
+        relations = {
+            column: str(row[column]).strip()
+            for column in self.kind.relations if row.get(column) not in (None, '')
+        }
+
+        key = None
+        if self.kind.keyed:
+            key = str(row.get('slug') or '').strip() or slugify(values.get('name', ''))
+            if not key:
+                raise ValidationError('slug: provide a slug or a name to derive it from')
+            self.fields['slug'].run_validators(key)
+        return _Entry(number, key, values, relations)
+
+    def _resolve_relations(self, batch):
+        """Fill foreign-key ids from the in-memory maps, loading missing references per batch"""
+        for column, label in self.kind.relations.items():
+            known = self.related_ids[column]
+            wanted = {entry.relations[column] for entry in batch if column in entry.relations} - set(known)
+            if wanted:
+                self._load_related(column, label, wanted)
+
+        resolved = []
+        for entry in batch:
+            missing = None
+            for column in self.kind.relations:
+                if column not in entry.relations:
+                    continue
+                related_id = self.related_ids[column].get(entry.relations[column])
+                if related_id is None:
+                    missing = f"{column}: '{entry.relations[column]}' does not exist"
+                    break
+                entry.values[self.model._meta.get_field(column).attname] = related_id
+            if missing:
+                self._error(entry.number, ValidationError(missing))
+            else:
+                resolved.append(entry)
+        return resolved
+
+    def _load_related(self, column, label, wanted):
+        related_model = apps.get_model(label)
+        known = self.related_ids[column]
+        if label != 'products.Category':
+            known.update(related_model.objects.filter(slug__in=wanted).values_list('slug', 'pk'))
+            return
+
+        # Categories are matched on slug or name and created when missing
+        def load():
+            for slug, name, pk in related_model.objects.filter(
+                Q(slug__in=wanted) | Q(name__in=wanted)
+            ).values_list('slug', 'name', 'pk'):
+                known[slug] = known[name] = pk
+
+        load()
+        missing = [value for value in wanted if value not in known and slugify(value)]
+        if missing:
+            related_model.objects.bulk_create(
+                [related_model(name=value, slug=slugify(value)) for value in missing],
+                ignore_conflicts=True
+            )
+            self.created_categories = True
+            load()
+
+    def _flush(self):
+        batch, self.pending = self.pending, []
+        batch = self._resolve_relations(batch)
+        if not batch:
+            return
+        if self.kind.keyed:
+            self._upsert(batch)
+        else:
+            self._replace_images(batch)
+
+    def _upsert(self, batch):
+        # Later rows for the same slug win
+        entries = {}
+        for entry in batch:
+            entries[entry.key] = entry
+        existing = self.model.objects.in_bulk(list(entries), field_name='slug')
+
+        objects, update_fields = [], set()
+        for key, entry in entries.items():
+            obj = existing.get(key)
+            if obj is None:
+                missing = sorted(
+                    self.model._meta.get_field(attname).name
+                    for attname in self.required - set(entry.values)
+                )
+                if missing:
+                    self._error(entry.number, ValidationError(
+                        [f'{name}: required for a new {self.kind_name}' for name in missing]
+                    ))
+                    continue
+                obj = self.model(slug=key)
+                self.created += 1
+            else:
+                # Re-inserted on the slug conflict: columns absent from the row keep their values
+                obj.pk = None
+                self.updated += 1
+            for attname, value in entry.values.items():
+                setattr(obj, attname, value)
+            update_fields.update(entry.values)
+            objects.append(obj)
+
+        if not objects:
+            return
+        update_fields = [self.model._meta.get_field(attname).name for attname in update_fields]
+        self.model.objects.bulk_create(
+            objects,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['slug'],
+            update_fields=update_fields + ['updated_at'],
+        )
+        if self.kind.search_kind:
+            ids = list(self.model.objects.filter(slug__in=[obj.slug for obj in objects]).values_list('pk', flat=True))
+            self._reindex(self.kind.search_kind, ids)
+
+    def _replace_images(self, batch):
+        ProductImage = self.model
+        Product = apps.get_model('products.Product')
+
+        objects = []
+        for entry in batch:
+            missing = sorted(
+                ProductImage._meta.get_field(attname).name
+                for attname in self.required - set(entry.values)
+            )
+            if missing:
+                self._error(entry.number, ValidationError([f'{name}: required' for name in missing]))
+                continue
+            objects.append(ProductImage(**entry.values))
+        if not objects:
+            return
+
+        product_ids = {obj.product_id for obj in objects}
+        first_seen = product_ids - self.replaced_products
+        ProductImage.objects.filter(product_id__in=first_seen).delete()
+        self.replaced_products |= first_seen
+        ProductImage.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.created += len(objects)
+
+        # The ProductImage signals would have done this per row
+        Product.objects.filter(pk__in=product_ids).update(updated_at=Now())
+        self._reindex('product', list(product_ids))
+
+    def _reindex(self, search_kind, ids):
+        from apps.search.index import index_objects
+
+        index_objects(search_kind, ids, batch_size=self.batch_size)
+        if search_kind == 'product':
+            from apps.products.models import Product
+            from apps.products.search import index_products
+
+            index_products(Product.objects.filter(pk__in=ids).select_related('category'))
+
+    def _bump_versions(self):
+        if self.created or self.updated:
+            bump_version(self.model)
+            if self.kind_name == 'product_image':
+                bump_version(apps.get_model('products.Product'))
+        if self.created_categories:
+            bump_version(apps.get_model('products.Category'))
+
+
+def import_catalog(kind, lines, file_format, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Import an iterable of text lines in one transaction and return the report"""
+    importer = CatalogImporter(kind, batch_size=batch_size)
+    with transaction.atomic():
+        report = importer.run(read_rows(lines, file_format))
+        if dry_run:
+            transaction.set_rollback(True)
+    report['dry_run'] = dry_run
+    return report
+
+
+class Echo:
+    """File-like object handing csv.writer output straight back, for streaming CSV"""
+
+    def write(self, value):
+        return value
+
+
+def export_lines(kind, file_format, chunk_size=DEFAULT_BATCH_SIZE):
+    """Yield the catalog of one kind as CSV or JSONL text, a row at a time"""
+    spec = get_kind(kind)
+    if file_format not in FORMATS:
+        raise CatalogImportError(f"Unknown format '{file_format}' (choose from {', '.join(FORMATS)})")
+    lookups = [f'{column}__slug' if column in spec.relations else column for column in spec.columns]
+    ordering = ['product_id', 'order', 'pk'] if kind == 'product_image' else ['pk']
+    rows = spec.model.objects.order_by(*ordering).values_list(*lookups).iterator(chunk_size=chunk_size)
+
+    if file_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(spec.columns)
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        for row in rows:
+            yield json.dumps(dict(zip(spec.columns, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def streaming_file_response(lines, file_format, filename):
+    """Download response sending `lines` as they are generated"""
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+class CatalogFileView(APIView):
+    """Staff-only catalog export (GET) and bulk import of an uploaded `file` (POST)"""
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def _check(self, kind, file_format):
+        if kind not in KINDS or file_format not in FORMATS:
+            raise NotFound()
+
+    def get(self, request, kind, file_format):
+        self._check(kind, file_format)
+        return streaming_file_response(export_lines(kind, file_format), file_format, f'{kind}.{file_format}')
+
+    def post(self, request, kind, file_format):
+        self._check(kind, file_format)
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise serializers.ValidationError({'file': 'Upload the catalog file as `file`.'})
+        try:
+            report = import_catalog(
+                kind, codecs.iterdecode(upload, 'utf-8-sig'), file_format,
+                dry_run=request.query_params.get('dry_run') in ('1', 'true'),
+            )
+        except CatalogImportError as exc:
+            raise serializers.ValidationError({'file': str(exc)})
+        return Response(report)
@@ -0,0 +1,110 @@
+"""
+ETag / Last-Modified support for read-heavy viewsets.
+
+Validators are computed without serializing anything:
+- paginated list: the page is fetched first, and the validators come from
+  its rows (primary keys and MAX(updated_at)) plus the count and links the
+  paginator will send, combined with the full request path (filters, page,
+  sort). No extra query runs: the count is the paginator's own (estimated
+  for large listings) and keyset pages (?cursor=) have none.
+- unpaginated list: one aggregate query, MAX(updated_at) and COUNT(*).
+- retrieve: the object's updated_at, fetched with a single-column query.
+
+Lists send only an ETag. MAX(updated_at) does not move when a row is deleted
+or filtered out (deactivated), so a list Last-Modified would let
+If-Modified-Since answer 304 for a changed list; the ETag also covers the
+primary keys and count. Retrieve sends both.
+
+A matching If-None-Match (or, on retrieve, If-Modified-Since) is answered
+with 304 before the page's prefetches or the serializer run.
+"""
+import hashlib
+from django.db.models import Count, Max, prefetch_related_objects
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """Add ETag (list, retrieve) and Last-Modified (retrieve) validators and 304 handling"""
+    last_modified_field = 'updated_at'
+
+    def _etag(self, *parts):
+        """Weak ETag over the request shape and the given version parts"""
+        request = self.request
+        seed = '|'.join(str(part) for part in (
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            request.user.is_staff,
+            *parts,
+        ))
+        return f'W/"{hashlib.md5(seed.encode()).hexdigest()}"'
+
+    def _conditional(self, request, etag, last_modified, render):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if not_modified is not None:
+            return not_modified
+        response = render()
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            # Validators must be revalidated, never used for heuristic freshness
+            patch_cache_control(response, no_cache=True)
+        return response
+
+    def _page_validators(self, page):
+        """Newest row timestamp and ETag parts of a page, as the paginated response will show it"""
+        pagination = getattr(self.paginator, 'keyset', None) or self.paginator
+        paginator = getattr(getattr(pagination, 'page', None), 'paginator', None)
+        timestamps = [getattr(obj, self.last_modified_field) for obj in page]
+        return max(timestamps, default=None), [
+            [obj.pk for obj in page],
+            pagination.get_next_link(),
+            pagination.get_previous_link(),
+            getattr(paginator, 'count', None),
+        ]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookups = queryset._prefetch_related_lookups
+        page = self.paginate_queryset(queryset.prefetch_related(None) if lookups else queryset)
+
+        if page is not None:
+            last_modified, parts = self._page_validators(page)
+
+            def render():
+                # Prefetched only once the page is known to be sent
+                prefetch_related_objects(page, *lookups)
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+        else:
+            stats = queryset.order_by().aggregate(
+                last_modified=Max(self.last_modified_field),
+                count=Count('pk'),
+            )
+            last_modified, parts = stats['last_modified'], [stats['count']]
+
+            def render():
+                # Same as ListModelMixin.list, reusing the already-filtered queryset
+                serializer = self.get_serializer(queryset, many=True)
+                return Response(serializer.data)
+
+        etag = self._etag(last_modified, *parts)
+        # ETag only: see the module docstring
+        return self._conditional(request, etag, None, render)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        last_modified = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).values_list(self.last_modified_field, flat=True).first()
+        if last_modified is None:
+            # Not found: let the regular retrieve produce the 404
+            return super().retrieve(request, *args, **kwargs)
+        etag = self._etag(last_modified)
+        return self._conditional(
+            request, etag, last_modified,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
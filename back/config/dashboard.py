@@ -33,9 +33,7 @@ def get_dashboard_stats():
         stats['recent_orders'] = recent_orders
         
         # Top products by reviews
-        top_products = Product.objects.annotate(
-            review_count=Count('review')
-        ).order_by('-review_count')[:5]
+        top_products = Product.objects.order_by('-rating_count')[:5]
         stats['top_products'] = top_products
         
         return stats
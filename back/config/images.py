@@ -0,0 +1,238 @@
+"""
+Responsive image derivatives.
+
+Every uploaded `<name>_file` ImageField with a matching `<name>_variants`
+JSONField gets resized copies at IMAGE_DERIVATIVE_WIDTHS in each of
+IMAGE_DERIVATIVE_FORMATS. The copies are made with Pillow and saved
+through the default file storage (DEFAULT_FILE_STORAGE: local media,
+Cloudinary or S3). The variants field records the storage names and
+dimensions:
+
+    {"source": "products/rose.jpg", "width": 2000, "height": 1500,
+     "formats": {"webp": [{"name": "derivatives/products/rose-320w.webp",
+                           "width": 320, "height": 240}, ...]}}
+
+URLs are resolved from the names when serialized, so signed storage URLs
+never go stale. SrcsetField turns the record into a srcset-ready map:
+
+    {"width": 2000, "height": 1500, "webp": "https://.../rose-320w.webp 320w, ..."}
+
+Derivatives are generated on save (track_image_derivatives, called from
+AppConfig.ready) whenever the file no longer matches the recorded source.
+Old derivatives are deleted when the image changes or its row is
+deleted. `manage.py generate_image_derivatives` backfills existing images
+in a process pool. AVIF is produced only when Pillow can encode it, for
+example with pillow-avif-plugin installed. Otherwise that format is
+skipped.
+"""
+import logging
+import os
+from io import BytesIO
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import ImageField
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from PIL import Image, ImageOps
+from rest_framework import serializers
+from config.response_cache import bump_version
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF encoder with Pillow)
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIR = 'derivatives'
+
+PIL_FORMATS = {'webp': 'WEBP', 'avif': 'AVIF'}
+
+# Models registered with track_image_derivatives()
+TRACKED_MODELS = []
+
+
+def derivative_widths():
+    return sorted(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (320, 640, 1280)))
+
+
+def derivative_formats():
+    """Configured formats that this Pillow build can encode"""
+    Image.init()
+    return [
+        image_format for image_format in getattr(settings, 'IMAGE_DERIVATIVE_FORMATS', ('webp', 'avif'))
+        if PIL_FORMATS.get(image_format) in Image.SAVE
+    ]
+
+
+def image_fields(model):
+    """(file field, variants field) pairs of a model"""
+    names = {field.name for field in model._meta.concrete_fields}
+    return [
+        (field.name, field.name[:-len('_file')] + '_variants')
+        for field in model._meta.concrete_fields
+        if isinstance(field, ImageField) and field.name.endswith('_file')
+        and field.name[:-len('_file')] + '_variants' in names
+    ]
+
+
+def _derivative_names(variants):
+    return [
+        variant['name']
+        for entries in (variants or {}).get('formats', {}).values()
+        for variant in entries
+    ]
+
+
+def delete_derivatives(variants, storage=None):
+    storage = storage or default_storage
+    for name in _derivative_names(variants):
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.warning('Could not delete image derivative %s', name, exc_info=True)
+
+
+def generate_derivatives(name, previous=None, storage=None):
+    """
+    Resize the stored image `name` into every configured width and format,
+    replacing the derivatives recorded in `previous`; returns the variants record.
+    """
+    storage = storage or default_storage
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+
+    delete_derivatives(previous, storage)
+    width, height = image.size
+    # Never upscale: an image narrower than a width is stored once at its own width
+    widths = sorted({min(target, width) for target in derivative_widths()})
+    quality = getattr(settings, 'IMAGE_DERIVATIVE_QUALITY', 80)
+    base = os.path.splitext(name)[0]
+
+    formats = {}
+    for image_format in derivative_formats():
+        entries = []
+        for target in widths:
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS, reducing_gap=3.0
+            )
+            buffer = BytesIO()
+            resized.save(buffer, PIL_FORMATS[image_format], quality=quality)
+            target_name = f'{DERIVATIVES_DIR}/{base}-{target}w.{image_format}'
+            # Derivative names mirror their source, so a leftover file there is ours to replace
+            if storage.exists(target_name):
+                storage.delete(target_name)
+            saved = storage.save(target_name, ContentFile(buffer.getvalue()))
+            entries.append({'name': saved, 'width': resized.width, 'height': resized.height})
+        formats[image_format] = entries
+    return {'source': name, 'width': width, 'height': height, 'formats': formats}
+
+
+def needs_processing(file_name, variants):
+    """True when the recorded derivatives do not belong to the current file"""
+    if not file_name:
+        return bool(variants)
+    return (variants or {}).get('source') != file_name
+
+
+def derive(name, previous=None):
+    """generate_derivatives() that records failures instead of raising (process pool entry point)"""
+    if not name:
+        delete_derivatives(previous)
+        return {}
+    try:
+        return generate_derivatives(name, previous)
+    except Exception as exc:
+        logger.warning('Could not generate derivatives for %s', name, exc_info=True)
+        # Recorded so later saves do not retry a broken file; the backfill's --force does
+        return {'source': name, 'error': str(exc)}
+
+
+def store_variants(model, variants_field, records):
+    """Write {pk: variants record} without sending save signals, and invalidate cached output"""
+    if not records:
+        return
+    now = timezone.now()
+    fields = [variants_field]
+    objects = [model(pk=pk, **{variants_field: record}) for pk, record in records.items()]
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        fields.append('updated_at')
+        for obj in objects:
+            obj.updated_at = now
+    model._default_manager.bulk_update(objects, fields)
+    if model._meta.label == 'products.ProductImage':
+        # Product responses embed their images
+        apps.get_model('products.Product').objects.filter(
+            pk__in=model._default_manager.filter(pk__in=list(records)).values('product_id')
+        ).update(updated_at=now)
+    bump_version(model)
+
+
+def process_instance(instance, force=False):
+    """Bring every variants field of `instance` up to date; returns the fields written"""
+    written = []
+    for file_field, variants_field in image_fields(type(instance)):
+        name = getattr(instance, file_field).name or ''
+        variants = getattr(instance, variants_field) or {}
+        if force or needs_processing(name, variants):
+            record = derive(name, variants)
+            setattr(instance, variants_field, record)
+            store_variants(type(instance), variants_field, {instance.pk: record})
+            written.append(variants_field)
+    return written
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        process_instance(instance)
+
+
+def _on_delete(sender, instance, **kwargs):
+    for _, variants_field in image_fields(sender):
+        delete_derivatives(getattr(instance, variants_field))
+
+
+def track_image_derivatives(*models):
+    """Generate derivatives when these models' images change (call from AppConfig.ready)"""
+    for model in models:
+        if model not in TRACKED_MODELS:
+            TRACKED_MODELS.append(model)
+        uid = f'image_derivatives_{model._meta.label_lower}'
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'{uid}_save')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'{uid}_delete')
+
+
+def init_worker():
+    """Process pool initializer: spawned workers start without Django configured"""
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+def srcset(variants, storage=None):
+    """srcset strings per format plus the original dimensions, or None without derivatives"""
+    formats = (variants or {}).get('formats')
+    if not formats:
+        return None
+    storage = storage or default_storage
+    result = {'width': variants['width'], 'height': variants['height']}
+    for image_format, entries in formats.items():
+        result[image_format] = ', '.join(f"{storage.url(entry['name'])} {entry['width']}w" for entry in entries)
+    return result
+
+
+class SrcsetField(serializers.Field):
+    """Read-only srcset map of a *_variants field (see srcset())"""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return srcset(value)
@@ -0,0 +1,46 @@
+"""
+Logging helpers referenced from settings.LOGGING.
+
+- JsonFormatter: one JSON object per line, including any `extra` fields,
+  for log collectors in production.
+- SampleFilter: keeps only a fraction of DEBUG records so high-volume
+  debug events can stay enabled without flooding the output. A record can
+  override the rate with extra={'sample_rate': ...}.
+"""
+import json
+import logging
+import random
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else came from `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SampleFilter(logging.Filter):
+    """Pass a random `rate` fraction of DEBUG records; other levels always pass"""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        rate = getattr(record, 'sample_rate', self.rate if record.levelno <= logging.DEBUG else 1.0)
+        return rate >= 1.0 or random.random() < rate
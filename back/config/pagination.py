@@ -0,0 +1,361 @@
+"""
+Opt-in keyset (cursor) pagination.
+
+Page-number pagination runs COUNT(*) over the filtered queryset and an
+OFFSET scan for every page, so deep pages get linearly slower. Keyset
+pagination instead remembers the sort values of the last row served and
+asks for rows after it, which an index on the sort columns answers
+directly: page N costs the same as page 1.
+
+CursorOptInPagination keeps page-number behaviour by default and switches
+to keyset mode when the request carries a `cursor` parameter (an empty
+`?cursor=` starts at the first page). The ordering is whatever the view's
+queryset is ordered by (its sort_by, search rank or Meta.ordering) with
+the primary key appended as a tie-breaker, so positions are stable.
+
+Page-number mode uses ApproximateCountPagination: above
+PAGINATION_EXACT_COUNT_THRESHOLD rows the `count` is an estimate (planner
+statistics on PostgreSQL, a per-filter cached count elsewhere) and
+`count_exact` tells clients which one they got.
+"""
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, replace_query_param
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+COUNT_CACHE_PREFIX = 'pagination:count'
+
+
+def estimate_count(queryset):
+    """
+    PostgreSQL planner estimate of the queryset's row count, or None.
+
+    Unfiltered querysets read pg_class.reltuples; filtered ones take the
+    top-level "Plan Rows" of EXPLAIN, which costs no table access.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    queryset = queryset.order_by()
+    try:
+        if not queryset.query.where and not queryset.query.distinct:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            plan = json.loads(queryset.explain(format='json'))
+            estimate = plan[0]['Plan']['Plan Rows']
+    except (DatabaseError, ValueError, KeyError, IndexError):
+        logger.warning('Could not estimate row count for %s', queryset.model._meta.label, exc_info=True)
+        return None
+    # reltuples is -1 for a table that has never been analyzed
+    return int(estimate) if estimate >= 0 else None
+
+
+def count_cache_key(queryset):
+    """Cache key for the queryset's filter signature (its SQL and parameters)"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.md5(f'{sql}|{params!r}'.encode()).hexdigest()
+    return f'{COUNT_CACHE_PREFIX}:{queryset.db}:{digest}'
+
+
+class ApproximatePage(Page):
+    """Page of a paginator whose count is an estimate"""
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        # Decided by the rows actually fetched, not the estimated page count
+        return self.has_more
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator that estimates large counts instead of running COUNT(*)"""
+
+    def __init__(self, object_list, per_page, threshold=None, cache_timeout=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.threshold = threshold if threshold is not None else getattr(settings, 'PAGINATION_EXACT_COUNT_THRESHOLD', 1000)
+        self.cache_timeout = cache_timeout if cache_timeout is not None else getattr(settings, 'PAGINATION_COUNT_CACHE_TTL', 60)
+        self.count_is_exact = True
+
+    def _exact_count(self):
+        return super().count
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query') or self.object_list.query.is_empty():
+            # Lists and .none() querysets: counting them is free
+            return self._exact_count()
+
+        estimate = estimate_count(self.object_list)
+        if estimate is not None:
+            if estimate < self.threshold:
+                return self._exact_count()
+            self.count_is_exact = False
+            return estimate
+
+        key = count_cache_key(self.object_list)
+        cached = cache.get(key)
+        if cached is not None and cached >= self.threshold:
+            self.count_is_exact = False
+            return cached
+        count = self._exact_count()
+        if count >= self.threshold:
+            cache.set(key, count, self.cache_timeout)
+        return count
+
+    def validate_number(self, number):
+        if self.count_is_exact:
+            return super().validate_number(number)
+        # With an estimated count any page past the first may still exist
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_is_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return ApproximatePage(rows[:self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+class ApproximateCountPagination(PageNumberPagination):
+    """Page-number pagination with estimated counts for large listings"""
+    django_paginator_class = ApproximateCountPaginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['count_exact'] = self.page.paginator.count_is_exact
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count_exact'] = {'type': 'boolean', 'example': True}
+        return schema
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder without its millisecond truncation of datetimes"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    """Keyset pagination over the queryset's own ordering plus the primary key"""
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, page_size=None, max_page_size=None):
+        self.page_size = page_size or settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+        self.max_page_size = max_page_size or self.max_page_size
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def _ordering(self, queryset):
+        """[(field name, descending)] for the queryset, ending with the primary key"""
+        query = queryset.query
+        ordering = list(query.order_by) or list(query.get_meta().ordering)
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str) or item == '?':
+                raise NotFound('This listing does not support cursor pagination')
+            name = item.lstrip('-')
+            fields.append(('pk' if name in ('pk', 'id') else name, item.startswith('-')))
+        if not any(name == 'pk' for name, _ in fields):
+            fields.append(('pk', fields[0][1] if fields else False))
+        return fields
+
+    def _model_field(self, model, name):
+        """The model field behind an ordering name, or None for annotations"""
+        if name == 'pk':
+            return model._meta.pk
+        field = None
+        for part in name.split('__'):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            model = field.related_model or model
+        return field
+
+    def _nullable(self, name):
+        field = self._model_field(self.model, name)
+        return field is not None and field.null
+
+    def _order_by(self, name, descending):
+        # Nulls always sort as the smallest value, whatever the database default
+        if not self._nullable(name):
+            return f'-{name}' if descending else name
+        if descending:
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_first=True)
+
+    def _after(self, name, descending, value):
+        """Rows strictly after `value` in this column's direction"""
+        nullable = self._nullable(name)
+        if value is None:
+            return Q(**{f'{name}__isnull': False}) if not descending else Q(pk__in=[])
+        condition = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+        if descending and nullable:
+            condition |= Q(**{f'{name}__isnull': True})
+        return condition
+
+    def _equal(self, name, value):
+        if value is None:
+            return Q(**{f'{name}__isnull': True})
+        return Q(**{name: value})
+
+    def _position_filter(self, fields, position):
+        """(a, b, pk) after (x, y, z): a > x OR (a = x AND b > y) OR ..."""
+        condition = Q(pk__in=[])
+        equal_prefix = Q()
+        for (name, descending), value in zip(fields, position):
+            condition |= equal_prefix & self._after(name, descending, value)
+            equal_prefix &= self._equal(name, value)
+        return condition
+
+    def _value(self, obj, name):
+        for part in name.split('__'):
+            obj = getattr(obj, part, None)
+        return obj
+
+    def encode_cursor(self, position, reverse=False):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, cls=CursorEncoder)
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """(position values or None, reverse) from the cursor parameter"""
+        token = request.query_params.get(self.cursor_query_param, '')
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            raw, reverse = payload['p'], bool(payload['r'])
+            if len(raw) != len(self.fields):
+                raise ValueError
+            position = []
+            for (name, _), value in zip(self.fields, raw):
+                field = self._model_field(self.model, name)
+                position.append(field.to_python(value) if field is not None and value is not None else value)
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.fields = self._ordering(queryset)
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        # Walking backwards is walking forwards over the reversed ordering
+        fields = [(name, descending != reverse) for name, descending in self.fields]
+        queryset = queryset.order_by(*[self._order_by(name, descending) for name, descending in fields])
+        if position is not None:
+            queryset = queryset.filter(self._position_filter(fields, position))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = rows
+        return rows
+
+    def _position_of(self, obj):
+        return [self._value(obj, name) for name, _ in self.fields]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position_of(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._position_of(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class CursorOptInPagination(ApproximateCountPagination):
+    """Page-number pagination, or keyset pagination when ?cursor= is present"""
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class(page_size=self.page_size, max_page_size=self.max_page_size)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,193 @@
+"""
+Opt-in per-request SQL and timing instrumentation.
+
+With PERF_INSTRUMENTATION_ENABLED, PerfMiddleware wraps every database
+connection with connection.execute_wrapper() for the duration of a request
+and records the query count, total DB time and duplicated SQL shapes (the
+same statement text run more than once, the usual N+1 signature). Each
+response gets a Server-Timing header:
+
+    Server-Timing: db;dur=12.4;desc="9 queries, 4 duplicate", serialize;dur=6.1, total;dur=21.0
+
+`serialize` is the time spent in the view and response rendering outside
+the database: serializers, rendering and other view work.
+
+Requests slower than PERF_SLOW_REQUEST_MS are logged with their
+PERF_SLOW_QUERY_COUNT slowest statements. Per-view totals are kept in
+memory (per worker process) and served to staff at /api/_perf/.
+
+When disabled the middleware raises MiddlewareNotUsed, so Django drops it
+from the middleware chain and it costs nothing.
+"""
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+SQL_LOG_LENGTH = 300
+
+
+class QueryRecorder:
+    """execute_wrapper callable recording the duration of every statement"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes = Counter()
+        self.timings = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.total_ms += elapsed_ms
+            # Parameters are separate from the SQL text, so equal text is an equal shape
+            self.shapes[sql] += 1
+            self.timings.append((elapsed_ms, sql))
+
+    @property
+    def duplicates(self):
+        """Statements that repeated an already-run SQL shape"""
+        return sum(count - 1 for count in self.shapes.values() if count > 1)
+
+    def slowest(self, limit):
+        return heapq.nlargest(limit, self.timings, key=lambda timing: timing[0])
+
+
+class ViewStats:
+    """In-memory per-view request totals"""
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def record(self, view, total_ms, db_ms, queries, duplicates, status_code, slow):
+        with self._lock:
+            stats = self._views.setdefault(view, {
+                'requests': 0, 'errors': 0, 'slow': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'db_ms': 0.0, 'queries': 0, 'max_queries': 0, 'duplicates': 0,
+            })
+            stats['requests'] += 1
+            stats['errors'] += status_code >= 500
+            stats['slow'] += slow
+            stats['total_ms'] += total_ms
+            stats['max_ms'] = max(stats['max_ms'], total_ms)
+            stats['db_ms'] += db_ms
+            stats['queries'] += queries
+            stats['max_queries'] = max(stats['max_queries'], queries)
+            stats['duplicates'] += duplicates
+
+    def snapshot(self):
+        """Per-view averages, slowest total time first"""
+        with self._lock:
+            views = {view: dict(stats) for view, stats in self._views.items()}
+        result = {}
+        for view, stats in sorted(views.items(), key=lambda item: item[1]['total_ms'], reverse=True):
+            requests = stats['requests']
+            result[view] = {
+                'requests': requests,
+                'errors': stats['errors'],
+                'slow': stats['slow'],
+                'mean_ms': round(stats['total_ms'] / requests, 2),
+                'max_ms': round(stats['max_ms'], 2),
+                'mean_db_ms': round(stats['db_ms'] / requests, 2),
+                'mean_queries': round(stats['queries'] / requests, 2),
+                'max_queries': stats['max_queries'],
+                'duplicates': stats['duplicates'],
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+view_stats = ViewStats()
+
+
+def _enabled():
+    return getattr(settings, 'PERF_INSTRUMENTATION_ENABLED', False)
+
+
+class PerfMiddleware:
+    """Count queries and time each request; see the module docstring"""
+
+    def __init__(self, get_response):
+        if not _enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_request_ms = getattr(settings, 'PERF_SLOW_REQUEST_MS', 500)
+        self.slow_query_count = getattr(settings, 'PERF_SLOW_QUERY_COUNT', 5)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._perf = {'recorder': recorder}
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        total_ms = (finished - started) * 1000
+        view_started, db_before_view = request._perf.get('view', (finished, recorder.total_ms))
+        # DRF responses are rendered before they come back through the middleware
+        serialize_ms = max(0.0, (finished - view_started) * 1000 - (recorder.total_ms - db_before_view))
+
+        response['Server-Timing'] = (
+            f'db;dur={recorder.total_ms:.2f};desc="{recorder.count} queries, {recorder.duplicates} duplicate", '
+            f'serialize;dur={serialize_ms:.2f}, total;dur={total_ms:.2f}'
+        )
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        slow = total_ms >= self.slow_request_ms
+        view_stats.record(view, total_ms, recorder.total_ms, recorder.count, recorder.duplicates,
+                          response.status_code, slow)
+        if slow:
+            self.log_slow_request(request, view, total_ms, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        perf = getattr(request, '_perf', None)
+        if perf is not None:
+            perf['view'] = (time.perf_counter(), perf['recorder'].total_ms)
+
+    def log_slow_request(self, request, view, total_ms, recorder):
+        slowest = [
+            {'ms': round(elapsed_ms, 2), 'sql': sql[:SQL_LOG_LENGTH]}
+            for elapsed_ms, sql in recorder.slowest(self.slow_query_count)
+        ]
+        lines = ''.join(f'\n  {query["ms"]:.2f}ms {query["sql"]}' for query in slowest)
+        logger.warning(
+            'Slow request %s %s (%s): %.1fms, %.1fms in %s queries (%s duplicate)%s',
+            request.method, request.path, view, total_ms, recorder.total_ms,
+            recorder.count, recorder.duplicates, lines,
+            extra={'view': view, 'slow_queries': slowest},
+        )
+
+
+class PerfStatsView(APIView):
+    """Staff-only per-view timing and query totals (DELETE resets them)"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({'enabled': _enabled(), 'views': view_stats.snapshot()})
+
+    def delete(self, request):
+        view_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,128 @@
+"""
+Sparse fieldsets for list endpoints: ?fields=id,name,price or ?omit=category.
+
+SparseFieldsetMixin (serializers) drops the unrequested fields from the
+output, so their SerializerMethodFields and nested serializers never run.
+
+FieldProjectionMixin (viewsets) narrows the list queryset to match: only()
+the columns the remaining fields read, and drop select_related and
+prefetch_related lookups nothing needs any more. Serializer fields backed
+by properties or methods declare the model fields they read in
+Meta.field_dependencies; a field whose dependencies are unknown disables
+the column narrowing rather than risk a query per row.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.serializers import ListSerializer
+
+FIELDS_QUERY_PARAM = 'fields'
+OMIT_QUERY_PARAM = 'omit'
+
+
+def _param_set(request, name):
+    value = request.query_params.get(name, '')
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def is_projected(request):
+    """True when the request asks for a sparse fieldset"""
+    return request is not None and (
+        FIELDS_QUERY_PARAM in request.query_params or OMIT_QUERY_PARAM in request.query_params
+    )
+
+
+def select_fields(request, names):
+    """The subset of `names` kept by the request's ?fields= and ?omit="""
+    requested = _param_set(request, FIELDS_QUERY_PARAM)
+    omitted = _param_set(request, OMIT_QUERY_PARAM)
+    return [name for name in names if (not requested or name in requested) and name not in omitted]
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin honouring ?fields= and ?omit= for the top-level object"""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        # Nested uses of the serializer keep every field
+        top_level = self.parent is None or (isinstance(self.parent, ListSerializer) and self.parent.parent is None)
+        if not top_level or not is_projected(request):
+            return fields
+        kept = select_fields(request, fields)
+        return {name: field for name, field in fields.items() if name in kept}
+
+    def model_dependencies(self):
+        """Model field names read by this serializer's fields, or None if unknown"""
+        model = self.Meta.model
+        declared = getattr(self.Meta, 'field_dependencies', {})
+        needed = set()
+        for name, field in self.fields.items():
+            if name in declared:
+                needed.update(declared[name])
+                continue
+            source = field.source.split('.')[0]
+            try:
+                model._meta.get_field(source)
+            except FieldDoesNotExist:
+                return None
+            needed.add(source)
+        return needed
+
+
+class FieldProjectionMixin:
+    """Viewset mixin narrowing the list queryset to the requested fields"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list' or not is_projected(self.request):
+            return queryset
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsetMixin):
+            return queryset
+        needed = serializer.model_dependencies()
+        if needed is None:
+            return queryset
+        # ConditionalGetMixin builds list validators from each row's updated_at
+        last_modified_field = getattr(self, 'last_modified_field', None)
+        if last_modified_field:
+            needed = needed | {last_modified_field}
+        return project_queryset(queryset, needed)
+
+
+def _ordering_fields(queryset):
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return {item.lstrip('-').split('__')[0] for item in ordering if isinstance(item, str)}
+
+
+def project_queryset(queryset, needed):
+    """Restrict `queryset` to the model fields in `needed` (plus its ordering columns)"""
+    meta = queryset.model._meta
+    columns, joins, prefetches = set(), set(), set()
+    # Ordering columns stay loaded: keyset pagination reads them off each row
+    for name in needed | _ordering_fields(queryset):
+        try:
+            field = meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.many_to_many or field.one_to_many:
+            prefetches.add(name)
+        elif field.concrete:
+            columns.add(name)
+            if field.is_relation:
+                joins.add(name)
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        queryset = queryset.select_related(None)
+        kept = [name for name in select_related if name in joins]
+        if kept:
+            queryset = queryset.select_related(*kept)
+
+    lookups = queryset._prefetch_related_lookups
+    if lookups:
+        kept = [
+            lookup for lookup in lookups
+            if (lookup if isinstance(lookup, str) else lookup.prefetch_through).split('__')[0] in prefetches
+        ]
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+
+    return queryset.only(*(columns or {meta.pk.name}))
@@ -0,0 +1,155 @@
+"""
+Versioned HTTP response cache for read-only catalog endpoints.
+
+Each cached viewset declares the models its responses depend on. Every
+model has a version counter in the cache that post_save/post_delete bump,
+and the counters are part of the cache key, so a write invalidates exactly
+the responses built from that model. Entries are keyed on the full path
+(including the query string) and the Accept header.
+
+The backend is whatever CACHES[RESPONSE_CACHE_ALIAS] points at. Versions must be
+shared by every process that writes or serves catalog data, so settings refuse
+to start with a per-process backend (locmem) outside DEBUG; use Redis or the
+database cache.
+"""
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+from django.http import HttpResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+KEY_PREFIX = 'rc'
+STATS_KEYS = {'hit': f'{KEY_PREFIX}:stats:hits', 'miss': f'{KEY_PREFIX}:stats:misses'}
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _enabled():
+    return getattr(settings, 'RESPONSE_CACHE_ENABLED', True)
+
+
+def _timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 30)
+
+
+def _version_key(model):
+    return f'{KEY_PREFIX}:version:{model._meta.label_lower}'
+
+
+def _incr(key, initial=0):
+    cache = _cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, initial, timeout=None)
+        return cache.incr(key)
+
+
+def get_versions(models):
+    """Current version of each model; missing counters start from the clock"""
+    cache = _cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # A fresh counter must never collide with a version used before an eviction
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    """Invalidate every cached response that depends on `model`"""
+    _incr(_version_key(model), initial=int(time.time() * 1000))
+
+
+def _bump_on_change(sender, **kwargs):
+    bump_version(sender)
+
+
+def track_model_versions(*models):
+    """Connect version bumps to model writes (call from AppConfig.ready)"""
+    for model in models:
+        uid = f'response_cache_{model._meta.label_lower}'
+        post_save.connect(_bump_on_change, sender=model, dispatch_uid=f'{uid}_save')
+        post_delete.connect(_bump_on_change, sender=model, dispatch_uid=f'{uid}_delete')
+
+
+def get_stats():
+    cache = _cache()
+    counts = cache.get_many(list(STATS_KEYS.values()))
+    hits = counts.get(STATS_KEYS['hit'], 0)
+    misses = counts.get(STATS_KEYS['miss'], 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else 0.0,
+    }
+
+
+class CachedResponseMixin:
+    """
+    Serve GET/HEAD responses of a read-only viewset from the response cache.
+
+    Set `cache_models` to every model the serialized output reads from.
+    Cache hits return before authentication, so they run zero queries;
+    only use this on public endpoints whose output is the same for all users.
+    """
+    cache_models = ()
+
+    def _response_cache_key(self, request):
+        versions = get_versions(self.cache_models)
+        raw = '|'.join([
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            ','.join(str(version) for version in versions),
+        ])
+        return f'{KEY_PREFIX}:response:{hashlib.md5(raw.encode()).hexdigest()}'
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not _enabled():
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = _cache()
+        key = self._response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            _incr(STATS_KEYS['hit'])
+            content, status_code, content_type = cached
+            response = HttpResponse(content, status=status_code, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _incr(STATS_KEYS['miss'])
+        response = super().dispatch(request, *args, **kwargs)
+        response['X-Cache'] = 'MISS'
+        if response.status_code == 200:
+            def store(rendered):
+                cache.set(
+                    key,
+                    (rendered.content, rendered.status_code, rendered['Content-Type']),
+                    _timeout()
+                )
+            if getattr(response, 'is_rendered', True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+        return response
+
+
+class ResponseCacheStatsView(APIView):
+    """Staff-only hit/miss counters for the response cache"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        stats = get_stats()
+        stats['enabled'] = _enabled()
+        stats['backend'] = settings.CACHES[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]['BACKEND']
+        return Response(stats)
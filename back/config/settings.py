@@ -11,7 +11,8 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -75,6 +76,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # trigram_similar lookup for search (PostgreSQL only)
     
     # Third-party apps
     'rest_framework',
@@ -90,10 +92,12 @@ INSTALLED_APPS = [
     'apps.reviews',
     'apps.blog',
     'apps.content',
+    'apps.search',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # Django-CORS-Headers (must be first)
+    'config.perf.PerfMiddleware',  # Server-Timing and /api/_perf/ (no-op unless PERF_INSTRUMENTATION_ENABLED)
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -162,6 +166,9 @@ else:
             'default': {
                 'ENGINE': 'django.db.backends.sqlite3',
                 'NAME': BASE_DIR / 'db.sqlite3',
+                # File-backed test database so concurrency tests can open
+                # several connections (in-memory SQLite allows only one)
+                'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
             }
         }
 
@@ -251,6 +258,138 @@ if AWS_S3_ENDPOINT_URL and 'cloudinary_storage' not in INSTALLED_APPS:
     DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
     MEDIA_URL = f'{AWS_S3_ENDPOINT_URL}/{AWS_STORAGE_BUCKET_NAME}/'
 
+# Cache configuration
+# CACHE_BACKEND: locmem (single process, development only), file, db or redis.
+# Response cache versions, payment verification locks and cart ids must be seen by
+# every gunicorn worker, the payment worker and management commands, so production
+# needs a shared backend: redis, or db (run `manage.py createcachetable`).
+SHARED_CACHE_BACKENDS = ('redis', 'db')
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem' if DEBUG else 'db')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+        }
+    }
+elif CACHE_BACKEND == 'db':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': config('CACHE_TABLE', default='django_cache'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_DIR', default=str(BASE_DIR / '.cache')),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'kim-store',
+        }
+    }
+
+# Versioned response cache for read-only catalog endpoints (config/response_cache.py)
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=True, cast=bool)
+RESPONSE_CACHE_ALIAS = 'default'
+# Keep below AWS_QUERYSTRING_EXPIRE so cached signed media URLs never outlive their signature
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=1800, cast=int)
+
+if RESPONSE_CACHE_ENABLED and not DEBUG and CACHE_BACKEND not in SHARED_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f'CACHE_BACKEND={CACHE_BACKEND} is private to each process; set CACHE_BACKEND to one of '
+        f'{", ".join(SHARED_CACHE_BACKENDS)} or RESPONSE_CACHE_ENABLED=False'
+    )
+
+# Last day (YYYY-MM-DD) plain numeric X-Cart-ID values issued before cart tokens
+# were signed are still accepted; empty (the default) rejects them
+CART_ACCEPT_UNSIGNED_IDS_UNTIL = config('CART_ACCEPT_UNSIGNED_IDS_UNTIL', default='')
+
+# Paystack HTTP client (apps/orders/paystack.py)
+PAYSTACK_CONNECT_TIMEOUT = config('PAYSTACK_CONNECT_TIMEOUT', default=3.05, cast=float)
+PAYSTACK_READ_TIMEOUT = config('PAYSTACK_READ_TIMEOUT', default=20.0, cast=float)
+PAYSTACK_POOL_MAXSIZE = config('PAYSTACK_POOL_MAXSIZE', default=10, cast=int)
+PAYSTACK_MAX_RETRIES = config('PAYSTACK_MAX_RETRIES', default=2, cast=int)
+PAYSTACK_BREAKER_THRESHOLD = config('PAYSTACK_BREAKER_THRESHOLD', default=5, cast=int)
+PAYSTACK_BREAKER_RESET = config('PAYSTACK_BREAKER_RESET', default=30.0, cast=float)
+
+# Page-number listings estimate counts above this many rows (planner statistics
+# on PostgreSQL, a per-filter count cached for PAGINATION_COUNT_CACHE_TTL seconds
+# elsewhere); responses carry count_exact.
+PAGINATION_EXACT_COUNT_THRESHOLD = config('PAGINATION_EXACT_COUNT_THRESHOLD', default=1000, cast=int)
+PAGINATION_COUNT_CACHE_TTL = config('PAGINATION_COUNT_CACHE_TTL', default=60, cast=int)
+
+# Per-request query counting and timing (config.perf): Server-Timing headers,
+# slow request logging and per-view stats at /api/_perf/.
+PERF_INSTRUMENTATION_ENABLED = config('PERF_INSTRUMENTATION_ENABLED', default=False, cast=bool)
+PERF_SLOW_REQUEST_MS = config('PERF_SLOW_REQUEST_MS', default=500, cast=float)
+PERF_SLOW_QUERY_COUNT = config('PERF_SLOW_QUERY_COUNT', default=5, cast=int)
+
+# Responsive image derivatives (config.images): widths in pixels and output
+# formats generated for uploaded images. AVIF needs an AVIF-capable Pillow
+# (e.g. pillow-avif-plugin) and is skipped otherwise.
+IMAGE_DERIVATIVE_WIDTHS = config('IMAGE_DERIVATIVE_WIDTHS', default='320,640,1280', cast=Csv(int))
+IMAGE_DERIVATIVE_FORMATS = config('IMAGE_DERIVATIVE_FORMATS', default='webp,avif', cast=Csv())
+IMAGE_DERIVATIVE_QUALITY = config('IMAGE_DERIVATIVE_QUALITY', default=80, cast=int)
+
+# Logging: per-module loggers under "apps"; LOG_FORMAT=json for log collectors.
+# LOG_DEBUG_SAMPLE_RATE keeps that fraction of DEBUG records (1.0 = all).
+LOG_LEVEL = config('LOG_LEVEL', default='DEBUG' if DEBUG else 'INFO')
+LOG_FORMAT = config('LOG_FORMAT', default='text')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'text': {
+            'format': '%(asctime)s %(levelname)s %(name)s: %(message)s',
+        },
+        'json': {
+            '()': 'config.logs.JsonFormatter',
+        },
+    },
+    'filters': {
+        'sample_debug': {
+            '()': 'config.logs.SampleFilter',
+            'rate': config('LOG_DEBUG_SAMPLE_RATE', default=1.0, cast=float),
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': LOG_FORMAT,
+            'filters': ['sample_debug'],
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'apps': {
+            'handlers': ['console'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+        'config': {
+            'handlers': ['console'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+        'django': {
+            'handlers': ['console'],
+            'level': config('DJANGO_LOG_LEVEL', default='ERROR'),
+            'propagate': False,
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -265,7 +404,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'config.pagination.ApproximateCountPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'config.exceptions.custom_exception_handler',
@@ -27,6 +27,9 @@ from . import admin as custom_admin
 from .test_views import api_status, api_stats, health_check, cors_test
 from .simple_cors_view import simple_cors_test
 from .emergency_cors import emergency_cors_handler, EmergencyCorsView
+from .response_cache import ResponseCacheStatsView
+from .perf import PerfStatsView
+from .catalog_io import CatalogFileView
 
 urlpatterns = [
     path('', simple_cors_test, name='root_cors_test'),  # Root endpoint for testing
@@ -37,6 +40,9 @@ urlpatterns = [
     path('api/status/', api_status, name='api_status'),
     path('api/stats/', api_stats, name='api_stats'),
     path('api/cors-test/', cors_test, name='cors_test'),
+    path('api/cache/stats/', ResponseCacheStatsView.as_view(), name='response_cache_stats'),
+    path('api/_perf/', PerfStatsView.as_view(), name='perf_stats'),
+    path('api/catalog/<slug:kind>.<slug:file_format>', CatalogFileView.as_view(), name='catalog_file'),
     path('simple-cors-test/', simple_cors_test, name='simple_cors_test'),
     path('emergency-cors/', emergency_cors_handler, name='emergency_cors'),
     path('emergency/', EmergencyCorsView.as_view(), name='emergency_cors_view'),
@@ -53,6 +59,7 @@ urlpatterns = [
     path('api/', include('apps.reviews.urls')),
     path('api/', include('apps.blog.urls')),
     path('api/', include('apps.content.urls')),
+    path('api/', include('apps.search.urls')),
 ]
 
 # Serve media files in development
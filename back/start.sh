@@ -6,6 +6,7 @@ echo "🚀 Starting Django application..."
 # Run migrations
 echo "📦 Running migrations..."
 python manage.py migrate --noinput
+python manage.py createcachetable
 
 # Collect static files
 echo "📁 Collecting static files..."